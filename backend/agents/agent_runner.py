@@ -1,12 +1,23 @@
 import time
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from backend.agents.evaluator import evaluate_response
 from backend.agents.reflexion import reflexion_rerun
-from backend.db.db import record_mcp_call
+from backend.agents.run_memo import RUN_MEMO, replay_scope
+from backend.agents.answer_stream import stream_scope
+from backend.db.db import SessionLocal, record_mcp_call
+from backend.core.config import EVAL_MODE, EVAL_WORKERS, EVAL_MAX_PENDING
+from backend.observability.metrics import EVAL_JOBS, EVAL_SCORES, REFLEXION_RUNS
 
 BLEU_THRESHOLD = 0.30
 
+# Background evaluation / reflexion (EVAL_MODE=async)
+EVAL_POOL = ThreadPoolExecutor(max_workers=EVAL_WORKERS, thread_name_prefix="eval")
+_EVAL_SLOTS = threading.BoundedSemaphore(EVAL_MAX_PENDING)
+
 
 def run_with_evaluation(
     *,
@@ -17,12 +28,25 @@ def run_with_evaluation(
     ground_truth: Optional[str],
     run_id: str,
     lc_config=None,
+    deadline=None,
+    eval_mode: Optional[str] = None,
+    on_token=None,
 ):
     """
     Orchestrates:
-    - Agent execution
+    - Agent execution (bounded by the turn `deadline`, if given)
     - Evaluation (BLEU / ROUGE)
     - Reflexion rerun (if needed)
+
+    eval_mode (default EVAL_MODE):
+    - "async":  reply immediately; evaluation + reflexion run on EVAL_POOL
+                and only reach mcp_calls / metrics
+    - "inline": evaluate (and maybe rerun) before replying, for offline
+                test runs
+    - "off":    no evaluation
+
+    on_token: streamed WS turns; the agent pass streams its final LLM
+    answer to it (backend/agents/answer_stream.py). Reruns never stream.
     """
 
     # ===============================
@@ -30,34 +54,152 @@ def run_with_evaluation(
     # ===============================
     start = time.time()
 
-    agent_response = execute_fn(
-        db=db,
-        task={
-            "task": "agent",
-            "args": {"transcript": transcript}
-        },
+    try:
+        with stream_scope(on_token):
+            agent_response = execute_fn(
+                db=db,
+                task={
+                    "task": "agent",
+                    "args": {"transcript": transcript}
+                },
+                session_id=session_id,
+                run_id=run_id,
+                lc_config=lc_config,
+                deadline=deadline,
+            )
+
+
+        duration_ms = int((time.time() - start) * 1000)
+
+        record_mcp_call(
+            db=db,
+            session_id=session_id,
+            name="agent",
+            tool="run",
+            args={"transcript": transcript},
+            result=agent_response,
+            status="success",
+            duration_ms=duration_ms,
+            run_id=run_id
+        )
+    except BaseException:
+        # A failed pass is never evaluated or rerun
+        RUN_MEMO.finish(run_id)
+        raise
+
+    eval_mode = (eval_mode or EVAL_MODE).lower()
+
+    if not ground_truth or eval_mode == "off":
+        # No reflexion rerun can follow; release the run's tool memo
+        RUN_MEMO.finish(run_id)
+        return agent_response
+
+    if eval_mode == "inline":
+        return evaluate_and_reflect(
+            execute_fn=execute_fn,
+            db=db,
+            transcript=transcript,
+            session_id=session_id,
+            ground_truth=ground_truth,
+            run_id=run_id,
+            lc_config=lc_config,
+            agent_response=agent_response,
+        )
+
+    submitted = submit_evaluation(
+        execute_fn=execute_fn,
+        transcript=transcript,
         session_id=session_id,
+        ground_truth=ground_truth,
         run_id=run_id,
         lc_config=lc_config,
+        agent_response=dict(agent_response),
     )
+    if not submitted:
+        RUN_MEMO.finish(run_id)
+    agent_response["evaluation"] = {
+        "mode": "async",
+        "status": "queued" if submitted else "skipped",
+    }
+    return agent_response
 
 
-    duration_ms = int((time.time() - start) * 1000)
+def submit_evaluation(**kwargs) -> bool:
+    """
+    Queue evaluate_and_reflect on the background pool with its own DB
+    session (the request's session is closed once the reply is sent).
+    Returns False when EVAL_MAX_PENDING jobs are already waiting.
+    """
+    if not _EVAL_SLOTS.acquire(blocking=False):
+        EVAL_JOBS.labels(outcome="rejected").inc()
+        return False
 
-    record_mcp_call(
-        db=db,
-        session_id=session_id,
-        name="agent",
-        tool="run",
-        args={"transcript": transcript},
-        result=agent_response,
-        status="success",
-        duration_ms=duration_ms,
-        run_id=run_id
-    )
+    def job():
+        eval_db = SessionLocal()
+        try:
+            evaluate_and_reflect(db=eval_db, **kwargs)
+            EVAL_JOBS.labels(outcome="completed").inc()
+        except Exception as e:
+            EVAL_JOBS.labels(outcome="failed").inc()
+            print("Background evaluation failed:", e)
+        finally:
+            eval_db.close()
+            _EVAL_SLOTS.release()
+
+    try:
+        EVAL_POOL.submit(contextvars.copy_context().run, job)
+    except RuntimeError:
+        # Pool shut down: the caller releases the run memo
+        _EVAL_SLOTS.release()
+        EVAL_JOBS.labels(outcome="rejected").inc()
+        return False
+    return True
 
-    if not ground_truth:
-        return agent_response
+
+def evaluate_and_reflect(
+    *,
+    execute_fn,
+    db,
+    transcript: str,
+    session_id: str,
+    ground_truth: str,
+    run_id: str,
+    lc_config=None,
+    agent_response: dict,
+):
+    """
+    BLEU / ROUGE against ground truth; below BLEU_THRESHOLD, rerun the
+    agent with reflexion feedback and keep the better reply.
+
+    The rerun shares `run_id`, so tool results from the first pass are
+    served from the run memo; the memo is released when this returns.
+    """
+    try:
+        return _evaluate_and_reflect(
+            execute_fn=execute_fn,
+            db=db,
+            transcript=transcript,
+            session_id=session_id,
+            ground_truth=ground_truth,
+            run_id=run_id,
+            lc_config=lc_config,
+            agent_response=agent_response,
+        )
+    finally:
+        RUN_MEMO.finish(run_id)
+
+
+def _evaluate_and_reflect(
+    *,
+    execute_fn,
+    db,
+    transcript: str,
+    session_id: str,
+    ground_truth: str,
+    run_id: str,
+    lc_config=None,
+    agent_response: dict,
+):
 
     # ===============================
     # EVALUATION
@@ -73,6 +215,9 @@ def run_with_evaluation(
 
     status = "failed" if scores["bleu"] < BLEU_THRESHOLD else "success"
 
+    for metric, value in scores.items():
+        EVAL_SCORES.labels(metric=metric).observe(value)
+
     record_mcp_call(
         db=db,
         session_id=session_id,
@@ -105,12 +250,15 @@ def run_with_evaluation(
         if system_override:
             task_payload["args"]["system_override"] = system_override
 
-        return execute_fn(
-            db=db,
-            task=task_payload,
-            session_id=session_id,
-            lc_config=lc_config,
-        )
+        # Off the session's turn lane: no session writes / prefetch
+        with replay_scope():
+            return execute_fn(
+                db=db,
+                task=task_payload,
+                session_id=session_id,
+                run_id=run_id,
+                lc_config=lc_config,
+            )
 
     start = time.time()
 
@@ -126,6 +274,7 @@ def run_with_evaluation(
     )
 
     duration_ms = int((time.time() - start) * 1000)
+    saved_tool_calls = RUN_MEMO.saved_calls(run_id)
 
     reflexion_status = (
         "improved"
@@ -133,6 +282,8 @@ def run_with_evaluation(
         else "no_gain"
     )
 
+    REFLEXION_RUNS.labels(status=reflexion_status).inc()
+
     record_mcp_call(
         db=db,
         session_id=session_id,
@@ -144,7 +295,8 @@ def run_with_evaluation(
         },
         result={
             "improved_reply": improved_response,
-            "improved_scores": improved_scores
+            "improved_scores": improved_scores,
+            "saved_tool_calls": saved_tool_calls,
         },
         status=reflexion_status,
         duration_ms=duration_ms,
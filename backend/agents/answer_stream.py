@@ -0,0 +1,89 @@
+"""
+Streamed final answers
+----------------------
+A streamed WS turn runs the normal agent path (guards, planner, order
+auth, escalation, evaluation, mcp_calls audit, turn deadline) inside
+`stream_scope(on_token)`. Only the last step differs: when the plan is
+a single product RAG query, the answer is generated by the LLM over the
+tool's sources and every token is handed to `on_token` as it arrives,
+so speech can start on the first sentence.
+
+- Scope is a contextvar set around the first agent pass only; reflexion
+  reruns and background evaluation never stream
+- Falls back to the tool reply when the turn deadline has already
+  expired or the stream fails before its first token; a stream that
+  breaks midway keeps what was already sent
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+_ON_TOKEN: ContextVar[Optional[Callable[[str], None]]] = ContextVar("answer_on_token", default=None)
+
+_EXECUTOR = None
+
+
+@contextmanager
+def stream_scope(on_token: Optional[Callable[[str], None]]):
+    token = _ON_TOKEN.set(on_token)
+    try:
+        yield
+    finally:
+        _ON_TOKEN.reset(token)
+
+
+def streaming_enabled() -> bool:
+    return _ON_TOKEN.get() is not None
+
+
+def _rag_executor():
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        # Imported here: langchain is only needed once a turn streams
+        from backend.agents.langchain_prompts import build_rag_executor
+
+        # Documents come from the tools, so no retriever
+        _EXECUTOR = build_rag_executor(retriever=None)
+    return _EXECUTOR
+
+
+def stream_answer(
+    question: str,
+    sources: List[Dict],
+    session_id: str,
+    fallback: str,
+    lc_config=None,
+    deadline=None,
+) -> str:
+    """
+    LLM answer over `sources`, streamed to the scope's `on_token`.
+    Returns the full answer (or `fallback`, see module docstring).
+    """
+    on_token = _ON_TOKEN.get()
+    if on_token is None or not sources:
+        return fallback
+    if deadline is not None and deadline.expired():
+        return fallback
+
+    from langchain_core.documents import Document
+
+    docs = [
+        Document(page_content=s.get("page_content", ""), metadata=s.get("metadata") or {})
+        for s in sources
+    ]
+
+    parts = []
+    try:
+        result = _rag_executor()(
+            question, docs=docs, lc_config=lc_config, stream=True, session_id=session_id,
+        )
+        for token in result["tokens"]:
+            parts.append(token)
+            on_token(token)
+    except Exception as e:
+        print("Answer stream failed:", e)
+        if not parts:
+            return fallback
+
+    return "".join(parts) or fallback
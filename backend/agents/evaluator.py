@@ -1,46 +1,39 @@
 import json
-import evaluate
+from concurrent.futures import ThreadPoolExecutor
 
-bleu = evaluate.load("bleu")
-rouge = evaluate.load("rouge")
+from backend.agents.scoring import score_batch, score_pair
 
 
 def evaluate_response(pred: str, ref: str):
-    # BLEU
-    bleu_result = bleu.compute(
-        predictions=[pred],
-        references=[[ref]]
-    )
-    bleu_score = bleu_result["bleu"]
-
-    # ROUGE
-    rouge_result = rouge.compute(
-        predictions=[pred],
-        references=[ref]
-    )
-    rouge_l = rouge_result["rougeL"]
-
-    return {
-        "bleu": round(bleu_score, 4),
-        "rougeL": round(rouge_l, 4)
-    }
-
-
-def run_evaluation(dataset_path, responder_fn):
+    """
+    BLEU / ROUGE-L for one reply (native scorer, same numbers as
+    HF evaluate "bleu" / "rouge"; see backend/agents/scoring.py).
+    """
+    return score_pair(pred, ref)
+
+
+def run_evaluation(dataset_path, responder_fn, workers: int = 1):
+    """
+    Score responder_fn over a dataset of {id, query, ground_truth} rows.
+    With workers > 1 the responder calls run on a thread pool.
+    """
     with open(dataset_path) as f:
         data = json.load(f)
 
-    results = []
-    for row in data:
-        pred = responder_fn(row["query"])
-        scores = evaluate_response(pred, row["ground_truth"])
-        results.append({
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        preds = list(pool.map(lambda row: responder_fn(row["query"]), data))
+
+    scores = score_batch(
+        (pred, row["ground_truth"]) for pred, row in zip(preds, data)
+    )
+
+    return [
+        {
             "id": row["id"],
             "query": row["query"],
             "prediction": pred,
             "reference": row["ground_truth"],
-            **scores
-        })
-
-    return results
-    
+            **score,
+        }
+        for row, pred, score in zip(data, preds, scores)
+    ]
@@ -1,29 +1,47 @@
-import re
+import contextvars
 from time import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from backend.rag.rag import handle_rag
-from backend.memory.graph import get_similar_products
-from backend.db.db import get_product_by_id, save_last_product
+from backend.rag.rag import handle_rag, retrieve_for_turn
+from backend.db.db import POSTGRES_BREAKER, SessionLocal, save_last_product
+from backend.core.circuit_breaker import CircuitOpen
+from backend.db.cache import SESSION_AUTH_CACHE, ORDER_STATUS_CACHE
+from backend.memory.prefetch import PREFETCHER
+from backend.memory.session_store import SESSION_STORE
 from backend.agents.planner_router import route_to_planner
+from backend.agents.planner import IntentMatch, match_intents
+from backend.agents.intent_router import get_intent_router
+from backend.agents.run_memo import is_replay, memoized, run_scope
+from backend.agents.answer_stream import stream_answer, streaming_enabled
+from backend.rag.vector_index import get_vector_index
+from backend.core.config import INTENT_ROUTER_ENABLED, PLAN_WORKERS
+from backend.observability.metrics import AGENT_TURN_LATENCY, INTENT_ROUTE_COUNT
+from backend.core.deadline import BudgetExceeded, call_with_deadline, check_capacity, wait_with_deadline
+from backend.observability.stages import stage
 from backend.rag.faq_policy import handle_faq_query, handle_policy_query
 
-# -----------------------------
-# Session Store 
-# -----------------------------
-SESSION_STORE: Dict[str, Dict[str, Any]] = {}
-
 COLOR_WORDS = {"red", "blue", "green", "black", "white"}
 FABRIC_WORDS = {"cotton", "linen", "rayon"}
 
+# Spoken while the slow part of the turn is abandoned
+DEGRADED_REPLY = "Let me check that for you."
+
+# Vector partitions each retrieval tool reads
+TASK_DOC_TYPES = {
+    "rag_query": ("product", "video_transcript"),
+    "faq_query": ("faq",),
+    "policy_query": ("policy",),
+}
+
 
 # -----------------------------
 # Auth Helper
 # -----------------------------
 
-def get_session_auth(db: Session, session_id: str):
+def _load_session_auth(db: Session, session_id: str):
     row = db.execute(
         text("""
             SELECT auth_level, customer_id
@@ -40,8 +58,18 @@ def get_session_auth(db: Session, session_id: str):
         "auth_level": row.auth_level,
         "customer_id": row.customer_id,
     }
-    
-def get_order_status(db: Session, order_id: str, customer_id: str):
+
+
+def get_session_auth(db: Session, session_id: str):
+    return memoized(
+        "session_auth", session_id,
+        SESSION_AUTH_CACHE.get_or_load,
+        session_id,
+        lambda: POSTGRES_BREAKER.call(_load_session_auth, db, session_id),
+    )
+
+
+def _load_order_status(db: Session, order_id: str, customer_id: str):
     row = db.execute(
         text("""
             SELECT status, eta
@@ -60,17 +88,41 @@ def get_order_status(db: Session, order_id: str, customer_id: str):
     }
 
 
+def get_order_status(db: Session, order_id: str, customer_id: str):
+    return memoized(
+        "order_status", (order_id, customer_id),
+        ORDER_STATUS_CACHE.get_or_load,
+        (order_id, customer_id),
+        lambda: POSTGRES_BREAKER.call(_load_order_status, db, order_id, customer_id),
+    )
+
+
+# -----------------------------
+# Session Memory
+# -----------------------------
+
+def remember_product(session_id: str, product_id):
+    """
+    Product memory for follow-ups. Skipped on reflexion reruns, which
+    run off the session's turn lane and may finish after later turns.
+    """
+    if is_replay():
+        return
+
+    SESSION_STORE.update(session_id, last_product_id=product_id)
+    # Likely next turn: "similar products" / "is it in green"
+    PREFETCHER.schedule(session_id, product_id)
+
 
 # -----------------------------
 # Guard Helpers
 # -----------------------------
 
-def handle_price_constraint(transcript: str):
-    m = re.search(r"(under|less than)\s+(\d+)", transcript)
-    if not m:
+def handle_price_constraint(match: IntentMatch):
+    price = match.slots.get("max_price")
+    if price is None:
         return None
 
-    price = int(m.group(2))
     return {
         "type": "final",
         "reply": f"Sorry, I don’t have any shirts available under ₹{price} at the moment.",
@@ -78,16 +130,19 @@ def handle_price_constraint(transcript: str):
     }
 
 
-def handle_memory_followup(transcript: str, session: dict, db: Session):
+def handle_memory_followup(match: IntentMatch, session: dict, db: Session, session_id: str):
     last_pid = session.get("last_product_id")
     if not last_pid:
         return None
 
     FOLLOW_UP_PHRASES = {"it", "that", "same", "this"}
 
-    if last_pid and any(p in transcript.split() for p in FOLLOW_UP_PHRASES):
-        if any(c in transcript for c in COLOR_WORDS):
-            product = get_product_by_id(last_pid)
+    if last_pid and match.tokens.intersection(FOLLOW_UP_PHRASES):
+        if match.tokens.intersection(COLOR_WORDS):
+            try:
+                product = PREFETCHER.get_product(session_id, last_pid)
+            except CircuitOpen:
+                return None
             return {
                 "type": "final",
                 "reply": f"{product['name']} is available in multiple colours. Green is currently in stock.",
@@ -96,8 +151,8 @@ def handle_memory_followup(transcript: str, session: dict, db: Session):
 
 
 
-def handle_ambiguity(transcript: str):
-    tokens = set(transcript.split())
+def handle_ambiguity(match: IntentMatch):
+    tokens = match.tokens
 
     if (
         "shirt" in tokens
@@ -111,6 +166,161 @@ def handle_ambiguity(transcript: str):
     return None
 
 
+# -----------------------------
+# Turn Retrieval
+# -----------------------------
+
+def retrieve_for_plan(plan, embeddings=None):
+    """
+    Embed each distinct query in the plan once and search every
+    partition its tools need. Returns {query: {doc_type: hits}}.
+    `embeddings` maps queries to vectors already computed this turn.
+    """
+    embeddings = embeddings or {}
+    doc_types_by_query: Dict[str, set] = {}
+    for subtask in plan:
+        doc_types = TASK_DOC_TYPES.get(subtask.get("task"))
+        query = subtask.get("args", {}).get("query")
+        if doc_types and query:
+            doc_types_by_query.setdefault(query, set()).update(doc_types)
+
+    retrieved = {}
+    for query, doc_types in doc_types_by_query.items():
+        try:
+            doc_types = tuple(sorted(doc_types))
+            retrieved[query] = memoized(
+                "retrieval", (query, doc_types),
+                retrieve_for_turn, query, doc_types, embedding=embeddings.get(query),
+            )
+        except Exception as e:
+            # Tools fall back to their own search (and error handling)
+            print("Turn retrieval failed:", e)
+
+    return retrieved
+
+
+# -----------------------------
+# Intent Routing
+# -----------------------------
+
+def _embed_and_classify(transcript: str):
+    embedding = get_vector_index().embed_query(transcript)
+    return embedding, get_intent_router().classify(embedding)
+
+
+def route_by_embedding(match: IntentMatch, transcript: str):
+    """
+    Keyword rules first; if none fired, classify the transcript embedding.
+    Returns (match, {transcript: embedding}) so retrieval reuses the vector.
+    """
+    if match.intents:
+        INTENT_ROUTE_COUNT.labels(intent=match.intents[0], source="keyword").inc()
+        return match, {}
+
+    if not INTENT_ROUTER_ENABLED:
+        INTENT_ROUTE_COUNT.labels(intent="rag_query", source="default").inc()
+        return match, {}
+
+    try:
+        embedding, routed = memoized("intent_router", transcript, _embed_and_classify, transcript)
+    except Exception as e:
+        print("Intent router failed:", e)
+        return match, {}
+
+    print(f"Intent router: {routed}")
+    if routed.accepted:
+        match = match._replace(intents=[routed.intent])
+
+    return match, {transcript: embedding}
+
+
+# -----------------------------
+# Plan Execution
+# -----------------------------
+
+# Shared pool for independent subtasks (I/O bound: vector, graph, SQL)
+PLAN_POOL = ThreadPoolExecutor(max_workers=PLAN_WORKERS, thread_name_prefix="plan")
+
+
+def degraded_response(tool: str) -> Dict[str, Any]:
+    return {
+        "type": "final",
+        "reply": DEGRADED_REPLY,
+        "sources": [],
+        "degraded": tool,
+    }
+
+
+def run_plan(plan: List[Dict], session_id: str, run_id=None, lc_config=None, retrieved=None, deadline=None):
+    """
+    Run the plan's subtasks concurrently (a single subtask runs inline);
+    results come back in plan order regardless of completion order. A
+    subtask that overruns the turn deadline is replaced by a degraded
+    reply; the others keep their results.
+
+    Each subtask gets its own DB session, closed on its worker thread:
+    an overrunning subtask keeps running after the turn has answered
+    (and the request's session is closed).
+    """
+    retrieved = retrieved or {}
+    results: List[Optional[Dict[str, Any]]] = [None] * len(plan)
+
+    def run(i):
+        subtask = plan[i]
+        tool_db = SessionLocal()
+        try:
+            return execute_task(
+                tool_db, subtask, session_id, run_id, lc_config,
+                retrieval=retrieved.get(subtask.get("args", {}).get("query")),
+                deadline=deadline,
+            )
+        finally:
+            tool_db.close()
+
+    if len(plan) == 1:
+        try:
+            results[0] = call_with_deadline(plan[0]["task"], deadline, run, 0)
+        except BudgetExceeded as e:
+            results[0] = degraded_response(e.tool)
+        return results
+
+    # copy_context keeps tracing context in worker threads
+    futures = {}
+    for i, subtask in enumerate(plan):
+        try:
+            if deadline is not None:
+                check_capacity(subtask["task"])
+            futures[i] = PLAN_POOL.submit(contextvars.copy_context().run, run, i)
+        except BudgetExceeded as e:
+            results[i] = degraded_response(e.tool)
+    for i, fut in futures.items():
+        try:
+            results[i] = wait_with_deadline(plan[i]["task"], deadline, fut)
+        except BudgetExceeded as e:
+            results[i] = degraded_response(e.tool)
+
+    return results
+
+
+def merge_results(results: List[Dict[str, Any]]):
+    """
+    Deterministic merge: replies joined and sources concatenated in plan order.
+    Any escalation subtask makes the turn an escalation; `needs_human` is
+    set if any subtask needs one. Returns (reply, sources, type, needs_human).
+    """
+    replies = [r["reply"] for r in results if r and r.get("reply")]
+    sources = []
+    for r in results:
+        if r and r.get("sources"):
+            sources.extend(r["sources"])
+
+    escalated = any(r and r.get("type") == "escalation" for r in results)
+    needs_human = any(r and r.get("needs_human") for r in results)
+
+    final_reply = " ".join(replies) if replies else None
+    return final_reply, sources, "escalation" if escalated else "final", needs_human
+
+
 # -----------------------------
 # Executor Dispatcher
 # -----------------------------
@@ -121,6 +331,22 @@ def execute_task(
     session_id: str,
     run_id=None,
     lc_config=None,
+    retrieval=None,
+    deadline=None,
+) -> Dict[str, Any]:
+    # Tool results are memoized per run_id (reused by reflexion reruns)
+    with run_scope(run_id):
+        return _dispatch_task(db, task, session_id, run_id, lc_config, retrieval, deadline)
+
+
+def _dispatch_task(
+    db: Optional[Session],
+    task: Dict[str, Any],
+    session_id: str,
+    run_id=None,
+    lc_config=None,
+    retrieval=None,
+    deadline=None,
 ) -> Dict[str, Any]:
 
     name = task.get("task")
@@ -132,16 +358,14 @@ def execute_task(
     # -----------------------------
     if name == "rag_query":
         query = args.get("query")
-        rag_resp = handle_rag(query, session_id, lc_config)
+        rag_resp = handle_rag(query, session_id, lc_config, retrieval=retrieval)
         sources = rag_resp.get("sources", [])
 
         # 🔑 Persist product memory if present
         for s in sources:
             meta = s.get("metadata", {})
             if meta.get("type") == "product" and meta.get("product_id"):
-                session = SESSION_STORE.get(session_id, {})
-                session["last_product_id"] = meta["product_id"]
-                SESSION_STORE[session_id] = session
+                remember_product(session_id, meta["product_id"])
                 break
 
         return {
@@ -156,7 +380,8 @@ def execute_task(
 
 
     elif name == "faq_query":
-        answer = handle_faq_query(args.get("query"))
+        query = args.get("query")
+        answer = memoized("faq_query", query, handle_faq_query, query, retrieval=retrieval)
         return {
             "type": "final",
             "reply": answer,
@@ -164,7 +389,8 @@ def execute_task(
         }
 
     elif name == "policy_query":
-        answer = handle_policy_query(args.get("query"))
+        query = args.get("query")
+        answer = memoized("policy_query", query, handle_policy_query, query, retrieval=retrieval)
         return {
             "type": "final",
             "reply": answer,
@@ -186,7 +412,10 @@ def execute_task(
     # ORDER QUERY (AUTH-GUARDED)
     # -----------------------------
     elif name == "order_query":
-        auth = get_session_auth(db, session_id)
+        try:
+            auth = get_session_auth(db, session_id)
+        except CircuitOpen:
+            return degraded_response("postgres")
 
         if not auth or auth["auth_level"] != "authenticated":
             return {
@@ -196,7 +425,17 @@ def execute_task(
             }
 
         order_id = args.get("order_id")
-        order = get_order_status(db, order_id, auth["customer_id"])
+        if not order_id:
+            return {
+                "type": "final",
+                "reply": "Could you share your order number so I can track it?",
+                "sources": [],
+            }
+
+        try:
+            order = get_order_status(db, order_id, auth["customer_id"])
+        except CircuitOpen:
+            return degraded_response("postgres")
 
         if not order:
             return {
@@ -219,7 +458,7 @@ def execute_task(
     # GRAPH SIMILAR PRODUCTS
     # -----------------------------
     elif name == "graph_similar_products":
-        session = SESSION_STORE.get(session_id, {})
+        session = SESSION_STORE.get(session_id)
         product_id = session.get("last_product_id")
 
         if not product_id:
@@ -229,7 +468,13 @@ def execute_task(
                 "sources": [],
             }
 
-        graph_result = get_similar_products(product_id)
+        try:
+            graph_result = memoized(
+                "graph_similar", product_id,
+                PREFETCHER.get_similar, session_id, product_id,
+            )
+        except CircuitOpen:
+            graph_result = []
         graph_result = graph_result[:3]
 
         if not graph_result:
@@ -262,41 +507,68 @@ def execute_task(
     # -----------------------------
     elif name == "agent":
         transcript = args.get("transcript", "").lower().strip()
-        session = SESSION_STORE.get(session_id, {})
-
-        # Price constraint
-        price_resp = handle_price_constraint(transcript)
-        if price_resp:
-            return price_resp
-
-        # Memory follow-up
-        mem_resp = handle_memory_followup(transcript, session, db)
-        if mem_resp:
-            return mem_resp
-
-        # Ambiguity
-        amb_resp = handle_ambiguity(transcript)
-        if amb_resp:
-            return amb_resp
-
-        # Planner → Tools
-        plan = route_to_planner(transcript, session_id, db)
-
-        final_reply = None
-        sources = []
-
-        for subtask in plan:
-            res = execute_task(db, subtask, session_id, run_id, lc_config)
-            if res.get("reply"):
-                final_reply = res["reply"]
-            if res.get("sources"):
-                sources.extend(res["sources"])
-
-        # Persist memory
+        session = SESSION_STORE.get(session_id)
+
+        try:
+            with stage("guards"):
+                # Single pass over the transcript for all intents and slots
+                match = match_intents(transcript)
+
+                # Price constraint
+                price_resp = handle_price_constraint(match)
+                if price_resp:
+                    return price_resp
+
+                # Memory follow-up
+                mem_resp = call_with_deadline(
+                    "memory_followup", deadline,
+                    handle_memory_followup, match, session, db, session_id,
+                )
+                if mem_resp:
+                    return mem_resp
+
+                # Ambiguity
+                amb_resp = handle_ambiguity(match)
+                if amb_resp:
+                    return amb_resp
+
+            with stage("routing"):
+                # Keyword rules, then embedding router as fallback
+                match, turn_embeddings = call_with_deadline(
+                    "intent_router", deadline, route_by_embedding, match, transcript,
+                )
+
+                # Planner → Tools
+                plan = route_to_planner(transcript, session_id, db, match=match)
+
+            with stage("retrieval"):
+                # One embedding per distinct query for the whole plan
+                retrieved = call_with_deadline(
+                    "retrieval", deadline, retrieve_for_plan, plan, turn_embeddings,
+                )
+        except BudgetExceeded as e:
+            return degraded_response(e.tool)
+
+        with stage("tools"):
+            # Independent subtasks run concurrently
+            results = run_plan(plan, session_id, run_id, lc_config, retrieved, deadline)
+            final_reply, sources, response_type, needs_human = merge_results(results)
+
+        # Streamed WS turn: the LLM answers over the product sources
+        if streaming_enabled() and final_reply and len(plan) == 1 and plan[0]["task"] == "rag_query":
+            with stage("answer"):
+                final_reply = stream_answer(
+                    plan[0].get("args", {}).get("query") or transcript,
+                    sources, session_id, final_reply, lc_config, deadline,
+                )
+
+        # Persist memory: only the changed field (the turn-start copy
+        # in `session` may be stale by now)
         product_sources = [s for s in sources if s.get("type") == "product"]
         if product_sources:
-            session["last_product_id"] = product_sources[0].get("product_id")
-            SESSION_STORE[session_id] = session
+            remember_product(session_id, product_sources[0].get("product_id"))
+
+        AGENT_TURN_LATENCY.labels(intent=plan[0]["task"]).observe(time() - start)
 
         if not final_reply:
             return {
@@ -306,9 +578,10 @@ def execute_task(
             }
 
         return {
-            "type": "final",
+            "type": response_type,
             "reply": final_reply,
             "sources": sources,
+            "needs_human": needs_human,
         }
 
     # -----------------------------
@@ -0,0 +1,230 @@
+"""
+Embedding intent router
+-----------------------
+Fallback for turns where no keyword rule fires (typically paraphrases or
+STT misrecognitions such as "talk to someone", "where's my parcel").
+
+- The transcript is embedded once with the retrieval embedding handle;
+  the same vector is reused for retrieval if the turn ends up in RAG
+- Each intent has a centroid: the mean of its normalized labelled
+  examples (SEED_EXAMPLES + backend/tests/rag_test_cases.json)
+- Nearest centroid wins if it clears both the confidence (cosine) and
+  margin (gap to the runner-up) thresholds; otherwise rag_query
+- Centroids are built at startup (`warm_up`) on a background thread with
+  one batched embed_documents call; until then classify() answers
+  "not ready" (rag_query, ready=False) instead of blocking the turn. A
+  failed build is retried at most every BUILD_RETRY_SECONDS
+"""
+
+import json
+import os
+import threading
+from time import monotonic, perf_counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.core.config import (
+    INTENT_ROUTER_MIN_CONFIDENCE,
+    INTENT_ROUTER_MIN_MARGIN,
+)
+from backend.observability.metrics import INTENT_ROUTE_COUNT, INTENT_ROUTER_LATENCY
+from backend.rag.compact import normalize
+
+TEST_CASES = "backend/tests/rag_test_cases.json"
+
+DEFAULT_INTENT = "rag_query"
+
+BUILD_RETRY_SECONDS = 30.0
+
+# rag_test_cases.json "type" -> planner task
+CASE_TYPE_TASKS = {
+    "product": "rag_query",
+    "faq": "faq_query",
+    "policy": "policy_query",
+    "order": "order_query",
+}
+
+SEED_EXAMPLES: Dict[str, List[str]] = {
+    "rag_query": [
+        "show me a blue shirt",
+        "do you have cotton shirts in size l",
+        "i am looking for a formal shirt",
+        "what is the price of this shirt",
+    ],
+    "faq_query": [
+        "when will my parcel arrive",
+        "how many days does it take to ship",
+        "do you deliver to my city",
+        "what are the shipping charges",
+    ],
+    "policy_query": [
+        "can i send it back",
+        "how do i get my money back",
+        "can i exchange a product",
+        "what happens if the item is damaged",
+    ],
+    "order_query": [
+        "where is my parcel",
+        "track my package",
+        "has my order been shipped",
+        "what is the status of my purchase",
+    ],
+    "escalation_query": [
+        "talk to someone",
+        "i want to speak to a person",
+        "connect me to customer care",
+        "let me talk to a real person",
+    ],
+    "graph_similar_products": [
+        "show me something like this",
+        "anything else like that one",
+        "other options like this shirt",
+        "what else is there like this",
+    ],
+}
+
+
+class RoutedIntent(NamedTuple):
+    intent: str
+    confidence: float
+    margin: float
+    accepted: bool
+    ready: bool = True
+
+
+NOT_READY = RoutedIntent(intent=DEFAULT_INTENT, confidence=0.0, margin=0.0, accepted=False, ready=False)
+
+
+def load_labelled_examples(path: str = TEST_CASES) -> Dict[str, List[str]]:
+    examples = {intent: list(texts) for intent, texts in SEED_EXAMPLES.items()}
+
+    if os.path.exists(path):
+        with open(path) as f:
+            for case in json.load(f):
+                task = CASE_TYPE_TASKS.get(case["type"])
+                if case.get("expected") == "escalation":
+                    task = "escalation_query"
+                if task:
+                    examples.setdefault(task, []).append(case["input"].lower())
+
+    return examples
+
+
+class IntentRouter:
+    """
+    Nearest-centroid classifier over query embeddings.
+    `embed_documents` embeds a batch of texts (one call for all examples).
+    """
+
+    def __init__(
+        self,
+        embed_documents,
+        examples: Optional[Dict[str, List[str]]] = None,
+        min_confidence: float = INTENT_ROUTER_MIN_CONFIDENCE,
+        min_margin: float = INTENT_ROUTER_MIN_MARGIN,
+    ):
+        self.embed_documents = embed_documents
+        self.examples = examples if examples is not None else load_labelled_examples()
+        self.min_confidence = min_confidence
+        self.min_margin = min_margin
+
+        # (intents, centroids), swapped in whole once built
+        self._model: Optional[Tuple[List[str], np.ndarray]] = None
+        self._building = False
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    @property
+    def intents(self) -> List[str]:
+        return self._model[0] if self._model else []
+
+    def build(self):
+        labels, texts = [], []
+        for intent, examples in self.examples.items():
+            labels.extend([intent] * len(examples))
+            texts.extend(examples)
+
+        vectors = normalize(np.asarray(self.embed_documents(texts), dtype=np.float32))
+        labels = np.asarray(labels)
+
+        intents = [intent for intent, examples in self.examples.items() if examples]
+        centroids = np.vstack([
+            normalize(vectors[labels == intent].mean(axis=0)) for intent in intents
+        ])
+        self._model = (intents, centroids)
+
+    def warm_up(self) -> bool:
+        """
+        Build on a background thread unless built, building, or a failed
+        build is still backing off. Returns True if a build was started.
+        """
+        with self._lock:
+            if self.ready or self._building or monotonic() < self._next_attempt:
+                return False
+            self._building = True
+
+        threading.Thread(target=self._build_in_background, name="intent-router", daemon=True).start()
+        return True
+
+    def _build_in_background(self):
+        try:
+            start = perf_counter()
+            self.build()
+            print(f"Intent router ready ({perf_counter() - start:.2f}s)")
+        except Exception as e:
+            print("Intent router build failed:", e)
+            self._next_attempt = monotonic() + BUILD_RETRY_SECONDS
+        finally:
+            with self._lock:
+                self._building = False
+
+    def classify(self, embedding: Sequence[float]) -> RoutedIntent:
+        model = self._model
+        if model is None:
+            self.warm_up()
+            INTENT_ROUTE_COUNT.labels(intent=DEFAULT_INTENT, source="not_ready").inc()
+            return NOT_READY
+
+        start = perf_counter()
+
+        intents, centroids = model
+        scores = centroids @ normalize(np.asarray(embedding, dtype=np.float32))
+        order = np.argsort(-scores)
+        best = float(scores[order[0]])
+        runner_up = float(scores[order[1]]) if len(order) > 1 else -1.0
+        intent = intents[order[0]]
+
+        accepted = best >= self.min_confidence and best - runner_up >= self.min_margin
+        routed = RoutedIntent(
+            intent=intent if accepted else DEFAULT_INTENT,
+            confidence=round(best, 4),
+            margin=round(best - runner_up, 4),
+            accepted=accepted,
+        )
+
+        INTENT_ROUTER_LATENCY.labels(intent=routed.intent).observe(perf_counter() - start)
+        INTENT_ROUTE_COUNT.labels(
+            intent=routed.intent,
+            source="embedding" if accepted else "default",
+        ).inc()
+
+        return routed
+
+
+_ROUTER: Optional[IntentRouter] = None
+
+
+def get_intent_router() -> IntentRouter:
+    """
+    Shared router using the retrieval embedding handle.
+    """
+    global _ROUTER
+    if _ROUTER is None:
+        from backend.rag.vector_index import get_vector_index
+        _ROUTER = IntentRouter(get_vector_index().embed_documents)
+    return _ROUTER
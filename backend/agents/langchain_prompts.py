@@ -1,7 +1,8 @@
 
 import os
 from langchain.prompts import PromptTemplate
-from backend.core.llm_client import openai_chat, hf_chat
+from backend.core.llm_client import openai_chat, openai_chat_stream, hf_chat
+from backend.agents.prompt_budget import assemble_prompt
 from backend.core.config import EMBEDDING_BACKEND
 from langchain_core.runnables import RunnableLambda
 
@@ -10,6 +11,15 @@ def build_rag_executor(retriever):
     """
     Returns a callable that performs:
     retrieval → prompt assembly → FINAL LLM CALL
+
+    Prompt assembly is token-budgeted (prompt_budget.assemble_prompt):
+    documents are ranked and truncated, and `chat_history` (loaded from
+    the session's `conversations` row when not given) is compacted.
+    `docs` skips retrieval (documents a tool already found).
+
+    With stream=True the result's "tokens" is an iterator yielding the
+    completion as it is generated (so TTS can start on the first
+    sentence); "answer" is filled in once the iterator is exhausted.
     """
     system_prompt = (
         "You are an ecommerce assistant. Use retrieved documents to answer user queries. "
@@ -29,22 +39,40 @@ def build_rag_executor(retriever):
         template=system_prompt + "\n\nContext:\n{retrieved_docs}\n\nConversation History:\n{chat_history}\n\nUser question: {question}\n\nProvide a concise answer."
     )
 
-    def run(transcript: str, chat_history=None, lc_config=None):
-        # Retrieve documents
-        docs = retriever.get_relevant_documents(transcript)
+    def stream_llm_call(prompt: str, session_id=None):
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
 
-        context = "\n".join(d.page_content for d in docs)
+        if EMBEDDING_BACKEND == "openai":
+            yield from openai_chat_stream(messages, session_id=session_id)
 
-        # Build final prompt
-        final_prompt = f"""
-        {system_prompt}
+        elif EMBEDDING_BACKEND == "hf":
+            # Local pipeline has no token stream; one chunk
+            yield hf_chat(prompt)
 
-        Context:
-        {context}
+        else:
+            yield "Dummy response"
 
-        User:
-        {transcript}
-        """
+    def run(transcript: str, chat_history=None, lc_config=None, stream=False, session_id=None, docs=None):
+        # Retrieve documents
+        if docs is None:
+            docs = retriever.get_relevant_documents(transcript)
+
+        if chat_history is None and session_id:
+            try:
+                # Imported here: backend.db.db needs a configured database
+                from backend.db.db import get_history
+                chat_history = get_history(session_id)
+            except Exception as e:
+                print("History load failed:", e)
+                chat_history = []
+
+        # Build final prompt within the token budget
+        assembled = assemble_prompt(system_prompt, transcript, docs, chat_history or [])
+        final_prompt = assembled.prompt
+        docs = assembled.docs
 
         # FINAL LLM CALL
         def helicone_llm_call(inputs: dict):
@@ -62,6 +90,19 @@ def build_rag_executor(retriever):
 
             return "Dummy response"
 
+        if stream:
+            result = {"answer": None, "source_documents": docs}
+
+            def tokens():
+                parts = []
+                for token in stream_llm_call(final_prompt, session_id):
+                    parts.append(token)
+                    yield token
+                result["answer"] = "".join(parts)
+
+            result["tokens"] = tokens()
+            return result
+
         trace_runnable = RunnableLambda(lambda x: x["prompt"])
 
         reply = trace_runnable.invoke(
@@ -1,95 +1,171 @@
-from typing import List, Dict
+from typing import Any, Dict, List, NamedTuple, Optional
 import re
 
+# -----------------------------
+# Intent rules
+# -----------------------------
+# Declarative table in priority order: (name, task, keywords, slot pattern).
+# Compiled once at import:
+# - keywords -> a token-prefix automaton, so each word costs one dict
+#   lookup (keywords match at word starts: "refund" also hits "refunds")
+# - slot patterns -> one combined regex with a named group per rule,
+#   only run when the transcript contains a digit
+# Rules with task=None only extract slots.
+
+ORDER_ID_PATTERN = r"(?:ord(?:er)?[\s-]*)?(?P<order_digits>\d(?:[\s-]*\d){2,5})"
+
+INTENT_RULES = [
+    ("price", None, (), r"(?:under|less than)\s+(?P<max_price>\d+)"),
+    ("order", "order_query", (), ORDER_ID_PATTERN),
+    ("escalation", "escalation_query", ("human", "agent", "representative", "support"), None),
+    ("policy", "policy_query", ("return policy", "refund", "returns"), None),
+    ("faq", "faq_query", ("delivery", "shipping"), None),
+    ("similar", "graph_similar_products", ("similar", "alternatives", "compare"), None),
+]
+
+_RULE_TASKS = {name: task for name, task, _, _ in INTENT_RULES}
+_RULE_PRIORITY = {name: i for i, (name, _, _, _) in enumerate(INTENT_RULES)}
+
+SLOT_PATTERN = re.compile(
+    r"\b(?:"
+    + "|".join(
+        f"(?P<{name}>{pattern})"
+        for name, _, _, pattern in INTENT_RULES
+        if pattern
+    )
+    + ")"
+)
+
+_KEYWORDS = [
+    (tuple(kw.split()), name)
+    for name, _, keywords, _ in INTENT_RULES
+    for kw in keywords
+]
+_PREFIX_LEN = min(len(words[0]) for words, _ in _KEYWORDS)
+
+KEYWORD_INDEX: Dict[str, List] = {}
+for _words, _name in _KEYWORDS:
+    KEYWORD_INDEX.setdefault(_words[0][:_PREFIX_LEN], []).append((_words, _name))
+
+_HAS_DIGIT = re.compile(r"\d")
+_ORDER_ID_RE = re.compile(r"\b" + ORDER_ID_PATTERN)
+_STRIP_PUNCT = re.compile(r"[?.!,]")
+
+
+class IntentMatch(NamedTuple):
+    text: str                 # normalized transcript
+    tokens: frozenset         # whitespace tokens of `text`
+    intents: List[str]        # matched tasks, in rule priority order
+    slots: Dict[str, Any]     # order_id, max_price
+
+
 # -----------------------------
 # Helpers
 # -----------------------------
 
 def normalize_text(t: str) -> str:
-    return (
-        t.lower()
-         .replace("?", "")
-         .replace(".", "")
-         .replace("-", "")
-         .replace("on", "ord")   # fixes "order on 0-0-2"
-    )
+    return _STRIP_PUNCT.sub("", t.lower())
 
 def extract_order_id(text: str):
-    t = text.lower().replace("-", "").replace(" ", "")
-    m = re.search(r"(ord|order)?(\d{3,6})", t)
+    m = _ORDER_ID_RE.search(text.lower())
     if m:
-        return f"ORD-{m.group(2)}"
+        return "ORD-" + re.sub(r"\D", "", m.group("order_digits"))
     return None
 
 
+def _match_keywords(words: List[str], matched: set):
+    for i, word in enumerate(words):
+        candidates = KEYWORD_INDEX.get(word[:_PREFIX_LEN])
+        if not candidates:
+            continue
+        for kw_words, name in candidates:
+            last = len(kw_words) - 1
+            if i + last >= len(words):
+                continue
+            if all(words[i + j] == kw_words[j] for j in range(last)) \
+                    and words[i + last].startswith(kw_words[last]):
+                matched.add(name)
+
+
+def match_intents(transcript: str) -> IntentMatch:
+    """
+    Tokenize once and return every matched intent and slot in one scan.
+    """
+    text = normalize_text(transcript)
+    words = text.split()
+
+    matched = set()
+    slots: Dict[str, Any] = {}
+
+    _match_keywords(words, matched)
+
+    if _HAS_DIGIT.search(text):
+        for m in SLOT_PATTERN.finditer(text):
+            name = m.lastgroup
+            matched.add(name)
+
+            if name == "price" and "max_price" not in slots:
+                slots["max_price"] = int(m.group("max_price"))
+            elif name == "order" and "order_id" not in slots:
+                slots["order_id"] = "ORD-" + re.sub(r"\D", "", m.group("order_digits"))
+
+    intents = [
+        _RULE_TASKS[name]
+        for name in sorted(matched, key=_RULE_PRIORITY.get)
+        if _RULE_TASKS[name]
+    ]
+
+    return IntentMatch(
+        text=text,
+        tokens=frozenset(words),
+        intents=intents,
+        slots=slots,
+    )
+
+
 # -----------------------------
 # Main Planner
 # -----------------------------
 
+def _task_args(intent: str, transcript: str, match: IntentMatch) -> Dict[str, Any]:
+    if intent == "order_query":
+        return {"order_id": match.slots.get("order_id")}
+    if intent in ("escalation_query", "graph_similar_products"):
+        return {}
+    # policy / faq / rag
+    return {"query": transcript}
+
+
 def plan_user_request(
     transcript: str,
     session_id: str,
     db,
+    match: Optional[IntentMatch] = None,
 ) -> List[Dict]:
     """
     Rule-based planner that emits tool-level tasks.
     Stateless by design.
-    """
-
-    transcript_l = normalize_text(transcript)
-
-    # --------------------------------------------------
-    # ORDER TRACKING
-    # --------------------------------------------------
-    order_id = extract_order_id(transcript_l)
-    if order_id:
-        return [{
-            "task": "order_query",
-            "args": {"order_id": order_id},
-        }]
 
-    # --------------------------------------------------
-    # HUMAN ESCALATION
-    # --------------------------------------------------
-    if any(k in transcript_l for k in ["human", "agent", "representative", "support"]):
-        return [{
-            "task": "escalation_query",
-            "args": {},
-        }]
+    One task per matched intent, in rule priority order. The tasks are
+    independent (each reads only the session state from earlier turns),
+    so the executor runs them concurrently.
+    """
 
-    # --------------------------------------------------
-    # POLICY
-    # --------------------------------------------------
-    if any(k in transcript_l for k in ["return policy", "refund", "returns"]):
-        return [{
-            "task": "policy_query",
-            "args": {"query": transcript},
-        }]
+    if match is None:
+        match = match_intents(transcript)
 
     # --------------------------------------------------
-    # FAQ
+    # DEFAULT → RAG
     # --------------------------------------------------
-    if any(k in transcript_l for k in ["delivery", "shipping"]):
-        return [{
-            "task": "faq_query",
-            "args": {"query": transcript},
-        }]
+    intents = match.intents or ["rag_query"]
 
-    # --------------------------------------------------
-    # SIMILAR PRODUCTS
-    # --------------------------------------------------
-    if any(k in transcript_l for k in ["similar", "similar products", "alternatives", "compare"]):
-        return [{
-            "task": "graph_similar_products",
-            "args": {},
-        }]
+    plan = [
+        {
+            "id": f"t{i}",
+            "task": intent,
+            "args": _task_args(intent, transcript, match),
+        }
+        for i, intent in enumerate(intents)
+    ]
 
-    # --------------------------------------------------
-    # DEFAULT → RAG
-    # --------------------------------------------------
-    return [{
-        "task": "rag_query",
-        "args": {
-            "query": transcript,
-        },
-    }]
+    return plan
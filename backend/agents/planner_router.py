@@ -1,6 +1,4 @@
 from backend.agents.planner import plan_user_request
 
-def route_to_planner(transcript: str, session_id: str, db):
-    text = transcript.lower()
-    return plan_user_request(transcript, session_id, db)
-
+def route_to_planner(transcript: str, session_id: str, db, match=None):
+    return plan_user_request(transcript, session_id, db, match=match)
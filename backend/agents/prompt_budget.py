@@ -0,0 +1,265 @@
+"""
+Token-budgeted prompt assembly for the RAG executor
+---------------------------------------------------
+Keeps the final prompt under PROMPT_TOKEN_BUDGET tokens:
+
+- Fixed part: system prompt, user question and section scaffolding
+- History (up to PROMPT_HISTORY_SHARE of what is left): the most
+  recent turns verbatim; older turns compacted into a one-line
+  "Earlier:" summary of what the user asked (first clause of each
+  user turn), dropped entirely when even that does not fit
+- Context (everything left, including unused history budget):
+  retrieved documents ranked by query-term overlap plus retrieval
+  order, near-duplicates dropped, the last one truncated to fit
+
+Tokens are counted with tiktoken when installed, otherwise with a
+regex approximation (words / punctuation, ~4 chars per token).
+
+Metrics: prompt_tokens, prompt_tokens_saved_total{section}
+"""
+
+import re
+from typing import Any, List, NamedTuple, Sequence
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+from backend.core.config import (
+    LLM_MODEL,
+    PROMPT_TOKEN_BUDGET,
+    PROMPT_HISTORY_SHARE,
+    PROMPT_RECENT_TURNS,
+    PROMPT_MIN_DOC_TOKENS,
+)
+from backend.observability.metrics import PROMPT_TOKENS, PROMPT_TOKENS_SAVED
+
+PROMPT_TEMPLATE = (
+    "{system}\n\n"
+    "Context:\n{context}\n\n"
+    "Conversation History:\n{history}\n\n"
+    "User question: {question}\n\n"
+    "Provide a concise answer."
+)
+
+_APPROX_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"[a-z0-9]+")
+_CLAUSE_END = re.compile(r"[.?!,;]")
+
+# Ignored when matching query terms against documents
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "do", "does", "you", "your", "i", "me", "my",
+    "what", "which", "how", "can", "have", "has", "for", "of", "to", "in", "on",
+    "and", "or", "it", "this", "that", "with", "any", "about", "please",
+}
+
+
+# -------------------------------------------------------------------
+# Tokenizer
+# -------------------------------------------------------------------
+
+def _load_encoding():
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.encoding_for_model(LLM_MODEL)
+    except Exception:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+
+_ENCODING = _load_encoding()
+
+
+def _approx_cost(piece: str) -> int:
+    return 1 + (len(piece) - 1) // 4
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return sum(_approx_cost(m.group()) for m in _APPROX_TOKEN.finditer(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    if _ENCODING is not None:
+        ids = _ENCODING.encode(text, disallowed_special=())
+        return text if len(ids) <= max_tokens else _ENCODING.decode(ids[:max_tokens])
+
+    used = 0
+    for m in _APPROX_TOKEN.finditer(text):
+        used += _approx_cost(m.group())
+        if used > max_tokens:
+            return text[:m.start()].rstrip()
+    return text
+
+
+# -------------------------------------------------------------------
+# Documents
+# -------------------------------------------------------------------
+
+def rank_documents(query: str, docs: Sequence[Any]) -> List[Any]:
+    """
+    Query-term overlap (weighted 2x) plus retrieval order as a prior;
+    exact / near duplicates (same leading text) are dropped.
+    """
+    query_terms = set(_WORD.findall(query.lower())) - STOPWORDS
+    seen = set()
+    scored = []
+
+    for rank, doc in enumerate(docs):
+        text = doc.page_content
+        signature = " ".join(_WORD.findall(text.lower())[:32])
+        if not text.strip() or signature in seen:
+            continue
+        seen.add(signature)
+
+        terms = set(_WORD.findall(text.lower()))
+        overlap = len(query_terms & terms) / len(query_terms) if query_terms else 0.0
+        scored.append((2 * overlap + 1.0 / (rank + 1), rank, doc))
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [doc for _, _, doc in scored]
+
+
+def pack_documents(docs: Sequence[Any], budget: int):
+    """
+    Greedy fill in rank order; the first document that does not fit is
+    truncated if at least PROMPT_MIN_DOC_TOKENS remain. Returns
+    (context, docs_used).
+    """
+    parts, used_docs, used = [], [], 0
+    for doc in docs:
+        text = doc.page_content.strip()
+        cost = count_tokens(text) + 1
+        if used + cost <= budget:
+            parts.append(text)
+            used_docs.append(doc)
+            used += cost
+            continue
+
+        remaining = budget - used - 1
+        if remaining >= PROMPT_MIN_DOC_TOKENS:
+            parts.append(truncate_to_tokens(text, remaining))
+            used_docs.append(doc)
+        break
+
+    return "\n".join(parts), used_docs
+
+
+# -------------------------------------------------------------------
+# History
+# -------------------------------------------------------------------
+
+def _turn_text(turn: Any) -> str:
+    if isinstance(turn, dict):
+        role = turn.get("role") or ("user" if "user" in turn else "assistant")
+        content = turn.get("content") or turn.get(role) or ""
+        return f"{role.capitalize()}: {content}"
+    return str(turn)
+
+
+def _is_user_turn(turn: Any) -> bool:
+    if isinstance(turn, dict):
+        return turn.get("role", "user" if "user" in turn else "") == "user"
+    return str(turn).lower().startswith("user")
+
+
+def compact_history(history: Sequence[Any], budget: int) -> str:
+    """
+    Most recent turns verbatim (newest first until the budget or
+    PROMPT_RECENT_TURNS is reached); older user turns summarized in one
+    "Earlier:" line if it fits.
+    """
+    if not history or budget <= 0:
+        return ""
+
+    kept: List[str] = []
+    used = 0
+    cut = len(history)
+    for i in range(len(history) - 1, -1, -1):
+        if len(kept) >= PROMPT_RECENT_TURNS:
+            break
+        line = _turn_text(history[i])
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+        cut = i
+    kept.reverse()
+
+    older = [
+        _CLAUSE_END.split(_turn_text(t).split(":", 1)[-1].strip(), 1)[0]
+        for t in history[:cut] if _is_user_turn(t)
+    ]
+    older = [q for q in older if q]
+    if older:
+        prefix = "Earlier: user asked about "
+        summary = truncate_to_tokens(prefix + "; ".join(older), budget - used - 1)
+        if len(summary) > len(prefix):
+            kept.insert(0, summary)
+
+    return "\n".join(kept)
+
+
+# -------------------------------------------------------------------
+# Assembly
+# -------------------------------------------------------------------
+
+class AssembledPrompt(NamedTuple):
+    prompt: str
+    context: str
+    history: str
+    docs: List[Any]
+    tokens: int
+    tokens_saved: int
+
+
+def assemble_prompt(
+    system_prompt: str,
+    question: str,
+    docs: Sequence[Any],
+    history: Sequence[Any] = (),
+    budget: int = PROMPT_TOKEN_BUDGET,
+) -> AssembledPrompt:
+    fixed = count_tokens(PROMPT_TEMPLATE.format(system=system_prompt, context="", history="", question=question))
+    available = max(budget - fixed, 0)
+
+    history_text = compact_history(history, int(available * PROMPT_HISTORY_SHARE))
+    history_tokens = count_tokens(history_text)
+
+    ranked = rank_documents(question, docs)
+    context, used_docs = pack_documents(ranked, available - history_tokens)
+
+    prompt = PROMPT_TEMPLATE.format(
+        system=system_prompt, context=context, history=history_text, question=question
+    )
+    tokens = count_tokens(prompt)
+
+    # Against the unbudgeted prompt (every document, full history)
+    full_context = count_tokens("\n".join(d.page_content for d in docs))
+    full_history = count_tokens("\n".join(_turn_text(t) for t in history))
+    context_saved = max(full_context - count_tokens(context), 0)
+    history_saved = max(full_history - history_tokens, 0)
+
+    PROMPT_TOKENS.observe(tokens)
+    PROMPT_TOKENS_SAVED.labels(section="context").inc(context_saved)
+    PROMPT_TOKENS_SAVED.labels(section="history").inc(history_saved)
+
+    return AssembledPrompt(
+        prompt=prompt,
+        context=context,
+        history=history_text,
+        docs=used_docs,
+        tokens=tokens,
+        tokens_saved=context_saved + history_saved,
+    )
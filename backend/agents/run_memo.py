@@ -0,0 +1,147 @@
+"""
+Run-scoped memoization of tool results
+--------------------------------------
+A reflexion rerun replays the same transcript under the same run_id,
+so intent routing, turn retrieval, FAQ / policy answers, graph lookups
+and order lookups would all be repeated verbatim. Inside `run_scope(run_id)`
+those calls go through `memoized(tool, key, fn, ...)` and are served from
+the run's memo on the second pass; only what depends on the reflexion
+override is recomputed.
+
+- Scope is a contextvar, so plan subtasks on PLAN_POOL (copy_context)
+  share it; outside a scope `memoized` just calls fn
+- Exceptions are not memoized (a degraded first pass can recover)
+- Runs are kept for RUN_MEMO_TTL_SECONDS / RUN_MEMO_MAX_RUNS and dropped
+  with `RUN_MEMO.finish(run_id)`, which returns the saved call count;
+  entry points that own a run wrap it in `owned_run(run_id)` so the memo
+  is dropped even when the run raises
+- Reruns execute inside `replay_scope()`: they run off the session's
+  turn lane (possibly after later turns), so the executor skips session
+  writes (last_product_id) and prefetch scheduling there
+
+Metrics: run_memo_lookups_total{tool, result=hit|miss}
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from backend.core.config import RUN_MEMO_ENABLED, RUN_MEMO_MAX_RUNS, RUN_MEMO_TTL_SECONDS
+from backend.observability.metrics import RUN_MEMO_LOOKUPS
+
+_CURRENT_RUN: ContextVar[Optional[str]] = ContextVar("memo_run_id", default=None)
+_REPLAY: ContextVar[bool] = ContextVar("memo_replay", default=False)
+
+
+class _Run:
+    __slots__ = ("expires_at", "results", "saved")
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+        self.results: Dict[Hashable, Any] = {}
+        self.saved = 0
+
+
+class RunMemo:
+    def __init__(self, max_runs: int = RUN_MEMO_MAX_RUNS, ttl: float = RUN_MEMO_TTL_SECONDS):
+        self.max_runs = max_runs
+        self.ttl = ttl
+        self._runs: "OrderedDict[str, _Run]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run(self, run_id: str) -> _Run:
+        now = time()
+        run = self._runs.get(run_id)
+        if run is None or run.expires_at <= now:
+            run = self._runs[run_id] = _Run(now + self.ttl)
+        self._runs.move_to_end(run_id)
+        while len(self._runs) > self.max_runs:
+            self._runs.popitem(last=False)
+        return run
+
+    def get_or_call(self, run_id: str, tool: str, key: Hashable, fn: Callable, *args, **kwargs):
+        memo_key = (tool, key)
+
+        with self._lock:
+            run = self._run(run_id)
+            if memo_key in run.results:
+                run.saved += 1
+                RUN_MEMO_LOOKUPS.labels(tool=tool, result="hit").inc()
+                return run.results[memo_key]
+
+        RUN_MEMO_LOOKUPS.labels(tool=tool, result="miss").inc()
+        value = fn(*args, **kwargs)
+
+        with self._lock:
+            self._run(run_id).results[memo_key] = value
+        return value
+
+    def saved_calls(self, run_id: str) -> int:
+        with self._lock:
+            run = self._runs.get(run_id)
+            return run.saved if run else 0
+
+    def finish(self, run_id: str) -> int:
+        """
+        Drop the run's memo; returns how many tool calls it saved.
+        """
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            return run.saved if run else 0
+
+
+RUN_MEMO = RunMemo()
+
+
+@contextmanager
+def run_scope(run_id: Optional[str]):
+    """
+    Memoize tool calls made in this context under `run_id` (no-op for None).
+    """
+    if not RUN_MEMO_ENABLED or run_id is None:
+        yield
+        return
+
+    token = _CURRENT_RUN.set(run_id)
+    try:
+        yield
+    finally:
+        _CURRENT_RUN.reset(token)
+
+
+@contextmanager
+def owned_run(run_id: Optional[str]):
+    """
+    Drop the run's memo when the block exits, normally or by an exception.
+    """
+    try:
+        yield
+    finally:
+        if run_id is not None:
+            RUN_MEMO.finish(run_id)
+
+
+@contextmanager
+def replay_scope():
+    """
+    Mark calls made in this context as a rerun of an answered turn.
+    """
+    token = _REPLAY.set(True)
+    try:
+        yield
+    finally:
+        _REPLAY.reset(token)
+
+
+def is_replay() -> bool:
+    return _REPLAY.get()
+
+
+def memoized(tool: str, key: Hashable, fn: Callable, *args, **kwargs):
+    run_id = _CURRENT_RUN.get()
+    if run_id is None:
+        return fn(*args, **kwargs)
+    return RUN_MEMO.get_or_call(run_id, tool, key, fn, *args, **kwargs)
@@ -0,0 +1,202 @@
+"""
+Native BLEU and ROUGE-L
+-----------------------
+Drop-in replacement for HF `evaluate` "bleu" / "rouge" (rougeL) with no
+model hub download and no heavy imports.
+
+- BLEU: tokenizer_13a + the reference compute_bleu used by `evaluate`
+  (max order 4, no smoothing, brevity penalty)
+- ROUGE-L: rouge_score's default tokenizer (lowercase, [a-z0-9]+ runs),
+  LCS F-measure; LCS uses a bit-parallel algorithm, one big-int word
+  per reference, so a pair costs O(len(pred)) integer ops
+
+score_batch() scores many (prediction, reference) pairs in one call,
+tokenizing each distinct string once.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+MAX_ORDER = 4
+
+# tokenizer_13a (as in sacrebleu / evaluate)
+_13A_RULES = [
+    (re.compile(r"([\{-\~\[-\` -\&\(-\+\:-\@\/])"), r" \1 "),
+    (re.compile(r"([^0-9])([\.,])"), r"\1 \2 "),
+    (re.compile(r"([\.,])([^0-9])"), r" \1 \2"),
+    (re.compile(r"([0-9])(-)"), r"\1 \2 "),
+]
+
+# rouge_score DefaultTokenizer (no stemming)
+_ROUGE_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize_13a(line: str) -> List[str]:
+    line = line.replace("<skipped>", "").replace("-\n", "").replace("\n", " ")
+    if "&" in line:
+        line = (
+            line.replace("&quot;", '"')
+                .replace("&amp;", "&")
+                .replace("&lt;", "<")
+                .replace("&gt;", ">")
+        )
+    line = f" {line} "
+    for pattern, repl in _13A_RULES:
+        line = pattern.sub(repl, line)
+    return line.split()
+
+
+def tokenize_rouge(text: str) -> List[str]:
+    return _ROUGE_TOKEN.findall(text.lower())
+
+
+# -------------------------------------------------------------------
+# BLEU
+# -------------------------------------------------------------------
+
+def _ngrams(tokens: Sequence[str], max_order: int) -> Counter:
+    counts = Counter()
+    for order in range(1, max_order + 1):
+        counts.update(zip(*[tokens[i:] for i in range(order)]))
+    return counts
+
+
+def _bleu_stats(pred: List[str], refs: List[List[str]], max_order: int):
+    """
+    (matches_by_order, possible_by_order, pred_len, ref_len) for one pair.
+    """
+    merged = Counter()
+    for ref in refs:
+        merged |= _ngrams(ref, max_order)
+
+    overlap = _ngrams(pred, max_order) & merged
+    matches = [0] * max_order
+    for ngram, count in overlap.items():
+        matches[len(ngram) - 1] += count
+
+    possible = [max(len(pred) - order + 1, 0) for order in range(1, max_order + 1)]
+    return matches, possible, len(pred), min(len(r) for r in refs)
+
+
+def _bleu_from_stats(matches, possible, pred_len, ref_len, max_order: int) -> float:
+    precisions = [
+        matches[i] / possible[i] if possible[i] > 0 else 0.0
+        for i in range(max_order)
+    ]
+    if min(precisions) <= 0 or pred_len == 0 or ref_len == 0:
+        return 0.0
+
+    geo_mean = math.exp(sum(math.log(p) for p in precisions) / max_order)
+    ratio = pred_len / ref_len
+    bp = 1.0 if ratio > 1.0 else math.exp(1 - 1.0 / ratio)
+    return geo_mean * bp
+
+
+def corpus_bleu(
+    predictions: Sequence[str],
+    references: Sequence[Sequence[str]],
+    max_order: int = MAX_ORDER,
+) -> float:
+    """
+    Corpus-level BLEU; same result as evaluate.load("bleu").compute().
+    """
+    matches = [0] * max_order
+    possible = [0] * max_order
+    pred_len = ref_len = 0
+
+    for pred, refs in zip(predictions, references):
+        m, p, pl, rl = _bleu_stats(tokenize_13a(pred), [tokenize_13a(r) for r in refs], max_order)
+        for i in range(max_order):
+            matches[i] += m[i]
+            possible[i] += p[i]
+        pred_len += pl
+        ref_len += rl
+
+    return _bleu_from_stats(matches, possible, pred_len, ref_len, max_order)
+
+
+# -------------------------------------------------------------------
+# ROUGE-L
+# -------------------------------------------------------------------
+
+def lcs_length(a: Sequence[str], b: Sequence[str]) -> int:
+    """
+    Bit-parallel LCS (Hyyrö): one bit per token of `a`.
+    """
+    if not a or not b:
+        return 0
+
+    masks: Dict[str, int] = {}
+    for i, tok in enumerate(a):
+        masks[tok] = masks.get(tok, 0) | (1 << i)
+
+    full = (1 << len(a)) - 1
+    v = full
+    for tok in b:
+        m = masks.get(tok)
+        if m is None:
+            continue
+        u = v & m
+        v = ((v + u) | (v - u)) & full
+
+    return len(a) - bin(v).count("1")
+
+
+def rouge_l(pred_tokens: Sequence[str], ref_tokens: Sequence[str]) -> float:
+    lcs = lcs_length(ref_tokens, pred_tokens)
+    if lcs == 0:
+        return 0.0
+    precision = lcs / len(pred_tokens)
+    recall = lcs / len(ref_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
+# -------------------------------------------------------------------
+# Batch API
+# -------------------------------------------------------------------
+
+def score_batch(
+    pairs: Iterable[Tuple[str, str]],
+    max_order: int = MAX_ORDER,
+) -> List[Dict[str, float]]:
+    """
+    Sentence-level {"bleu", "rougeL"} for each (prediction, reference).
+    """
+    bleu_tokens: Dict[str, List[str]] = {}
+    rouge_tokens: Dict[str, List[str]] = {}
+
+    def bt(s):
+        toks = bleu_tokens.get(s)
+        if toks is None:
+            toks = bleu_tokens[s] = tokenize_13a(s)
+        return toks
+
+    def rt(s):
+        toks = rouge_tokens.get(s)
+        if toks is None:
+            toks = rouge_tokens[s] = tokenize_rouge(s)
+        return toks
+
+    out = []
+    for pred, ref in pairs:
+        stats = _bleu_stats(bt(pred), [bt(ref)], max_order)
+        out.append({
+            "bleu": round(_bleu_from_stats(*stats, max_order), 4),
+            "rougeL": round(rouge_l(rt(pred), rt(ref)), 4),
+        })
+    return out
+
+
+def score_pair(pred: str, ref: str) -> Dict[str, float]:
+    return score_batch([(pred, ref)])[0]
+
+
+def sentence_bleu(pred: str, ref: str, max_order: int = MAX_ORDER) -> float:
+    stats = _bleu_stats(tokenize_13a(pred), [tokenize_13a(ref)], max_order)
+    return _bleu_from_stats(*stats, max_order)
+
+
+def sentence_rouge_l(pred: str, ref: str) -> float:
+    return rouge_l(tokenize_rouge(pred), tokenize_rouge(ref))
@@ -0,0 +1,43 @@
+"""
+Groups streamed LLM tokens into speakable sentences for TTS.
+
+push() returns the sentences completed by a token; flush() returns
+whatever is left once generation ends. A boundary is ., ! or ? followed
+by whitespace, so "2.5" or "₹1,299.00" never split; common abbreviations
+("Rs.", "e.g.") don't end a sentence, and sentences shorter than
+`min_chars` are held back and merged with the next one to avoid
+choppy, tiny utterances.
+"""
+
+import re
+from typing import List, Optional
+
+_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+ABBREVIATIONS = {"rs.", "mr.", "mrs.", "ms.", "dr.", "st.", "no.", "vs.", "e.g.", "i.e.", "etc."}
+
+
+class SentenceBuffer:
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._text = ""
+
+    def push(self, token: str) -> List[str]:
+        self._text += token
+        sentences = []
+        start = 0
+
+        for m in _BOUNDARY.finditer(self._text):
+            candidate = self._text[start:m.end()].strip()
+            last_word = self._text[start:m.end()].split()[-1].lower()
+            if last_word in ABBREVIATIONS or len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = m.end()
+
+        self._text = self._text[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        rest, self._text = self._text.strip(), ""
+        return rest or None
@@ -0,0 +1,99 @@
+"""
+Sentence-level speech for a streamed WS turn.
+
+The agent thread hands tokens to `on_token` (thread-safe); `speak_while`
+forwards them to the client as {"type": "token"} messages, groups them
+into sentences (SentenceBuffer) and synthesizes / sends each sentence
+while generation goes on. `interrupt()` (barge-in) stops audio and
+tokens at once; the turn itself still completes and is returned.
+
+Metric: time_to_first_audio_seconds{mode="stream"}
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from backend.audio.sentence_buffer import SentenceBuffer
+from backend.observability.metrics import TIME_TO_FIRST_AUDIO
+
+CHUNK_BYTES = 4096
+
+
+class SpeechStream:
+    def __init__(
+        self,
+        send_json: Callable[[dict], Awaitable],
+        send_bytes: Callable[[bytes], Awaitable],
+        synthesize: Callable[[str], str],
+        turn_start: Optional[float] = None,
+        min_chars: int = 20,
+    ):
+        self._send_json = send_json
+        self._send_bytes = send_bytes
+        self._synthesize = synthesize
+        self._turn_start = turn_start if turn_start is not None else time.time()
+
+        self._loop = asyncio.get_running_loop()
+        self._tokens: asyncio.Queue = asyncio.Queue()
+        self._sentences: asyncio.Queue = asyncio.Queue()
+        self._buffer = SentenceBuffer(min_chars)
+
+        self.streamed = False
+        self.interrupted = False
+        self.sentences_spoken = 0
+
+    def on_token(self, token: str):
+        self._loop.call_soon_threadsafe(self._tokens.put_nowait, token)
+
+    def interrupt(self):
+        self.interrupted = True
+
+    async def speak_while(self, turn: Awaitable):
+        """
+        Speak tokens until `turn` completes; returns its result.
+        """
+        turn = asyncio.ensure_future(turn)
+        # Tokens scheduled by the agent thread are queued before this
+        turn.add_done_callback(lambda _: self._tokens.put_nowait(None))
+        speaker = asyncio.ensure_future(self._speak())
+
+        try:
+            while (token := await self._tokens.get()) is not None:
+                self.streamed = True
+                if self.interrupted:
+                    continue
+                await self._send_json({"type": "token", "text": token})
+                for sentence in self._buffer.push(token):
+                    self._sentences.put_nowait(sentence)
+
+            rest = self._buffer.flush()
+            if rest:
+                self._sentences.put_nowait(rest)
+        except BaseException:
+            self.interrupt()
+            raise
+        finally:
+            self._sentences.put_nowait(None)
+            await speaker
+
+        return await turn
+
+    async def _speak(self):
+        first_audio = True
+        while (sentence := await self._sentences.get()) is not None:
+            if self.interrupted:
+                continue
+            wav_path = await asyncio.to_thread(self._synthesize, sentence)
+            if self.interrupted:
+                continue
+
+            await self._send_json({"type": "audio_start", "format": "wav", "text": sentence})
+            with open(wav_path, "rb") as f:
+                while not self.interrupted and (chunk := f.read(CHUNK_BYTES)):
+                    if first_audio:
+                        TIME_TO_FIRST_AUDIO.labels(mode="stream").observe(time.time() - self._turn_start)
+                        first_audio = False
+                    await self._send_bytes(chunk)
+            await self._send_json({"type": "audio_end"})
+            self.sentences_spoken += 1
@@ -0,0 +1,129 @@
+"""
+Circuit breakers for external dependencies (neo4j, chroma, postgres)
+--------------------------------------------------------------------
+closed    -> calls pass through; errors and slow calls (> slow_call_seconds)
+             count as failures, a success resets the count
+open      -> after `failure_threshold` consecutive failures; calls fail
+             fast with CircuitOpen so tools return their degraded reply
+half_open -> a background thread probes the dependency every
+             `reset_seconds`; a successful probe closes the breaker
+
+Metrics:
+- circuit_breaker_state{dependency}: 0 closed, 1 open, 2 half-open
+- circuit_breaker_rejected_total{dependency}
+"""
+
+import threading
+from time import monotonic, sleep
+from typing import Callable, Dict, Optional
+
+from backend.core.config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    BREAKER_SLOW_CALL_SECONDS,
+)
+from backend.observability.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE
+
+CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+
+
+class CircuitOpen(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"{name} circuit is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        probe: Optional[Callable[[], object]] = None,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+        reset_seconds: float = BREAKER_RESET_SECONDS,
+    ):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_seconds = reset_seconds
+
+        self.state = CLOSED
+        self.failures = 0
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(dependency=name).set(CLOSED)
+
+    def _set_state(self, state: int):
+        self.state = state
+        CIRCUIT_STATE.labels(dependency=self.name).set(state)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        if self.state != CLOSED:
+            CIRCUIT_REJECTED.labels(dependency=self.name).inc()
+            raise CircuitOpen(self.name)
+
+        start = monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._record_failure()
+            raise
+
+        if monotonic() - start > self.slow_call_seconds:
+            self._record_failure()
+        else:
+            self._record_success()
+        return result
+
+    def _record_success(self):
+        if self.failures:
+            with self._lock:
+                self.failures = 0
+
+    def _record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state != CLOSED or self.failures < self.failure_threshold:
+                return
+            self._set_state(OPEN)
+
+        print(f"Circuit OPEN for {self.name} after {self.failures} failures")
+        threading.Thread(
+            target=self._probe_loop,
+            name=f"breaker-{self.name}",
+            daemon=True,
+        ).start()
+
+    def _probe_loop(self):
+        while True:
+            sleep(self.reset_seconds)
+            self._set_state(HALF_OPEN)
+            try:
+                if self.probe is not None:
+                    self.probe()
+            except Exception as e:
+                print(f"Circuit probe failed for {self.name}:", e)
+                self._set_state(OPEN)
+                continue
+
+            with self._lock:
+                self.failures = 0
+                self._set_state(CLOSED)
+            print(f"Circuit CLOSED for {self.name}")
+            return
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, probe: Optional[Callable[[], object]] = None) -> CircuitBreaker:
+    """
+    Process-wide breaker per dependency. The module that owns the
+    dependency registers the health probe.
+    """
+    breaker = _BREAKERS.get(name)
+    if breaker is None:
+        breaker = _BREAKERS[name] = CircuitBreaker(name, probe=probe)
+    elif probe is not None:
+        breaker.probe = probe
+    return breaker
@@ -12,3 +12,108 @@ HELICONE_API_KEY = os.getenv("HELICONE_API_KEY")
 
 # Observability
 PROMETHEUS_ENABLED = os.getenv("PROMETHEUS_ENABLED", "true").lower() == "true"
+
+# Vector index
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "chroma").lower()
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "backend/data/vector_index")
+VECTOR_INDEX_SETTINGS_PATH = os.getenv(
+    "VECTOR_INDEX_SETTINGS_PATH", "backend/data/chroma/index_settings.json"
+)
+
+# Video transcript hits attached to product answers: max cosine distance
+RAG_TRANSCRIPT_MAX_DISTANCE = float(os.getenv("RAG_TRANSCRIPT_MAX_DISTANCE", "0.5"))
+
+# Compact vector storage (PCA / float16 / int8 + full-precision re-scoring)
+COMPACT_INDEX_ENABLED = os.getenv("COMPACT_INDEX_ENABLED", "false").lower() == "true"
+COMPACT_PCA_DIM = int(os.getenv("COMPACT_PCA_DIM", "0"))
+COMPACT_DTYPE = os.getenv("COMPACT_DTYPE", "float16").lower()
+COMPACT_RESCORE_CANDIDATES = int(os.getenv("COMPACT_RESCORE_CANDIDATES", "50"))
+
+# Embedding intent router (fallback when no keyword rule fires)
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+INTENT_ROUTER_MIN_CONFIDENCE = float(os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "0.55"))
+INTENT_ROUTER_MIN_MARGIN = float(os.getenv("INTENT_ROUTER_MIN_MARGIN", "0.05"))
+
+# Concurrent subtasks in multi-intent plans
+PLAN_WORKERS = int(os.getenv("PLAN_WORKERS", "4"))
+
+# Speculative prefetch of similar products / product row
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_TTL_SECONDS = float(os.getenv("PREFETCH_TTL_SECONDS", "120"))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+
+# Session state store (last_product_id etc.)
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "local").lower()
+SESSION_STORE_MAX_SESSIONS = int(os.getenv("SESSION_STORE_MAX_SESSIONS", "10000"))
+SESSION_STORE_TTL_SECONDS = float(os.getenv("SESSION_STORE_TTL_SECONDS", "1800"))
+SESSION_WRITE_BEHIND = os.getenv("SESSION_WRITE_BEHIND", "false").lower() == "true"
+
+# Session-keyed turn scheduler
+TURN_MAX_CONCURRENCY = int(os.getenv("TURN_MAX_CONCURRENCY", "8"))
+TURN_LANE_IDLE_SECONDS = float(os.getenv("TURN_LANE_IDLE_SECONDS", "300"))
+
+# Read-through caches for session auth / order status / product rows (seconds)
+SESSION_AUTH_CACHE_TTL = float(os.getenv("SESSION_AUTH_CACHE_TTL", "30"))
+ORDER_STATUS_CACHE_TTL = float(os.getenv("ORDER_STATUS_CACHE_TTL", "30"))
+PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", "300"))
+NEGATIVE_CACHE_TTL = float(os.getenv("NEGATIVE_CACHE_TTL", "5"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+# Per-turn latency budget (seconds)
+TURN_BUDGET_SECONDS = float(os.getenv("TURN_BUDGET_SECONDS", "1.5"))
+TOOL_TIMEOUT_SECONDS = float(os.getenv("TOOL_TIMEOUT_SECONDS", "1.0"))
+DEADLINE_WORKERS = int(os.getenv("DEADLINE_WORKERS", "16"))
+DEADLINE_MAX_ABANDONED_PER_TOOL = int(os.getenv("DEADLINE_MAX_ABANDONED_PER_TOOL", "4"))
+
+# Circuit breakers (neo4j / chroma / postgres)
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "2.0"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+# Write-behind logging of mcp_calls
+MCP_LOG_WRITE_BEHIND = os.getenv("MCP_LOG_WRITE_BEHIND", "true").lower() == "true"
+MCP_LOG_QUEUE_SIZE = int(os.getenv("MCP_LOG_QUEUE_SIZE", "10000"))
+MCP_LOG_BATCH_SIZE = int(os.getenv("MCP_LOG_BATCH_SIZE", "200"))
+MCP_LOG_FLUSH_SECONDS = float(os.getenv("MCP_LOG_FLUSH_SECONDS", "1.0"))
+MCP_LOG_OVERFLOW = os.getenv("MCP_LOG_OVERFLOW", "drop").lower()  # drop | spill
+MCP_LOG_SPILL_PATH = os.getenv("MCP_LOG_SPILL_PATH", "backend/data/mcp_calls_spill.jsonl")
+
+# Evaluation / reflexion when ground truth is supplied: async | inline | off
+EVAL_MODE = os.getenv("EVAL_MODE", "async").lower()
+EVAL_WORKERS = int(os.getenv("EVAL_WORKERS", "2"))
+EVAL_MAX_PENDING = int(os.getenv("EVAL_MAX_PENDING", "100"))
+
+# Run-scoped memo of tool results (reused by reflexion reruns)
+RUN_MEMO_ENABLED = os.getenv("RUN_MEMO_ENABLED", "true").lower() == "true"
+RUN_MEMO_MAX_RUNS = int(os.getenv("RUN_MEMO_MAX_RUNS", "1000"))
+RUN_MEMO_TTL_SECONDS = float(os.getenv("RUN_MEMO_TTL_SECONDS", "300"))
+
+# Pooled OpenAI clients (via the Helicone gateway)
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "50"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "3"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.25"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "4"))
+
+# WS turns answered by the streamed RAG LLM (per message: {"stream": true})
+WS_STREAM_LLM = os.getenv("WS_STREAM_LLM", "false").lower() == "true"
+
+# Shared local HF generation engine (hf_chat)
+HF_GEN_MODEL = os.getenv("HF_GEN_MODEL", "distilgpt2")
+HF_GEN_BATCH_SIZE = int(os.getenv("HF_GEN_BATCH_SIZE", "8"))
+HF_GEN_BATCH_WAIT_MS = float(os.getenv("HF_GEN_BATCH_WAIT_MS", "10"))
+HF_GEN_MAX_CONCURRENCY = int(os.getenv("HF_GEN_MAX_CONCURRENCY", "16"))
+HF_GEN_QUANTIZE = os.getenv("HF_GEN_QUANTIZE", "").lower() or None  # int8
+
+# Coalesce identical in-flight FAQ / policy / RAG / retrieval / LLM calls
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# Token-budgeted prompt assembly (RAG executor)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+PROMPT_HISTORY_SHARE = float(os.getenv("PROMPT_HISTORY_SHARE", "0.3"))
+PROMPT_RECENT_TURNS = int(os.getenv("PROMPT_RECENT_TURNS", "6"))
+PROMPT_MIN_DOC_TOKENS = int(os.getenv("PROMPT_MIN_DOC_TOKENS", "32"))
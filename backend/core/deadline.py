@@ -0,0 +1,124 @@
+"""
+Per-turn latency budget
+-----------------------
+A Deadline is created when a turn arrives (agent_ws / agent_handle) and
+passed down through run_with_evaluation -> execute_task -> tools.
+
+Tool calls go through call_with_deadline / wait_with_deadline, which
+bound each call by min(remaining budget, TOOL_TIMEOUT_SECONDS). On
+timeout the caller gets BudgetExceeded immediately and can answer with
+a degraded reply; the blocked call finishes (and is discarded) on its
+worker thread, since blocking clients cannot be interrupted.
+
+Abandoned calls still hold a worker thread, so at most
+DEADLINE_MAX_ABANDONED_PER_TOOL of them may be outstanding per tool;
+beyond that further calls to the tool fail fast with BudgetExceeded
+instead of piling onto a stalled dependency and starving the pool.
+Abandoned calls must not share the request's DB Session (the executor
+gives each plan subtask its own).
+
+Metrics: tool_budget_overruns_total{tool}, tool_calls_abandoned{tool}
+"""
+
+import contextvars
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from time import monotonic
+from typing import Callable, Optional
+
+from backend.core.config import (
+    DEADLINE_MAX_ABANDONED_PER_TOOL,
+    DEADLINE_WORKERS,
+    TOOL_TIMEOUT_SECONDS,
+    TURN_BUDGET_SECONDS,
+)
+from backend.observability.metrics import TOOL_BUDGET_OVERRUNS, TOOL_CALLS_ABANDONED
+
+DEADLINE_POOL = ThreadPoolExecutor(max_workers=DEADLINE_WORKERS, thread_name_prefix="tool")
+
+# tool -> calls that overran their budget and are still running
+_ABANDONED: Counter = Counter()
+_ABANDONED_LOCK = threading.Lock()
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, tool: str):
+        super().__init__(f"Latency budget exceeded in {tool}")
+        self.tool = tool
+
+
+class Deadline:
+    def __init__(self, budget: float = TURN_BUDGET_SECONDS):
+        self.budget = budget
+        self.expires_at = monotonic() + budget
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, cap: Optional[float] = TOOL_TIMEOUT_SECONDS) -> float:
+        remaining = self.remaining()
+        return min(remaining, cap) if cap else remaining
+
+
+def abandoned_calls(tool: str) -> int:
+    with _ABANDONED_LOCK:
+        return _ABANDONED[tool]
+
+
+def check_capacity(tool: str):
+    """
+    Fail fast while the tool already has too many abandoned calls running.
+    """
+    if abandoned_calls(tool) >= DEADLINE_MAX_ABANDONED_PER_TOOL:
+        TOOL_BUDGET_OVERRUNS.labels(tool=tool).inc()
+        raise BudgetExceeded(tool)
+
+
+def _abandon(tool: str, fut: Future):
+    # Not started yet: nothing holds a thread
+    if fut.cancel():
+        return
+
+    with _ABANDONED_LOCK:
+        _ABANDONED[tool] += 1
+        TOOL_CALLS_ABANDONED.labels(tool=tool).set(_ABANDONED[tool])
+
+    def release(_):
+        with _ABANDONED_LOCK:
+            _ABANDONED[tool] -= 1
+            TOOL_CALLS_ABANDONED.labels(tool=tool).set(_ABANDONED[tool])
+
+    fut.add_done_callback(release)
+
+
+def wait_with_deadline(tool: str, deadline: Optional[Deadline], fut: Future):
+    if deadline is None:
+        return fut.result()
+
+    try:
+        return fut.result(timeout=deadline.timeout())
+    except TimeoutError:
+        TOOL_BUDGET_OVERRUNS.labels(tool=tool).inc()
+        _abandon(tool, fut)
+        raise BudgetExceeded(tool)
+
+
+def call_with_deadline(tool: str, deadline: Optional[Deadline], fn: Callable, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) within the turn budget.
+    Without a deadline this is a plain call.
+    """
+    if deadline is None:
+        return fn(*args, **kwargs)
+
+    if deadline.expired():
+        TOOL_BUDGET_OVERRUNS.labels(tool=tool).inc()
+        raise BudgetExceeded(tool)
+    check_capacity(tool)
+
+    fut = DEADLINE_POOL.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+    return wait_with_deadline(tool, deadline, fut)
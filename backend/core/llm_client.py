@@ -1,14 +1,38 @@
 import os
+import time
+import random
+import asyncio
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Dict, Iterator, Optional
 
-from openai import OpenAI
-from transformers import pipeline
+import httpx
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    APIConnectionError,
+    RateLimitError,
+    InternalServerError,
+)
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
-from backend.core.config import EMBEDDING_BACKEND
-from backend.observability.metrics import LLM_CALL_COUNT
+from backend.core.config import (
+    EMBEDDING_BACKEND,
+    LLM_MODEL,
+    LLM_POOL_MAX_CONNECTIONS,
+    LLM_POOL_MAX_KEEPALIVE,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_CONNECT_TIMEOUT,
+    LLM_READ_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_SECONDS,
+    LLM_RETRY_MAX_SECONDS,
+)
+from backend.core.local_llm import LOCAL_ENGINE
+from backend.core.single_flight import SingleFlight, fingerprint
+from backend.observability.metrics import LLM_CALL_COUNT, LLM_RETRIES, LLM_TIME_TO_FIRST_TOKEN
 
 from dotenv import load_dotenv
 
@@ -33,44 +57,259 @@ HELICONE_HEADERS = {
     "Helicone-Property-App": "ecommerce-voicebot",
 }
 
+# ------------------------------------------------------------------
+# Pooled clients (one per process)
+# ------------------------------------------------------------------
+
+# Transient failures worth another attempt (timeouts are connection errors)
+RETRYABLE_ERRORS = (APIConnectionError, RateLimitError, InternalServerError)
+
+
+class LLMClientManager:
+    """
+    Process-wide OpenAI / AsyncOpenAI clients, each on one keep-alive
+    httpx pool, so calls through the gateway reuse TCP+TLS connections.
+    Session headers are sent per request (session_headers), not baked
+    into a client. SDK retries are off; with_retries / awith_retries
+    retry with full-jitter backoff instead.
+    """
+
+    def __init__(
+        self,
+        base_url: str = HELICONE_BASE_URL,
+        api_key: Optional[str] = None,
+        default_headers: Optional[Dict[str, str]] = None,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.default_headers = dict(HELICONE_HEADERS if default_headers is None else default_headers)
+
+        self.limits = httpx.Limits(
+            max_connections=LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(LLM_READ_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self._sync: Optional[OpenAI] = None
+        self._async: Optional[AsyncOpenAI] = None
+
+    @property
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(limits=self.limits, timeout=self.timeout)
+        return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        if self._async_http_client is None:
+            with self._lock:
+                if self._async_http_client is None:
+                    self._async_http_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self._async_http_client
+
+    @property
+    def sync(self) -> OpenAI:
+        if self._sync is None:
+            http_client = self.http_client
+            with self._lock:
+                if self._sync is None:
+                    self._sync = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        default_headers=self.default_headers,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=http_client,
+                    )
+        return self._sync
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async is None:
+            http_client = self.async_http_client
+            with self._lock:
+                if self._async is None:
+                    self._async = AsyncOpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        default_headers=self.default_headers,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=http_client,
+                    )
+        return self._async
+
+    def close(self):
+        if self._http_client is not None:
+            self._http_client.close()
+        self._http_client = self._sync = None
+
+    async def aclose(self):
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+        self._async_http_client = self._async = None
+
+
+LLM_CLIENTS = LLMClientManager()
+
+
+def session_headers(session_id: Optional[str]) -> Dict[str, str]:
+    return {"Helicone-Property-Session": session_id} if session_id else {}
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+    return random.uniform(0, min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * 2 ** attempt))
+
+
+def with_retries(fn, *args, max_retries: int = LLM_MAX_RETRIES, **kwargs):
+    for attempt in range(max_retries + 1):
+        try:
+            return fn(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            LLM_RETRIES.labels(error=type(e).__name__).inc()
+            time.sleep(_backoff(attempt))
+
+
+async def awith_retries(fn, *args, max_retries: int = LLM_MAX_RETRIES, **kwargs):
+    for attempt in range(max_retries + 1):
+        try:
+            return await fn(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            LLM_RETRIES.labels(error=type(e).__name__).inc()
+            await asyncio.sleep(_backoff(attempt))
+
+
 # ------------------------------------------------------------------
 # OPENAI CHAT (used by agent / executor)
 # ------------------------------------------------------------------
 
-def openai_chat(messages, session_id: Optional[str] = None):
+# Identical concurrent completions share one request
+OPENAI_CHAT_FLIGHT = SingleFlight("openai_chat")
+
+
+def openai_chat(messages, session_id: Optional[str] = None, **kwargs):
     """
     OpenAI chat completion via Helicone.
     This is what powers Helicone + LLM_CALL_COUNT.
+
+    Identical in-flight requests (exactly the same messages / params)
+    are coalesced; the shared request carries the leader's session header.
     """
-    print("openai_chat() CALLED — Helicone enabled")
+    return OPENAI_CHAT_FLIGHT.do(
+        fingerprint(LLM_MODEL, messages, kwargs, normalize=False),
+        _openai_chat, messages, session_id, **kwargs,
+    )
 
+
+def _openai_chat(messages, session_id: Optional[str] = None, **kwargs):
     # Metrics
     LLM_CALL_COUNT.labels(backend="openai").inc()
 
-    client = OpenAI(
-        api_key=os.getenv("OPENAI_API_KEY"),
-        base_url=HELICONE_BASE_URL,
-        default_headers={
-            **HELICONE_HEADERS,
-            "Helicone-Property-Session": session_id,
-        },
+    return with_retries(
+        LLM_CLIENTS.sync.chat.completions.create,
+        model=LLM_MODEL,
+        messages=messages,
+        extra_headers=session_headers(session_id),
+        **kwargs,
+    )
+
+
+async def aopenai_chat(messages, session_id: Optional[str] = None, **kwargs):
+    """
+    Async variant of openai_chat on the shared AsyncOpenAI client.
+    """
+    LLM_CALL_COUNT.labels(backend="openai").inc()
+
+    return await awith_retries(
+        LLM_CLIENTS.async_client.chat.completions.create,
+        model=LLM_MODEL,
+        messages=messages,
+        extra_headers=session_headers(session_id),
+        **kwargs,
+    )
+
+def openai_chat_stream(messages, session_id: Optional[str] = None, **kwargs) -> Iterator[str]:
+    """
+    Streamed chat completion: yields content deltas as they arrive.
+    Only opening the stream is retried; a stream that breaks midway
+    raises to the caller (tokens may already have been spoken).
+    """
+    LLM_CALL_COUNT.labels(backend="openai").inc()
+    start = time.perf_counter()
+
+    stream = with_retries(
+        LLM_CLIENTS.sync.chat.completions.create,
+        model=LLM_MODEL,
+        messages=messages,
+        extra_headers=session_headers(session_id),
+        stream=True,
+        **kwargs,
     )
 
-    return client.chat.completions.create(
-        model="gpt-4o-mini",
+    first = True
+    with stream:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first:
+                LLM_TIME_TO_FIRST_TOKEN.labels(backend="openai").observe(time.perf_counter() - start)
+                first = False
+            yield delta
+
+
+async def aopenai_chat_stream(messages, session_id: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+    """
+    Async variant of openai_chat_stream.
+    """
+    LLM_CALL_COUNT.labels(backend="openai").inc()
+    start = time.perf_counter()
+
+    stream = await awith_retries(
+        LLM_CLIENTS.async_client.chat.completions.create,
+        model=LLM_MODEL,
         messages=messages,
+        extra_headers=session_headers(session_id),
+        stream=True,
+        **kwargs,
     )
 
+    first = True
+    async with stream:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            if first:
+                LLM_TIME_TO_FIRST_TOKEN.labels(backend="openai").observe(time.perf_counter() - start)
+                first = False
+            yield delta
+
 # ------------------------------------------------------------------
 # HF FALLBACK (no Helicone, local only)
 # ------------------------------------------------------------------
 
-def hf_chat(prompt: str):
+def hf_chat(prompt: str, max_new_tokens: int = 150):
     """
-    Local HF fallback (no Helicone, no metrics).
+    Local HF fallback (no Helicone). Runs on the shared, batched
+    LOCAL_ENGINE; the model loads once, on first use.
     """
-    pipe = pipeline("text-generation", model="distilgpt2")
-    return pipe(prompt, max_new_tokens=150)[0]["generated_text"]
+    return LOCAL_ENGINE.generate(prompt, max_new_tokens=max_new_tokens)
 
 # ------------------------------------------------------------------
 # EMBEDDINGS FACTORY (USED BY rag.py)
@@ -91,7 +330,9 @@ def get_embeddings():
             model="text-embedding-3-small",
             openai_api_key=os.getenv("OPENAI_API_KEY"),
             openai_api_base=HELICONE_BASE_URL,
-            default_headers=HELICONE_HEADERS, 
+            default_headers=HELICONE_HEADERS,
+            http_client=LLM_CLIENTS.http_client,
+            http_async_client=LLM_CLIENTS.async_http_client,
         )
 
     print("[RAG] Using HuggingFace embeddings")
@@ -110,10 +351,19 @@ def get_langchain_llm():
     """
     LLM_CALL_COUNT.labels(backend="openai").inc()
 
+    return _langchain_llm()
+
+
+@lru_cache(maxsize=1)
+def _langchain_llm():
+    # Built once; shares the pooled httpx clients
     return ChatOpenAI(
-        model="gpt-4o-mini",
+        model=LLM_MODEL,
         temperature=0.2,
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         openai_api_base=HELICONE_BASE_URL,
         default_headers=HELICONE_HEADERS,
+        max_retries=LLM_MAX_RETRIES,
+        http_client=LLM_CLIENTS.http_client,
+        http_async_client=LLM_CLIENTS.async_http_client,
     )
@@ -0,0 +1,174 @@
+"""
+Shared local HF generation engine (hf_chat fallback)
+----------------------------------------------------
+One text-generation pipeline per process, created on first use instead
+of on every call.
+
+- Micro-batching: prompts arriving within HF_GEN_BATCH_WAIT_MS (up to
+  HF_GEN_BATCH_SIZE, same max_new_tokens) run as one padded batch
+- HF_GEN_MAX_CONCURRENCY bounds prompts in flight; callers beyond it
+  block until a slot frees
+- HF_GEN_QUANTIZE=int8: dynamic int8 quantization of Linear layers on
+  CPU. GPT-2 style models keep attention / MLP weights in transformers'
+  Conv1D, so those are converted to nn.Linear first (otherwise only
+  lm_head would be quantized)
+
+Metrics: local_gen_batch_size, local_gen_latency_seconds
+"""
+
+import threading
+from concurrent.futures import Future
+from queue import Empty, Queue
+from time import monotonic, perf_counter
+from typing import List, Optional, Tuple
+
+from backend.core.config import (
+    HF_GEN_MODEL,
+    HF_GEN_BATCH_SIZE,
+    HF_GEN_BATCH_WAIT_MS,
+    HF_GEN_MAX_CONCURRENCY,
+    HF_GEN_QUANTIZE,
+)
+from backend.observability.metrics import LOCAL_GEN_BATCH_SIZE, LOCAL_GEN_LATENCY
+
+
+def _conv1d_to_linear(model):
+    """
+    Replace transformers Conv1D (weight: in x out) with equivalent nn.Linear.
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for name, module in list(model.named_modules()):
+        for child_name, child in list(module.named_children()):
+            if not isinstance(child, Conv1D):
+                continue
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            with torch.no_grad():
+                linear.weight.copy_(child.weight.t())
+                linear.bias.copy_(child.bias)
+            setattr(module, child_name, linear)
+    return model
+
+
+def load_generation_pipeline(model_name: str = HF_GEN_MODEL, quantize: Optional[str] = HF_GEN_QUANTIZE):
+    import torch
+    from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # Decoder-only batching: pad on the left with EOS
+    tokenizer.padding_side = "left"
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+
+    model = AutoModelForCausalLM.from_pretrained(model_name)
+    model.eval()
+
+    if quantize == "int8":
+        model = torch.quantization.quantize_dynamic(
+            _conv1d_to_linear(model), {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    return pipeline("text-generation", model=model, tokenizer=tokenizer, device=-1)
+
+
+class LocalGenerationEngine:
+    def __init__(
+        self,
+        model_name: str = HF_GEN_MODEL,
+        batch_size: int = HF_GEN_BATCH_SIZE,
+        batch_wait_ms: float = HF_GEN_BATCH_WAIT_MS,
+        max_concurrency: int = HF_GEN_MAX_CONCURRENCY,
+        quantize: Optional[str] = HF_GEN_QUANTIZE,
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000
+        self.quantize = quantize
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._queue: "Queue[Tuple[str, int, Future]]" = Queue()
+        self._lock = threading.Lock()
+        self._pipe = None
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def pipe(self):
+        if self._pipe is None:
+            with self._lock:
+                if self._pipe is None:
+                    self._pipe = load_generation_pipeline(self.model_name, self.quantize)
+        return self._pipe
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="local-gen", daemon=True)
+                    self._worker.start()
+
+    def submit(self, prompt: str, max_new_tokens: int = 150) -> Future:
+        self._ensure_worker()
+        fut: Future = Future()
+        self._queue.put((prompt, max_new_tokens, fut))
+        return fut
+
+    def generate(self, prompt: str, max_new_tokens: int = 150) -> str:
+        with self._slots:
+            return self.submit(prompt, max_new_tokens).result()
+
+    # -----------------------------
+    # Worker
+    # -----------------------------
+
+    def _next_batch(self) -> List[Tuple[str, int, Future]]:
+        """
+        First waiting prompt plus whatever with the same max_new_tokens
+        arrives within batch_wait (others are requeued).
+        """
+        batch = [self._queue.get()]
+        deferred = []
+        deadline = monotonic() + self.batch_wait
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                break
+            (batch if item[1] == batch[0][1] else deferred).append(item)
+
+        for item in deferred:
+            self._queue.put(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            prompts = [prompt for prompt, _, _ in batch]
+            max_new_tokens = batch[0][1]
+
+            start = perf_counter()
+            try:
+                outputs = self.pipe(
+                    prompts,
+                    max_new_tokens=max_new_tokens,
+                    batch_size=len(prompts),
+                    pad_token_id=self.pipe.tokenizer.pad_token_id,
+                )
+            except Exception as e:
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            LOCAL_GEN_BATCH_SIZE.observe(len(batch))
+            LOCAL_GEN_LATENCY.observe(perf_counter() - start)
+
+            for (_, _, fut), out in zip(batch, outputs):
+                fut.set_result(out[0]["generated_text"])
+
+
+LOCAL_ENGINE = LocalGenerationEngine()
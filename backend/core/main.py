@@ -12,6 +12,7 @@ import os
 import uuid
 import re
 import wave
+import asyncio
 from fastapi import FastAPI, HTTPException, WebSocketDisconnect
 from pydantic import BaseModel
 from fastapi import WebSocket, Depends
@@ -21,7 +22,9 @@ from backend.audio.stt_file import router as stt_router
 from backend.observability.metrics import REQUEST_COUNT, REQUEST_LATENCY
 from prometheus_client import make_asgi_app
 import time
-from backend.observability.metrics import PII_BLOCK_COUNT
+from backend.observability.metrics import PII_BLOCK_COUNT, TIME_TO_FIRST_AUDIO
+from backend.audio.speech_stream import SpeechStream
+from backend.core.config import INTENT_ROUTER_ENABLED, WS_STREAM_LLM
 from fastapi.middleware.cors import CORSMiddleware
 from backend.agents.agent_runner import run_with_evaluation
 from fastapi.staticfiles import StaticFiles
@@ -71,8 +74,13 @@ from backend.agents.trace_helpers import (
 )
 
 from backend.db.db_utils import SessionLocal
+from backend.core.turn_scheduler import TURN_SCHEDULER
+from backend.core.deadline import Deadline
+from backend.db.audit_log import shutdown_mcp_call_writer
+from backend.core.llm_client import LLM_CLIENTS
 from backend.agents.langchain_prompts import build_rag_executor
 from backend.rag.rag import get_retriever
+from backend.agents.intent_router import get_intent_router
 from langchain_core.runnables import RunnableLambda
 
 ESCALATION_VOICE_PROMPT = (
@@ -81,7 +89,30 @@ ESCALATION_VOICE_PROMPT = (
 )
 
 tts = TTSAdapter()
-db = SessionLocal()
+
+
+def run_ws_turn(**kwargs):
+    """
+    One WS turn with its own DB session (turns of different sessions
+    run on different threads, so a shared Session is not safe).
+    `on_token` streams the final LLM answer (see answer_stream).
+    """
+    turn_db = SessionLocal()
+    try:
+        return run_with_evaluation(execute_fn=execute_task, db=turn_db, **kwargs)
+    finally:
+        turn_db.close()
+
+async def listen_for_barge_in(ws: WebSocket, speech: SpeechStream):
+    """
+    While a streamed turn speaks, any client message interrupts it.
+    {"type": "barge_in"} only stops speech; anything else (the next
+    transcript) is returned so the WS loop handles it next.
+    """
+    data = await ws.receive_json()
+    speech.interrupt()
+    return None if data.get("type") == "barge_in" else data
+
 
 # ─────────────────────────────────────────
 # WS AUDIO STREAMING HELPER (TOP LEVEL)
@@ -119,16 +150,22 @@ async def agent_ws(ws: WebSocket):
     await ws.accept()
     print("🟢 WS connected")
 
+    # Message that barged in on the previous turn
+    pending = None
+
     while True:
             try:
                 print("🟡 Waiting for WS message...")
-                data = await ws.receive_json()
+                data, pending = pending or await ws.receive_json(), None
+                turn_start = time.time()
                 transcript = data["transcript"]
                 session_id = data["session_id"]
                 transcript = transcript.strip()
                 transcript = re.sub(r"[.?!]+$", "", transcript)
                 transcript = normalize_transcript(transcript)
                 ground_truth = data.get("ground_truth")
+                # Budget starts when the turn arrives (queue wait counts)
+                deadline = Deadline()
                 run_id = str(uuid.uuid4())
                 run_name = f"session_{session_id}_{run_id[:8]}"
                 # -------------------------------
@@ -142,52 +179,77 @@ async def agent_ws(ws: WebSocket):
                     tracer,
                     run_name=run_name
                 )
-                agent_response = run_with_evaluation(
-                    execute_fn=execute_task,
-                    db=db,
+
+                turn_kwargs = dict(
                     transcript=transcript,
                     session_id=session_id,
                     ground_truth=ground_truth,
                     run_id=run_id,
-                    lc_config=lc_config
+                    lc_config=lc_config,
+                    deadline=deadline,
+                    eval_mode=data.get("eval_mode")
                 )
+
+                # Serialized per session, concurrent across sessions,
+                # and off the event loop
+                speech = None
+                if data.get("stream", WS_STREAM_LLM):
+                    # Final LLM answer streamed: speech starts on the
+                    # first sentence, a client message barges in
+                    speech = SpeechStream(ws.send_json, ws.send_bytes, tts.synthesize, turn_start)
+                    listener = asyncio.ensure_future(listen_for_barge_in(ws, speech))
+                    try:
+                        agent_response = await speech.speak_while(TURN_SCHEDULER.run(
+                            session_id, run_ws_turn, on_token=speech.on_token, **turn_kwargs
+                        ))
+                    finally:
+                        if listener.done():
+                            pending = listener.result()
+                        else:
+                            listener.cancel()
+                else:
+                    agent_response = await TURN_SCHEDULER.run(session_id, run_ws_turn, **turn_kwargs)
                 await ws.send_json(agent_response)
 
                 # DEBUG LOGS
                 print("AGENT RESPONSE:", agent_response)
 
-                # Extract speakable text
-                reply_text = agent_response.get("reply", "")
-                print(" TTS TEXT:", reply_text)
+                # Nothing streamed (guard / non-RAG reply, or fallback):
+                # speak the whole reply
+                if speech is None or not (speech.streamed or speech.interrupted):
+                    # Extract speakable text
+                    reply_text = agent_response.get("reply", "")
+                    print(" TTS TEXT:", reply_text)
 
-                if not reply_text.strip():
-                    reply_text = "Sorry, I don't have an answer right now."
+                    if not reply_text.strip():
+                        reply_text = "Sorry, I don't have an answer right now."
 
-                # Generate TTS
-                wav_path = tts.synthesize(reply_text)
-                print(" TTS WAV PATH:", wav_path)
+                    # Generate TTS
+                    wav_path = tts.synthesize(reply_text)
+                    print(" TTS WAV PATH:", wav_path)
 
-                # AUDIO START
-                await ws.send_json({
-                    "type": "audio_start",
-                    "format": "wav"
-                })
+                    # AUDIO START
+                    await ws.send_json({
+                        "type": "audio_start",
+                        "format": "wav"
+                    })
 
-                # Stream WAV bytes
-                with open(wav_path, "rb") as f:
-                    while chunk := f.read(4096):
-                        await ws.send_bytes(chunk)
-                print("Streaming TTS WAV:", wav_path)
+                    # Stream WAV bytes
+                    TIME_TO_FIRST_AUDIO.labels(mode="full").observe(time.time() - turn_start)
+                    with open(wav_path, "rb") as f:
+                        while chunk := f.read(4096):
+                            await ws.send_bytes(chunk)
+                    print("Streaming TTS WAV:", wav_path)
 
-                # AUDIO END
-                await ws.send_json({
-                    "type": "audio_end"
-                })
+                    # AUDIO END
+                    await ws.send_json({
+                        "type": "audio_end"
+                    })
 
-                print("TTS WAV size:", os.path.getsize(wav_path))
+                    print("TTS WAV size:", os.path.getsize(wav_path))
 
                 # Escalation flow (if triggered)
-                if agent_response.get("result", {}).get("needs_human"):
+                if agent_response.get("needs_human") or agent_response.get("result", {}).get("needs_human"):
                     escalation_wav = tts.synthesize(ESCALATION_VOICE_PROMPT)
                     print("ESCALATION WAV:", escalation_wav)
 
@@ -230,6 +292,20 @@ def startup():
 
     print("✅ RAG executor initialized")
 
+    # Intent centroids: one batched embedding call, off the request path
+    if INTENT_ROUTER_ENABLED:
+        get_intent_router().warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Drain queued mcp_calls rows before the process exits
+    shutdown_mcp_call_writer()
+
+    # Close pooled LLM connections
+    LLM_CLIENTS.close()
+    await LLM_CLIENTS.aclose()
+
 # ─────────────────────────────────────────────────────────────
 # Request model
 # ─────────────────────────────────────────────────────────────
@@ -237,6 +313,8 @@ class AgentRequest(BaseModel):
     transcript: str
     session_id: str
     ground_truth: Optional[str] = None
+    # "inline" waits for evaluation / reflexion (offline test runs)
+    eval_mode: Optional[str] = None
 
 def force_trace_ping(tracer, run_name: str):
     """
@@ -271,6 +349,7 @@ def agent_handle(req: AgentRequest, db=Depends(get_db)):
         raise HTTPException(status_code=400, detail="transcript required")
 
     start = time.time()
+    deadline = Deadline()
     REQUEST_COUNT.labels(endpoint="/agent/handle").inc()
 
     run_id = str(uuid.uuid4())
@@ -286,15 +365,19 @@ def agent_handle(req: AgentRequest, db=Depends(get_db)):
 
     force_trace_ping(tracer, run_name)
 
-    agent_response = run_with_evaluation(
+    agent_response = TURN_SCHEDULER.submit(
+        req.session_id,
+        run_with_evaluation,
         execute_fn=execute_task,
         db=db,
         transcript=req.transcript,
         session_id=req.session_id,
         ground_truth=getattr(req, "ground_truth", None),
         run_id=run_id,
-        lc_config=lc_config
-)
+        lc_config=lc_config,
+        deadline=deadline,
+        eval_mode=req.eval_mode
+    ).result()
 
 
     REQUEST_LATENCY.labels(endpoint="/agent/handle").observe(
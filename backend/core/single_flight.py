@@ -0,0 +1,85 @@
+"""
+Single-flight request coalescing
+--------------------------------
+Identical calls that are in flight at the same moment share one
+execution: the first caller (leader) runs it, later callers with the
+same key wait for and receive the leader's result (or exception).
+Nothing is cached once the call returns.
+
+Keys come from `fingerprint(...)`: text is lowercased and whitespace
+collapsed, so "What is your  return policy" and "what is your return
+policy" coalesce. Use `normalize=False` where the exact text changes
+the result (LLM prompts). Waiters share the leader's result object;
+callers must treat it as read-only.
+
+Metrics: single_flight_calls_total{call, role=leader|coalesced}
+"""
+
+import json
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+from backend.core.config import SINGLE_FLIGHT_ENABLED
+from backend.observability.metrics import SINGLE_FLIGHT_CALLS
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def fingerprint(*parts: Any, normalize: bool = True) -> str:
+    """
+    Stable key for call arguments; strings are normalized unless
+    `normalize` is False.
+    """
+    def norm(value):
+        if isinstance(value, str):
+            return normalize_text(value) if normalize else value
+        if isinstance(value, dict):
+            return {k: norm(v) for k, v in sorted(value.items())}
+        if isinstance(value, (list, tuple)):
+            return [norm(v) for v in value]
+        return value
+
+    raw = json.dumps([norm(p) for p in parts], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        if not SINGLE_FLIGHT_ENABLED:
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+
+        if not leader:
+            SINGLE_FLIGHT_CALLS.labels(call=self.name, role="coalesced").inc()
+            return fut.result()
+
+        SINGLE_FLIGHT_CALLS.labels(call=self.name, role="leader").inc()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,105 @@
+"""
+Session-keyed turn scheduler
+----------------------------
+- Turns for one session run strictly in arrival order (one lane each)
+- Different sessions run concurrently, bounded by a shared worker pool
+- A lane holds a pool slot for one turn at a time, then re-queues, so a
+  chatty session cannot starve others
+- Idle lanes are garbage-collected
+
+Sync callers: scheduler.submit(...).result()
+Async callers: await scheduler.run(...)
+"""
+
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import time
+from typing import Callable, Deque, Dict
+
+from backend.core.config import TURN_LANE_IDLE_SECONDS, TURN_MAX_CONCURRENCY
+from backend.observability.metrics import TURN_LANES, TURN_QUEUE_WAIT
+
+
+class _Lane:
+    __slots__ = ("pending", "running", "last_used")
+
+    def __init__(self):
+        self.pending: Deque = deque()
+        self.running = False
+        self.last_used = time()
+
+
+class SessionTurnScheduler:
+    def __init__(
+        self,
+        max_concurrency: int = TURN_MAX_CONCURRENCY,
+        idle_seconds: float = TURN_LANE_IDLE_SECONDS,
+    ):
+        self.idle_seconds = idle_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="turn")
+        self._lanes: Dict[str, _Lane] = {}
+        self._lock = threading.Lock()
+        self._last_gc = time()
+
+    def submit(self, session_id: str, fn: Callable, *args, **kwargs) -> Future:
+        fut: Future = Future()
+        ctx = contextvars.copy_context()
+
+        with self._lock:
+            self._gc()
+            lane = self._lanes.get(session_id)
+            if lane is None:
+                lane = self._lanes[session_id] = _Lane()
+                TURN_LANES.set(len(self._lanes))
+
+            lane.pending.append((ctx, fn, args, kwargs, fut, time()))
+            if not lane.running:
+                lane.running = True
+                self._pool.submit(self._step, lane)
+
+        return fut
+
+    async def run(self, session_id: str, fn: Callable, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(session_id, fn, *args, **kwargs))
+
+    def _step(self, lane: _Lane):
+        with self._lock:
+            ctx, fn, args, kwargs, fut, enqueued_at = lane.pending.popleft()
+
+        TURN_QUEUE_WAIT.observe(time() - enqueued_at)
+
+        if fut.set_running_or_notify_cancel():
+            try:
+                fut.set_result(ctx.run(fn, *args, **kwargs))
+            except BaseException as e:
+                fut.set_exception(e)
+
+        with self._lock:
+            lane.last_used = time()
+            if lane.pending:
+                # Back of the pool queue: other sessions get a turn first
+                self._pool.submit(self._step, lane)
+            else:
+                lane.running = False
+
+    def _gc(self):
+        # Called with self._lock held
+        now = time()
+        if now - self._last_gc < self.idle_seconds:
+            return
+        self._last_gc = now
+
+        idle = [
+            sid for sid, lane in self._lanes.items()
+            if not lane.running and not lane.pending
+            and now - lane.last_used >= self.idle_seconds
+        ]
+        for sid in idle:
+            del self._lanes[sid]
+        TURN_LANES.set(len(self._lanes))
+
+
+TURN_SCHEDULER = SessionTurnScheduler()
@@ -0,0 +1,277 @@
+"""
+Write-behind logger for the mcp_calls audit table
+-------------------------------------------------
+record_mcp_call() enqueues a row; a background worker bulk-inserts
+batches of up to MCP_LOG_BATCH_SIZE rows, or whatever arrived within
+MCP_LOG_FLUSH_SECONDS, in one transaction.
+
+- Bounded queue; when full the overflow policy applies:
+  "drop"  -> discard the row (counted)
+  "spill" -> append it to a JSONL file, replayed by the worker on start
+             and after every successful flush
+- Replay renames the spill file to <spill>.replay first; rows that still
+  fail are appended back to the spill file (replays then pause for
+  SPILL_RETRY_SECONDS), and a .replay left by a crash mid-replay is
+  replayed on the next start
+- A failed batch is retried row by row so one bad row doesn't lose
+  the others; rows that still fail go to the spill file in "spill"
+  mode (replayed after SPILL_RETRY_SECONDS) and are counted as failed
+  otherwise
+- Rows submitted after close() started are written inline, never
+  queued behind the stop marker
+- close() drains the queue, waiting at most `timeout` seconds even if
+  the queue is full (registered for app shutdown and atexit)
+
+Metrics: mcp_log_queue_depth, mcp_log_flush_latency_seconds,
+mcp_log_rows_total{outcome=written|dropped|spilled|failed}
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from time import monotonic
+from typing import Dict, List, Optional
+
+from backend.core.config import (
+    MCP_LOG_BATCH_SIZE,
+    MCP_LOG_FLUSH_SECONDS,
+    MCP_LOG_OVERFLOW,
+    MCP_LOG_QUEUE_SIZE,
+    MCP_LOG_SPILL_PATH,
+)
+from backend.observability.metrics import (
+    MCP_LOG_FLUSH_LATENCY,
+    MCP_LOG_QUEUE_DEPTH,
+    MCP_LOG_ROWS,
+)
+
+_STOP = object()
+
+# Pause between spill replays once a replay could not write every row
+SPILL_RETRY_SECONDS = 30.0
+
+
+class MCPCallWriter:
+    def __init__(
+        self,
+        engine,
+        table,
+        max_queue: int = MCP_LOG_QUEUE_SIZE,
+        batch_size: int = MCP_LOG_BATCH_SIZE,
+        flush_seconds: float = MCP_LOG_FLUSH_SECONDS,
+        overflow: str = MCP_LOG_OVERFLOW,
+        spill_path: str = MCP_LOG_SPILL_PATH,
+    ):
+        self.engine = engine
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.overflow = overflow
+        self.spill_path = spill_path
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._spill_lock = threading.Lock()
+        # Orders submit()'s closed check + enqueue against close()
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._stopping = False
+        self._replay_after = 0.0
+        self._thread = threading.Thread(target=self._run, name="mcp-call-writer", daemon=True)
+        self._thread.start()
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+
+    def submit(self, row: Dict):
+        with self._submit_lock:
+            closed = self._closed
+            queued = False
+            if not closed:
+                try:
+                    self._queue.put_nowait(row)
+                    queued = True
+                except queue.Full:
+                    pass
+
+        if closed:
+            self._keep_failed(self._write([row]))
+            return
+
+        if not queued:
+            if self.overflow == "spill":
+                self._spill(row)
+            else:
+                MCP_LOG_ROWS.labels(outcome="dropped").inc()
+        MCP_LOG_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _spill(self, row: Dict):
+        with self._spill_lock:
+            self._append_spill([row])
+        MCP_LOG_ROWS.labels(outcome="spilled").inc()
+
+    def _append_spill(self, rows: List[Dict]):
+        # Caller holds _spill_lock
+        os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+        with open(self.spill_path, "a") as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+
+    # -----------------------------
+    # Worker side
+    # -----------------------------
+
+    def _next_batch(self) -> Optional[List[Dict]]:
+        """
+        Block for the first row, then collect until the batch is full or
+        flush_seconds have passed. None means stop.
+        """
+        if self._stopping:
+            return None
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+
+        batch = [first]
+        deadline = monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._stopping = True
+                break
+            batch.append(item)
+        return batch
+
+    def _write(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Insert rows; returns the ones that could not be written.
+        """
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.table.insert(), rows)
+            MCP_LOG_ROWS.labels(outcome="written").inc(len(rows))
+            return []
+        except Exception as e:
+            print("mcp_calls bulk insert failed, retrying per row:", e)
+
+        failed = []
+        for row in rows:
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(self.table.insert(), row)
+                MCP_LOG_ROWS.labels(outcome="written").inc()
+            except Exception as e:
+                failed.append(row)
+                MCP_LOG_ROWS.labels(outcome="failed").inc()
+                print("mcp_calls insert failed:", row.get("task_name"), e)
+        return failed
+
+    def _keep_failed(self, rows: List[Dict]):
+        """
+        Rows _write() gave up on: spilled for a later replay in "spill"
+        mode (already counted as failed otherwise).
+        """
+        if not rows or self.overflow != "spill":
+            return
+        with self._spill_lock:
+            self._append_spill(rows)
+        MCP_LOG_ROWS.labels(outcome="spilled").inc(len(rows))
+        # Don't replay them straight after the next successful flush
+        self._replay_after = monotonic() + SPILL_RETRY_SECONDS
+
+    def _replay_spill(self):
+        replay_path = self.spill_path + ".replay"
+        with self._spill_lock:
+            # Left by a crash mid-replay: finish it before newer rows
+            leftover = os.path.exists(replay_path)
+            if not leftover:
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+
+        with open(replay_path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+        failed = []
+        for i in range(0, len(rows), self.batch_size):
+            failed.extend(self._write(rows[i:i + self.batch_size]))
+
+        with self._spill_lock:
+            if failed:
+                self._append_spill(failed)
+            os.remove(replay_path)
+
+        if failed:
+            self._replay_after = monotonic() + SPILL_RETRY_SECONDS
+        elif leftover:
+            # Rows spilled since the crash
+            self._replay_spill()
+
+    def _run(self):
+        self._replay_spill()
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            start = monotonic()
+            failed = self._write(batch)
+            MCP_LOG_FLUSH_LATENCY.observe(monotonic() - start)
+            self._keep_failed(failed)
+            MCP_LOG_QUEUE_DEPTH.set(self._queue.qsize())
+
+            if (
+                self.overflow == "spill"
+                and os.path.exists(self.spill_path)
+                and monotonic() >= self._replay_after
+            ):
+                self._replay_spill()
+
+    def close(self, timeout: float = 10.0):
+        """
+        Stop accepting rows into the queue and drain what is queued,
+        for at most `timeout` seconds.
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+        # Every queued row is now ahead of the stop marker
+        deadline = monotonic() + timeout
+        try:
+            # Full queue: wait for the worker to make room
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print(f"mcp_calls writer not drained after {timeout}s; {self._queue.qsize()} rows left")
+            return
+        self._thread.join(max(deadline - monotonic(), 0))
+        MCP_LOG_QUEUE_DEPTH.set(self._queue.qsize())
+
+
+_WRITER: Optional[MCPCallWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_mcp_call_writer() -> MCPCallWriter:
+    global _WRITER
+    if _WRITER is None:
+        with _WRITER_LOCK:
+            if _WRITER is None:
+                from backend.db.db import engine, MCPCallLog
+
+                _WRITER = MCPCallWriter(engine, MCPCallLog.__table__)
+                atexit.register(_WRITER.close)
+    return _WRITER
+
+
+def shutdown_mcp_call_writer():
+    if _WRITER is not None:
+        _WRITER.close()
@@ -0,0 +1,112 @@
+"""
+Read-through caches for hot per-turn lookups
+--------------------------------------------
+- session auth (executor.get_session_auth)
+- order status (executor.get_order_status)
+- product rows (db.get_product_by_id)
+
+Each entity has its own TTL and a shorter TTL for misses (negative
+caching), so repeated "where is my order" turns within a call hit memory
+instead of Postgres. Call the invalidate_* hooks after writing any of
+these rows.
+
+Metrics: db_cache_lookups_total{entity, result=hit|negative_hit|miss}
+"""
+
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Any, Callable, Hashable
+
+from backend.core.config import (
+    CACHE_MAX_ENTRIES,
+    SESSION_AUTH_CACHE_TTL,
+    ORDER_STATUS_CACHE_TTL,
+    PRODUCT_CACHE_TTL,
+    NEGATIVE_CACHE_TTL,
+)
+from backend.observability.metrics import DB_CACHE_LOOKUPS
+
+
+class ReadThroughCache:
+    def __init__(
+        self,
+        entity: str,
+        ttl: float,
+        negative_ttl: float = NEGATIVE_CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        self.entity = entity
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, value); None values are cached misses
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]):
+        now = time()
+
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > now:
+                self._data.move_to_end(key)
+                value = item[1]
+                DB_CACHE_LOOKUPS.labels(
+                    entity=self.entity,
+                    result="hit" if value is not None else "negative_hit",
+                ).inc()
+                return value
+
+        DB_CACHE_LOOKUPS.labels(entity=self.entity, result="miss").inc()
+        value = loader()
+
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl > 0:
+            with self._lock:
+                self._data[key] = (time() + ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+SESSION_AUTH_CACHE = ReadThroughCache("session_auth", SESSION_AUTH_CACHE_TTL)
+ORDER_STATUS_CACHE = ReadThroughCache("order_status", ORDER_STATUS_CACHE_TTL)
+PRODUCT_CACHE = ReadThroughCache("product", PRODUCT_CACHE_TTL)
+
+
+# -------------------------------------------------------------------
+# Invalidation hooks
+# -------------------------------------------------------------------
+
+def invalidate_session_auth(session_id: str):
+    SESSION_AUTH_CACHE.invalidate(session_id)
+
+
+def invalidate_order(order_id: str):
+    # Keys are (order_id, customer_id)
+    ORDER_STATUS_CACHE.invalidate_where(lambda key: key[0] == order_id)
+
+
+def invalidate_product(product_id):
+    PRODUCT_CACHE.invalidate(str(product_id))
+
+
+def invalidate_all():
+    for cache in (SESSION_AUTH_CACHE, ORDER_STATUS_CACHE, PRODUCT_CACHE):
+        cache.clear()
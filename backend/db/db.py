@@ -3,6 +3,7 @@ import os
 from sqlalchemy import JSON, create_engine, Column, String, Integer, Text
 from sqlalchemy.orm import declarative_base, sessionmaker
 import json
+from backend.core.circuit_breaker import get_breaker
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 DB_URL = os.getenv("DB_URL")
@@ -36,6 +37,16 @@ class MCPCallLog(Base):
     run_id = Column(String, nullable=True)
 
 
+def _probe_postgres():
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+# Shared by every Postgres read on the turn path
+POSTGRES_BREAKER = get_breaker("postgres", probe=_probe_postgres)
+
+
 def init_db():
     Base.metadata.create_all(bind=engine)
     
@@ -78,7 +89,17 @@ def save_history(session_id: str, history: list):
 def get_product_by_id(product_id: int):
     """
     Return product row as a dict or None if not found.
+    Read-through cached (see backend/db/cache.py).
     """
+    from backend.db.cache import PRODUCT_CACHE
+
+    return PRODUCT_CACHE.get_or_load(
+        str(product_id),
+        lambda: POSTGRES_BREAKER.call(_load_product_by_id, product_id),
+    )
+
+
+def _load_product_by_id(product_id: int):
     from sqlalchemy import text
     with engine.connect() as conn:
         result = conn.execute(
@@ -106,23 +127,39 @@ def get_product_by_id(product_id: int):
                 return {cols[i]: row[i] for i in range(len(cols))}
 
 def record_mcp_call(db, session_id, name, tool, args, result, status, duration_ms, run_id=None):
+    """
+    Audit one tool call. With MCP_LOG_WRITE_BEHIND (default) the row is
+    queued for the background bulk writer (backend/db/audit_log.py) and
+    never blocks or fails the turn; otherwise it is committed on `db`.
+    """
+    from backend.core.config import MCP_LOG_WRITE_BEHIND
 
     print(" MCP CALLED:", name, tool, status)
     if db is None:
         return
+
+    row = dict(
+        session_id=session_id,
+        task_name=name,
+        tool_name=name,
+        operation=tool,
+        args=args,
+        result=result,
+        status=status,
+        duration_ms=duration_ms,
+        run_id=run_id,
+    )
+
+    if MCP_LOG_WRITE_BEHIND:
+        from backend.db.audit_log import get_mcp_call_writer
+        # Snapshot now: callers keep mutating the response dicts
+        row["args"] = json.loads(json.dumps(args, default=str))
+        row["result"] = json.loads(json.dumps(result, default=str))
+        get_mcp_call_writer().submit(row)
+        return
+
     try:
-        entry = MCPCallLog(
-            session_id=session_id,
-            task_name=name,          
-            tool_name=name,         
-            operation=tool,         
-            args=args,
-            result=result,
-            status=status,
-            duration_ms=duration_ms,
-            run_id=run_id
-        )
-        db.add(entry)
+        db.add(MCPCallLog(**row))
         db.commit()
     except Exception:
         db.rollback()
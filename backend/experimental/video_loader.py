@@ -2,19 +2,33 @@
 Multimodal Video / Audio Loader
 --------------------------------
 - Source-agnostic (local audio/video file)
-- Whisper transcription
-- Chunking + embedding
-- Indexed into vector DB for multimodal RAG
+- ffmpeg splits the media into overlapping windows
+- Windows are transcribed on a process pool shared by every ingestion
+  call, so Whisper loads once per worker process, not once per call
+- Each window is chunked, embedded and upserted as soon as it is ready,
+  keeping start/end timestamps; in compact mode the chunks go through
+  the same writer as the Postgres indexer (reduced vectors in Chroma,
+  full ones in the sidecar)
+- Finished windows are checkpointed so an interrupted job resumes
 """
 
 import os
-from typing import Optional
+import json
+import atexit
+import hashlib
+import threading
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
 
 import whisper
-from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from backend.rag.rag import get_vectorstore
+from backend.core.config import COMPACT_INDEX_ENABLED, VECTOR_INDEX_DIR
+from backend.rag.compact import load_compact_writer, upsert_vectors
+from backend.rag.rag import embeddings, get_vectorstore
 
 
 # ─────────────────────────────────────────────
@@ -23,12 +37,219 @@ from backend.rag.rag import get_vectorstore
 
 WHISPER_MODEL = "small"
 
+SEGMENT_SECONDS = float(os.getenv("VIDEO_SEGMENT_SECONDS", "30"))
+SEGMENT_OVERLAP = float(os.getenv("VIDEO_SEGMENT_OVERLAP", "2"))
+TRANSCRIBE_WORKERS = int(os.getenv("VIDEO_TRANSCRIBE_WORKERS", "2"))
+CHECKPOINT_DIR = "backend/data/video_ingest"
+
+CHUNK_SIZE = 800
+
 TEXT_SPLITTER = RecursiveCharacterTextSplitter(
-    chunk_size=800,
+    chunk_size=CHUNK_SIZE,
     chunk_overlap=100,
 )
 
 
+# ─────────────────────────────────────────────
+# ffmpeg helpers
+# ─────────────────────────────────────────────
+
+def probe_duration(media_path: str) -> float:
+    out = subprocess.run(
+        [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            media_path,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip())
+
+
+def plan_windows(duration: float) -> List[Dict]:
+    """
+    Overlapping windows. Each window "owns" the span between the
+    midpoints of its overlaps, so text heard twice is kept once.
+    """
+    step = max(SEGMENT_SECONDS - SEGMENT_OVERLAP, 1.0)
+    windows = []
+    start = 0.0
+    index = 0
+    while start < duration:
+        end = min(start + SEGMENT_SECONDS, duration)
+        windows.append({"index": index, "start": start, "end": end})
+        if end >= duration:
+            break
+        start += step
+        index += 1
+
+    half = SEGMENT_OVERLAP / 2
+    for i, w in enumerate(windows):
+        w["own_start"] = w["start"] + half if i > 0 else 0.0
+        w["own_end"] = w["end"] - half if i < len(windows) - 1 else duration
+
+    return windows
+
+
+def extract_window(media_path: str, start: float, end: float, wav_path: str):
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-ss", f"{start:.3f}",
+            "-t", f"{end - start:.3f}",
+            "-i", media_path,
+            "-ar", "16000",
+            "-ac", "1",
+            "-vn",
+            wav_path,
+        ],
+        check=True,
+    )
+
+
+# ─────────────────────────────────────────────
+# Worker process
+# ─────────────────────────────────────────────
+
+_MODEL = None
+
+
+def _init_worker(model_name: str):
+    global _MODEL
+    _MODEL = whisper.load_model(model_name)
+
+
+def _transcribe_window(media_path: str, window: Dict) -> Dict:
+    with tempfile.TemporaryDirectory(prefix="video_seg_") as tmp:
+        wav_path = os.path.join(tmp, f"seg_{window['index']}.wav")
+        extract_window(media_path, window["start"], window["end"], wav_path)
+        result = _MODEL.transcribe(wav_path)
+
+    # Absolute timestamps, restricted to the span this window owns
+    segments = []
+    for seg in result.get("segments", []):
+        abs_start = window["start"] + seg["start"]
+        abs_end = window["start"] + seg["end"]
+        if window["own_start"] <= abs_start < window["own_end"]:
+            segments.append({
+                "start": abs_start,
+                "end": abs_end,
+                "text": seg["text"].strip(),
+            })
+
+    return {**window, "segments": segments}
+
+
+# Created on first use, reused by every ingestion call, shut down at exit
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The shared transcription pool. It is sized by the first caller;
+    later `workers` values only bound how many windows are in flight.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(WHISPER_MODEL,),
+            )
+        return _POOL
+
+
+def _drop_pool(pool: ProcessPoolExecutor):
+    # A crashed worker breaks the pool; the next call starts a new one
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False)
+
+
+@atexit.register
+def shutdown_pool():
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+# ─────────────────────────────────────────────
+# Chunking
+# ─────────────────────────────────────────────
+
+def chunk_segments(segments: List[Dict]) -> List[Dict]:
+    """
+    Group Whisper segments into ~CHUNK_SIZE character chunks so each
+    chunk keeps real start/end timestamps.
+    """
+    chunks, current = [], []
+    size = 0
+
+    for seg in segments:
+        if not seg["text"]:
+            continue
+        if current and size + len(seg["text"]) > CHUNK_SIZE:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(seg)
+        size += len(seg["text"]) + 1
+
+    if current:
+        chunks.append(current)
+
+    out = []
+    for group in chunks:
+        text = " ".join(s["text"] for s in group)
+        # A single very long segment is still split by characters
+        for piece in TEXT_SPLITTER.split_text(text):
+            out.append({
+                "text": piece,
+                "start": group[0]["start"],
+                "end": group[-1]["end"],
+            })
+    return out
+
+
+# ─────────────────────────────────────────────
+# Checkpointing
+# ─────────────────────────────────────────────
+
+def _job_key(media_path: str, video_id: Optional[str]) -> str:
+    if video_id:
+        return video_id
+    return hashlib.sha1(os.path.abspath(media_path).encode()).hexdigest()[:16]
+
+
+def _checkpoint_path(job_key: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, f"{job_key}.json")
+
+
+def _load_done(job_key: str) -> set:
+    path = _checkpoint_path(job_key)
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return set(json.load(f)["done"])
+
+
+def _save_done(job_key: str, done: set):
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = _checkpoint_path(job_key)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"done": sorted(done)}, f)
+    os.replace(tmp_path, path)
+
+
 # ─────────────────────────────────────────────
 # Core loader
 # ─────────────────────────────────────────────
@@ -38,6 +259,8 @@ def load_video_to_vectorstore(
     product_id: Optional[str] = None,
     source: str = "video",
     video_id: Optional[str] = None,
+    workers: int = TRANSCRIBE_WORKERS,
+    resume: bool = True,
 ):
     """
     Ingest audio/video into vector DB using Whisper.
@@ -47,6 +270,11 @@ def load_video_to_vectorstore(
         product_id: optional product reference
         source: 'youtube' | 'video' | 'audio'
         video_id: optional external video id
+        workers: transcription processes
+        resume: skip windows finished by a previous run
+
+    Returns:
+        number of chunks indexed in this run
     """
 
     if not os.path.exists(media_path):
@@ -54,42 +282,81 @@ def load_video_to_vectorstore(
 
     print(f"🎬 Loading media: {media_path}")
 
-    # Transcribe
-    model = whisper.load_model(WHISPER_MODEL)
-    result = model.transcribe(media_path)
-
-    transcript_text = result.get("text", "").strip()
-    if not transcript_text:
-        raise ValueError("Empty transcript generated")
-
-    print("Transcription completed")
-
-    # Chunk
-    chunks = TEXT_SPLITTER.split_text(transcript_text)
-    print(f"Split into {len(chunks)} chunks")
-
-    # Build documents
-    docs = []
-    for chunk in chunks:
-        docs.append(
-            Document(
-                page_content=chunk,
-                metadata={
-                    "type": "video_transcript",
-                    "modality": "video",
-                    "source": source,
-                    "product_id": product_id,
-                    "video_id": video_id,
-                    "media_path": media_path,
-                },
-            )
-        )
+    job_key = _job_key(media_path, video_id)
+    done = _load_done(job_key) if resume else set()
+
+    windows = plan_windows(probe_duration(media_path))
+    pending = [w for w in windows if w["index"] not in done]
+    print(f"{len(windows)} windows, {len(pending)} to transcribe")
+
+    collection = get_vectorstore()._collection
+    compact = load_compact_writer(VECTOR_INDEX_DIR) if COMPACT_INDEX_ENABLED else None
+
+    base_meta = {
+        "type": "video_transcript",
+        "modality": "video",
+        "source": source,
+        "product_id": product_id,
+        "video_id": video_id,
+        "media_path": media_path,
+    }
+    base_meta = {k: v for k, v in base_meta.items() if v is not None}
+
+    indexed = 0
+    pending_iter = iter(pending)
+
+    pool = _get_pool(workers)
+    try:
+        # Keep at most 2x workers windows in flight to bound memory
+        in_flight = set()
+        for w in pending_iter:
+            in_flight.add(pool.submit(_transcribe_window, media_path, w))
+            if len(in_flight) >= workers * 2:
+                break
+
+        while in_flight:
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for fut in finished:
+                window = fut.result()
+                chunks = chunk_segments(window["segments"])
+
+                if chunks:
+                    texts = [c["text"] for c in chunks]
+                    upsert_vectors(
+                        collection,
+                        ids=[f"{job_key}:{window['index']}:{i}" for i in range(len(chunks))],
+                        vectors=embeddings.embed_documents(texts),
+                        documents=texts,
+                        metadatas=[
+                            {
+                                **base_meta,
+                                "segment_index": window["index"],
+                                "start_time": round(c["start"], 2),
+                                "end_time": round(c["end"], 2),
+                            }
+                            for c in chunks
+                        ],
+                        compact=compact,
+                    )
+                    indexed += len(chunks)
+
+                done.add(window["index"])
+                _save_done(job_key, done)
+                print(
+                    f" Window {window['index']} "
+                    f"[{window['start']:.0f}s-{window['end']:.0f}s]: {len(chunks)} chunks"
+                )
 
-    # Index
-    vectorstore = get_vectorstore()
-    vectorstore.add_documents(docs)
+                nxt = next(pending_iter, None)
+                if nxt is not None:
+                    in_flight.add(pool.submit(_transcribe_window, media_path, nxt))
+    except BrokenProcessPool:
+        _drop_pool(pool)
+        raise
 
-    print(f" Indexed {len(docs)} video transcript chunks")
+    print(f" Indexed {indexed} video transcript chunks")
+    return indexed
 
 
 # ─────────────────────────────────────────────
@@ -104,4 +371,4 @@ if __name__ == "__main__":
         product_id="1",
         source="youtube",
         video_id="demo-video-001",
-    )
\ No newline at end of file
+    )
@@ -2,6 +2,7 @@ import os
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 from pathlib import Path
+from backend.core.circuit_breaker import get_breaker
 
 env_path = Path(__file__).resolve().parents[2] / "backend" / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -26,6 +27,20 @@ def get_driver():
     return _driver
 
 
+def _probe_neo4j():
+    get_driver().verify_connectivity()
+
+
+NEO4J_BREAKER = get_breaker("neo4j", probe=_probe_neo4j)
+
+
+def _run_query(query: str, **params):
+    driver = get_driver()
+    with driver.session() as session:
+        result = session.run(query, **params)
+        return result.data()
+
+
 def get_similar_products(product_id: str):
     """
     Find similar products using graph relationships:
@@ -71,8 +86,6 @@ def get_similar_products(product_id: str):
     LIMIT 3
     """
 
-    driver = get_driver()
-    with driver.session() as session:
-        result = session.run(query, id=product_id)
-        return result.data()
+    # Fails fast with CircuitOpen while Neo4j is down
+    return NEO4J_BREAKER.call(_run_query, query, id=product_id)
 
@@ -8,15 +8,21 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+def redis_from_env():
+    """
+    Shared Redis client when redis is installed and REDIS_URL is set.
+    """
+    if REDIS_AVAILABLE and os.getenv("REDIS_URL"):
+        return redis.Redis.from_url(os.getenv("REDIS_URL"))
+    return None
+
+
 class SessionMemory:
     def __init__(self, max_turns=5):
         self.max_turns = max_turns
         self.local_store = {}
 
-        if REDIS_AVAILABLE and os.getenv("REDIS_URL"):
-            self.redis = redis.Redis.from_url(os.getenv("REDIS_URL"))
-        else:
-            self.redis = None
+        self.redis = redis_from_env()
 
     def _key(self, session_id):
         return f"session:{session_id}"
@@ -0,0 +1,138 @@
+"""
+Speculative prefetch of follow-up data for the product a session just saw.
+
+After a product is surfaced, its similar products (Neo4j) and full row
+(Postgres) are fetched in the background into a per-session entry with a
+TTL. "Show similar products" and memory follow-ups then read from memory;
+if the prefetch is still in flight they wait for it instead of issuing a
+second query.
+
+Metrics:
+- prefetch_lookups_total{kind, result=hit|miss}
+- prefetch_wasted_total{kind}: prefetched but replaced / expired unused
+"""
+
+import threading
+from time import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from backend.core.config import PREFETCH_ENABLED, PREFETCH_TTL_SECONDS, PREFETCH_WORKERS
+from backend.db.db import get_product_by_id
+from backend.memory.graph import get_similar_products
+from backend.observability.metrics import PREFETCH_LOOKUPS, PREFETCH_WASTED
+
+KINDS = ("similar", "product")
+
+
+class _Entry:
+    __slots__ = ("product_id", "futures", "used", "expires_at")
+
+    def __init__(self, product_id, futures: Dict[str, Future], ttl: float):
+        self.product_id = product_id
+        self.futures = futures
+        self.used = set()
+        self.expires_at = time() + ttl
+
+
+class ProductPrefetcher:
+    def __init__(
+        self,
+        fetchers: Dict[str, Callable[[Any], Any]],
+        ttl: float = PREFETCH_TTL_SECONDS,
+        workers: int = PREFETCH_WORKERS,
+        enabled: bool = PREFETCH_ENABLED,
+    ):
+        self.fetchers = fetchers
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    # -----------------------------
+    # Bookkeeping
+    # -----------------------------
+
+    def _retire(self, entry: _Entry):
+        for kind in entry.futures:
+            if kind not in entry.used:
+                PREFETCH_WASTED.labels(kind=kind).inc()
+
+    def _purge_expired(self, now: float):
+        expired = [sid for sid, e in self._entries.items() if e.expires_at <= now]
+        for sid in expired:
+            self._retire(self._entries.pop(sid))
+
+    # -----------------------------
+    # API
+    # -----------------------------
+
+    def schedule(self, session_id: str, product_id):
+        """
+        Start background fetches for `product_id` unless already cached.
+        """
+        if not self.enabled or not product_id:
+            return
+
+        with self._lock:
+            now = time()
+            self._purge_expired(now)
+
+            current = self._entries.get(session_id)
+            if current and current.product_id == product_id:
+                return
+            if current:
+                self._retire(current)
+
+            futures = {
+                kind: self._pool.submit(fetch, product_id)
+                for kind, fetch in self.fetchers.items()
+            }
+            self._entries[session_id] = _Entry(product_id, futures, self.ttl)
+
+    def get(self, kind: str, session_id: str, product_id):
+        """
+        Prefetched value if this session has one for `product_id`,
+        otherwise fetch synchronously.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry and entry.expires_at <= time():
+                self._retire(self._entries.pop(session_id))
+                entry = None
+
+        fut = None
+        if entry and entry.product_id == product_id:
+            fut = entry.futures.get(kind)
+
+        if fut is not None:
+            try:
+                value = fut.result()
+                entry.used.add(kind)
+                PREFETCH_LOOKUPS.labels(kind=kind, result="hit").inc()
+                return value
+            except Exception as e:
+                # Failed prefetch: retry inline (and surface errors as before)
+                print(f"Prefetch {kind} failed:", e)
+
+        PREFETCH_LOOKUPS.labels(kind=kind, result="miss").inc()
+        return self.fetchers[kind](product_id)
+
+    def get_similar(self, session_id: str, product_id):
+        return self.get("similar", session_id, product_id)
+
+    def get_product(self, session_id: str, product_id):
+        return self.get("product", session_id, product_id)
+
+    def forget(self, session_id: str):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry:
+                self._retire(entry)
+
+
+PREFETCHER = ProductPrefetcher({
+    "similar": get_similar_products,
+    "product": get_product_by_id,
+})
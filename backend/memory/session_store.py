@@ -0,0 +1,288 @@
+"""
+Per-session agent state (last_product_id and friends)
+------------------------------------------------------
+- LocalSessionStore: in-process LRU with TTL and a size cap
+- RedisSessionStore: shared across uvicorn workers, TTL via SETEX
+  (Redis' own maxmemory policy bounds it). Redis is pinged at startup
+  (unreachable -> local store), and any RedisError later falls back to
+  a local store for that operation, so a Redis outage degrades memory
+  to per-worker instead of failing turns
+
+Records are compact: only RECORD_FIELDS are kept, empty values dropped,
+serialized as short JSON.
+
+With SESSION_WRITE_BEHIND, last_product_id changes are also persisted to
+the `conversations` table by a background thread (coalesced per session),
+and a session missing from the store is re-hydrated from it.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from time import sleep, time
+from typing import Any, Dict, Optional
+
+from backend.core.config import (
+    SESSION_STORE_BACKEND,
+    SESSION_STORE_MAX_SESSIONS,
+    SESSION_STORE_TTL_SECONDS,
+    SESSION_WRITE_BEHIND,
+)
+from backend.memory.memory import redis_from_env
+from backend.observability.metrics import (
+    SESSION_EVICTIONS,
+    SESSION_STORE_FALLBACKS,
+    SESSION_STORE_SIZE,
+)
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:
+    # Redis backend is never built without the client library
+    RedisError = OSError
+
+RECORD_FIELDS = ("last_product_id",)
+
+
+def compact_record(state: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: state[k]
+        for k in RECORD_FIELDS
+        if state.get(k) is not None
+    }
+
+
+# -------------------------------------------------------------------
+# Write-behind to conversations.last_product_id
+# -------------------------------------------------------------------
+
+class ConversationWriteBehind:
+    """
+    Background persistence of last_product_id. Pending writes are keyed
+    by session, so a burst of updates costs one UPDATE.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._pending: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="session-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, session_id: str, product_id):
+        with self._lock:
+            self._pending[session_id] = product_id
+        self._wake.set()
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        from backend.db.db import SessionLocal, get_last_product_id
+
+        db = SessionLocal()
+        try:
+            return compact_record({"last_product_id": get_last_product_id(db, session_id)})
+        finally:
+            db.close()
+
+    def flush(self):
+        from backend.db.db import SessionLocal, save_last_product
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        db = SessionLocal()
+        try:
+            for session_id, product_id in pending.items():
+                try:
+                    save_last_product(db, session_id, product_id)
+                except Exception as e:
+                    db.rollback()
+                    print("Session write-behind failed:", session_id, e)
+        finally:
+            db.close()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Let a burst of updates coalesce
+            sleep(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+# -------------------------------------------------------------------
+# Stores
+# -------------------------------------------------------------------
+
+class SessionStore:
+    def __init__(self, write_behind: Optional[ConversationWriteBehind] = None):
+        self.write_behind = write_behind
+
+    def _get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _put(self, session_id: str, record: Dict[str, Any]):
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        """
+        Copy of the session state ({} for unknown sessions).
+        """
+        record = self._get(session_id)
+        if record is None and self.write_behind:
+            try:
+                record = self.write_behind.load(session_id)
+            except Exception as e:
+                print("Session re-hydration failed:", e)
+                record = {}
+            self._put(session_id, record)
+        return dict(record or {})
+
+    def set(self, session_id: str, state: Dict[str, Any]):
+        record = compact_record(state)
+        previous = self._get(session_id) or {}
+        self._put(session_id, record)
+
+        if (
+            self.write_behind
+            and record.get("last_product_id") is not None
+            and record.get("last_product_id") != previous.get("last_product_id")
+        ):
+            self.write_behind.submit(session_id, record["last_product_id"])
+
+    def update(self, session_id: str, **fields):
+        state = self.get(session_id)
+        state.update(fields)
+        self.set(session_id, state)
+
+
+class LocalSessionStore(SessionStore):
+    def __init__(
+        self,
+        max_sessions: int = SESSION_STORE_MAX_SESSIONS,
+        ttl: float = SESSION_STORE_TTL_SECONDS,
+        write_behind: Optional[ConversationWriteBehind] = None,
+    ):
+        super().__init__(write_behind)
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        # session_id -> (expires_at, record); oldest first
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, session_id):
+        with self._lock:
+            item = self._data.get(session_id)
+            if item is None:
+                return None
+            expires_at, record = item
+            if expires_at <= time():
+                del self._data[session_id]
+                SESSION_EVICTIONS.labels(reason="ttl").inc()
+                SESSION_STORE_SIZE.set(len(self._data))
+                return None
+            self._data.move_to_end(session_id)
+            return record
+
+    def _put(self, session_id, record):
+        with self._lock:
+            self._data[session_id] = (time() + self.ttl, record)
+            self._data.move_to_end(session_id)
+            self._evict()
+            SESSION_STORE_SIZE.set(len(self._data))
+
+    def _evict(self):
+        now = time()
+        # Expired entries at the LRU end go first
+        while self._data:
+            sid, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[sid]
+            SESSION_EVICTIONS.labels(reason="ttl").inc()
+
+        while len(self._data) > self.max_sessions:
+            self._data.popitem(last=False)
+            SESSION_EVICTIONS.labels(reason="lru").inc()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._data.pop(session_id, None)
+            SESSION_STORE_SIZE.set(len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisSessionStore(SessionStore):
+    def __init__(
+        self,
+        client,
+        ttl: float = SESSION_STORE_TTL_SECONDS,
+        write_behind: Optional[ConversationWriteBehind] = None,
+        fallback: Optional[LocalSessionStore] = None,
+    ):
+        super().__init__(write_behind)
+        self.redis = client
+        self.ttl = int(ttl)
+        # Serves operations while Redis errors
+        self.fallback = fallback or LocalSessionStore(ttl=ttl)
+
+    def _key(self, session_id):
+        return f"session_state:{session_id}"
+
+    def _fallback(self, op: str, error: Exception):
+        SESSION_STORE_FALLBACKS.labels(op=op).inc()
+        print(f"Redis session {op} failed, using local store:", error)
+
+    def _get(self, session_id):
+        try:
+            raw = self.redis.get(self._key(session_id))
+        except RedisError as e:
+            self._fallback("get", e)
+            return self.fallback._get(session_id)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    def _put(self, session_id, record):
+        try:
+            self.redis.setex(
+                self._key(session_id),
+                self.ttl,
+                json.dumps(record, separators=(",", ":")),
+            )
+        except RedisError as e:
+            self._fallback("set", e)
+            self.fallback._put(session_id, record)
+
+    def delete(self, session_id):
+        self.fallback.delete(session_id)
+        try:
+            self.redis.delete(self._key(session_id))
+        except RedisError as e:
+            self._fallback("delete", e)
+
+
+def make_session_store(backend: str = SESSION_STORE_BACKEND) -> SessionStore:
+    write_behind = ConversationWriteBehind() if SESSION_WRITE_BEHIND else None
+
+    if backend == "redis":
+        client = redis_from_env()
+        if client is not None:
+            try:
+                client.ping()
+                return RedisSessionStore(client, write_behind=write_behind)
+            except RedisError as e:
+                print("Redis ping failed:", e)
+        print("SESSION_STORE_BACKEND=redis but Redis is unavailable; using local store")
+
+    return LocalSessionStore(write_behind=write_behind)
+
+
+SESSION_STORE = make_session_store()
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 REQUEST_COUNT = Counter(
     "agent_requests_total",
@@ -27,3 +27,180 @@ PII_BLOCK_COUNT = Counter(
     "pii_blocked_requests_total",
     "Number of requests blocked due to PII"
 )
+
+INTENT_ROUTE_COUNT = Counter(
+    "intent_routes_total",
+    "Turns routed per intent",
+    ["intent", "source"]
+)
+
+INTENT_ROUTER_LATENCY = Histogram(
+    "intent_router_latency_seconds",
+    "Nearest-centroid classification latency",
+    ["intent"]
+)
+
+AGENT_TURN_LATENCY = Histogram(
+    "agent_turn_latency_seconds",
+    "Agent turn latency by routed intent",
+    ["intent"]
+)
+
+PREFETCH_LOOKUPS = Counter(
+    "prefetch_lookups_total",
+    "Follow-up lookups served from (hit) or missing (miss) the prefetch cache",
+    ["kind", "result"]
+)
+
+PREFETCH_WASTED = Counter(
+    "prefetch_wasted_total",
+    "Prefetched results replaced or expired without being used",
+    ["kind"]
+)
+
+SESSION_STORE_SIZE = Gauge(
+    "session_store_sessions",
+    "Sessions held in the in-process session store"
+)
+
+SESSION_EVICTIONS = Counter(
+    "session_store_evictions_total",
+    "Sessions evicted from the in-process session store",
+    ["reason"]
+)
+
+SESSION_STORE_FALLBACKS = Counter(
+    "session_store_fallbacks_total",
+    "Session store operations served locally because Redis failed",
+    ["op"]
+)
+
+TURN_QUEUE_WAIT = Histogram(
+    "turn_queue_wait_seconds",
+    "Time a turn waits behind its session's earlier turns and the global limit"
+)
+
+TURN_LANES = Gauge(
+    "turn_scheduler_lanes",
+    "Session lanes held by the turn scheduler"
+)
+
+DB_CACHE_LOOKUPS = Counter(
+    "db_cache_lookups_total",
+    "Read-through cache lookups per entity",
+    ["entity", "result"]
+)
+
+TOOL_BUDGET_OVERRUNS = Counter(
+    "tool_budget_overruns_total",
+    "Tool calls cut off by the per-turn latency budget",
+    ["tool"]
+)
+
+TOOL_CALLS_ABANDONED = Gauge(
+    "tool_calls_abandoned",
+    "Overrun tool calls still running on a worker thread",
+    ["tool"]
+)
+
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 open, 2 half-open)",
+    ["dependency"]
+)
+
+CIRCUIT_REJECTED = Counter(
+    "circuit_breaker_rejected_total",
+    "Calls failed fast by an open circuit breaker",
+    ["dependency"]
+)
+
+MCP_LOG_QUEUE_DEPTH = Gauge(
+    "mcp_log_queue_depth",
+    "mcp_calls rows waiting for the write-behind worker"
+)
+
+MCP_LOG_FLUSH_LATENCY = Histogram(
+    "mcp_log_flush_latency_seconds",
+    "Time to bulk-insert one batch of mcp_calls rows"
+)
+
+MCP_LOG_ROWS = Counter(
+    "mcp_log_rows_total",
+    "mcp_calls rows by outcome",
+    ["outcome"]
+)
+
+EVAL_JOBS = Counter(
+    "eval_jobs_total",
+    "Background evaluation jobs by outcome",
+    ["outcome"]
+)
+
+EVAL_SCORES = Histogram(
+    "eval_score",
+    "Evaluation scores against ground truth",
+    ["metric"],
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+)
+
+REFLEXION_RUNS = Counter(
+    "reflexion_runs_total",
+    "Reflexion reruns by outcome",
+    ["status"]
+)
+
+RUN_MEMO_LOOKUPS = Counter(
+    "run_memo_lookups_total",
+    "Run-scoped tool memo lookups (hits are tool calls saved on reruns)",
+    ["tool", "result"]
+)
+
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM requests retried after a transient error",
+    ["error"]
+)
+
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from request to the first streamed token",
+    ["backend"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5)
+)
+
+TIME_TO_FIRST_AUDIO = Histogram(
+    "time_to_first_audio_seconds",
+    "Time from a WS turn arriving to its first audio bytes being sent",
+    ["mode"],
+    buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10)
+)
+
+LOCAL_GEN_BATCH_SIZE = Histogram(
+    "local_gen_batch_size",
+    "Prompts per local HF generation batch",
+    buckets=(1, 2, 4, 8, 16, 32)
+)
+
+LOCAL_GEN_LATENCY = Histogram(
+    "local_gen_latency_seconds",
+    "Local HF generation time per batch"
+)
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "single_flight_calls_total",
+    "Calls by single-flight role (coalesced = served by another caller's execution)",
+    ["call", "role"]
+)
+
+PROMPT_TOKENS = Histogram(
+    "prompt_tokens",
+    "Tokens per assembled RAG prompt",
+    buckets=(100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 8000)
+)
+
+PROMPT_TOKENS_SAVED = Counter(
+    "prompt_tokens_saved_total",
+    "Tokens cut from RAG prompts by the token budget",
+    ["section"]
+)
@@ -0,0 +1,41 @@
+"""
+Per-turn stage timings for offline evaluation.
+
+The executor wraps its phases in `with stage("retrieval"): ...`. Timings
+are only recorded inside `collect_stages()` (used by
+scripts/run_eval_suite.py); in the server this is a no-op.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Optional
+
+_STAGES: ContextVar[Optional[Dict[str, float]]] = ContextVar("turn_stages", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    timings = _STAGES.get()
+    if timings is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (perf_counter() - start) * 1000
+
+
+@contextmanager
+def collect_stages():
+    """
+    Yields a dict filled with {stage: milliseconds} for the enclosed call.
+    """
+    timings: Dict[str, float] = {}
+    token = _STAGES.set(timings)
+    try:
+        yield timings
+    finally:
+        _STAGES.reset(token)
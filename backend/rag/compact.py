@@ -0,0 +1,285 @@
+"""
+Compact vector storage
+----------------------
+- CompactCodec: PCA projection fitted at index time (Chroma stores the
+  reduced vectors)
+- quantize(): float16 / int8 storage for the NumPy index
+- FullPrecisionStore: append-only float32 sidecar, memory-mapped and
+  only read to re-score a small candidate set at query time
+- upsert_vectors(): the one write path (indexer, video loader), so
+  every document lands in both Chroma and the sidecar
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CODEC_FILE = "compact_codec.npz"
+FULL_VECTORS_FILE = "full_vectors.f32"
+FULL_IDS_FILE = "full_ids.txt"
+
+
+def normalize(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Returns (codes, scales). int8 uses one symmetric scale per vector;
+    float dtypes have no scales.
+    """
+    x = np.asarray(vectors, dtype=np.float32)
+    if dtype != "int8":
+        return x.astype(dtype), None
+
+    scales = np.abs(x).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.round(x / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+# -------------------------------------------------------------------
+# PCA codec
+# -------------------------------------------------------------------
+
+class CompactCodec:
+    def __init__(self, pca_dim: int = 0, mean=None, components=None, full_dim: Optional[int] = None):
+        self.pca_dim = pca_dim
+        self.mean = mean
+        self.components = components
+        self.full_dim = full_dim
+
+    @property
+    def fitted(self) -> bool:
+        return self.full_dim is not None
+
+    @property
+    def dim(self) -> int:
+        if self.components is not None:
+            return self.components.shape[0]
+        return self.full_dim
+
+    def fit(self, vectors):
+        x = np.asarray(vectors, dtype=np.float32)
+        self.full_dim = x.shape[1]
+
+        dim = min(self.pca_dim, x.shape[0], x.shape[1]) if self.pca_dim else 0
+        if dim and dim < self.full_dim:
+            self.mean = x.mean(axis=0)
+            _, _, vt = np.linalg.svd(x - self.mean, full_matrices=False)
+            self.components = vt[:dim].astype(np.float32)
+
+        print(f" Compact codec fitted: {self.full_dim} -> {self.dim} dims")
+        return self
+
+    def reduce(self, vectors) -> np.ndarray:
+        x = np.asarray(vectors, dtype=np.float32)
+        if self.components is None:
+            return x
+        return (x - self.mean) @ self.components.T
+
+    def save(self, index_dir: str):
+        os.makedirs(index_dir, exist_ok=True)
+        np.savez(
+            os.path.join(index_dir, CODEC_FILE),
+            pca_dim=self.pca_dim,
+            full_dim=self.full_dim,
+            mean=self.mean if self.mean is not None else np.zeros(0, np.float32),
+            components=(
+                self.components if self.components is not None
+                else np.zeros((0, 0), np.float32)
+            ),
+        )
+
+    @classmethod
+    def load(cls, index_dir: str) -> "CompactCodec":
+        data = np.load(os.path.join(index_dir, CODEC_FILE))
+        components = data["components"]
+        return cls(
+            pca_dim=int(data["pca_dim"]),
+            mean=data["mean"] if components.size else None,
+            components=components if components.size else None,
+            full_dim=int(data["full_dim"]),
+        )
+
+
+class ReducedEmbeddings:
+    """
+    Wraps an embeddings object so LangChain callers (retriever,
+    add_documents) work against a PCA-reduced collection.
+    """
+
+    def __init__(self, base, codec: CompactCodec):
+        self.base = base
+        self.codec = codec
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.codec.reduce(self.base.embed_query(text)).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.codec.reduce(self.base.embed_documents(texts)).tolist()
+
+
+# -------------------------------------------------------------------
+# Full-precision sidecar
+# -------------------------------------------------------------------
+
+class FullPrecisionStore:
+    def __init__(self, index_dir: str, dim: Optional[int] = None):
+        self.index_dir = index_dir
+        self.dim = dim
+        self.vectors_path = os.path.join(index_dir, FULL_VECTORS_FILE)
+        self.ids_path = os.path.join(index_dir, FULL_IDS_FILE)
+        self._rows: Dict[str, int] = {}
+        self._matrix = None
+
+    # ---- writing (indexer) ----
+
+    def append(self, ids: Sequence[str], vectors):
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self.vectors_path, "ab") as f:
+            np.asarray(vectors, dtype=np.float32).tofile(f)
+        with open(self.ids_path, "a") as f:
+            f.writelines(f"{i}\n" for i in ids)
+
+    def truncate(self, n_rows: int):
+        """Drop rows written after the last checkpoint."""
+        if n_rows == 0 or self.dim is None:
+            self.clear()
+            return
+        if os.path.exists(self.vectors_path):
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(n_rows * self.dim * 4)
+        if os.path.exists(self.ids_path):
+            with open(self.ids_path) as f:
+                ids = f.read().splitlines()[:n_rows]
+            with open(self.ids_path, "w") as f:
+                f.writelines(f"{i}\n" for i in ids)
+
+    def clear(self):
+        for path in (self.vectors_path, self.ids_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ---- reading (query time) ----
+
+    def load(self) -> "FullPrecisionStore":
+        with open(self.ids_path) as f:
+            ids = f.read().splitlines()
+        # Later rows win if an id was re-indexed
+        self._rows = {rid: row for row, rid in enumerate(ids)}
+        if not ids:
+            self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+            return self
+        self._matrix = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r",
+            shape=(len(ids), self.dim),
+        )
+        return self
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._rows)
+
+    def vectors_for(self, ids: Sequence[str]) -> np.ndarray:
+        return np.asarray(self._matrix[[self._rows[i] for i in ids]])
+
+    def similarities(self, query, ids: Sequence[str]) -> Dict[str, float]:
+        known = [i for i in ids if i in self._rows]
+        if not known:
+            return {}
+        sims = normalize(self.vectors_for(known)) @ normalize(query)
+        return dict(zip(known, sims.tolist()))
+
+
+# -------------------------------------------------------------------
+# Writing
+# -------------------------------------------------------------------
+
+def load_compact_writer(index_dir: str) -> Optional[Tuple[CompactCodec, FullPrecisionStore]]:
+    """
+    (codec, full_store) for appending to an existing compact index;
+    None if no codec has been fitted yet.
+    """
+    if not os.path.exists(os.path.join(index_dir, CODEC_FILE)):
+        return None
+    codec = CompactCodec.load(index_dir)
+    return codec, FullPrecisionStore(index_dir, dim=codec.full_dim)
+
+
+def upsert_vectors(
+    collection,
+    ids: Sequence[str],
+    vectors,
+    documents: Sequence[str],
+    metadatas: Sequence[dict],
+    compact: Optional[Tuple[CompactCodec, FullPrecisionStore]] = None,
+    batch_size: int = 256,
+):
+    """
+    Upsert full-dimension `vectors` into a Chroma collection. With
+    compact=(codec, full_store) the full vectors go to the sidecar and
+    Chroma gets the reduced ones; an unfitted codec is fitted on this
+    batch first.
+    """
+    if compact is not None:
+        codec, full_store = compact
+        if not codec.fitted:
+            codec.fit(vectors)
+            codec.save(full_store.index_dir)
+            full_store.dim = codec.full_dim
+        full_store.append(ids, vectors)
+        vectors = codec.reduce(vectors).tolist()
+
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        collection.upsert(
+            ids=list(ids[start:end]),
+            embeddings=vectors[start:end],
+            documents=list(documents[start:end]),
+            metadatas=list(metadatas[start:end]),
+        )
+
+
+# -------------------------------------------------------------------
+# Query-time state
+# -------------------------------------------------------------------
+
+class CompactState:
+    def __init__(self, codec: CompactCodec, store: FullPrecisionStore, candidates: int):
+        self.codec = codec
+        self.store = store
+        self.candidates = candidates
+
+    def rescore(self, results: Dict[str, list], query, k: int) -> Dict[str, list]:
+        """
+        Re-rank approximate candidates by exact cosine similarity against
+        the full-precision vectors and keep the top k.
+        """
+        exact = self.store.similarities(query, results["ids"])
+
+        scored = []
+        for pos, rid in enumerate(results["ids"]):
+            # Ids missing from the sidecar keep their approximate score
+            sim = exact.get(rid, 1.0 - results["distances"][pos])
+            scored.append((sim, pos))
+        scored.sort(key=lambda t: -t[0])
+        top = scored[:k]
+
+        out = {
+            key: [results[key][pos] for _, pos in top]
+            for key in ("ids", "documents", "metadatas")
+        }
+        out["distances"] = [float(1.0 - sim) for sim, _ in top]
+        return out
+
+
+def load_compact_state(index_dir: str, candidates: int) -> Optional[CompactState]:
+    if not os.path.exists(os.path.join(index_dir, CODEC_FILE)):
+        return None
+    codec = CompactCodec.load(index_dir)
+    store = FullPrecisionStore(index_dir, dim=codec.full_dim).load()
+    return CompactState(codec, store, candidates)
@@ -1,36 +1,52 @@
-from langchain_community.vectorstores import Chroma
-from backend.core.llm_client import get_embeddings
-
-def get_vectorstore():
-    return Chroma(
-        collection_name="ecommerce_docs",
-        persist_directory="backend/data/chroma",
-        embedding_function=get_embeddings(),
-    )
-
-def handle_faq_query(query: str):
-    vectorstore = get_vectorstore()
-    results = vectorstore._collection.query(
-        query_texts=[query],
-        n_results=1,
-        where={"type": "faq"},
-    )
-
-    docs = (results.get("documents") or [[]])[0]
+from backend.rag.vector_index import get_vector_index
+from backend.core.circuit_breaker import CircuitOpen
+from backend.core.single_flight import SingleFlight, fingerprint
+
+# Identical concurrent questions share one search
+FAQ_FLIGHT = SingleFlight("faq_query")
+POLICY_FLIGHT = SingleFlight("policy_query")
+
+def handle_faq_query(query: str, retrieval=None):
+    if retrieval and "faq" in retrieval:
+        return _faq_answer(retrieval["faq"])
+    return FAQ_FLIGHT.do(fingerprint(query), _search_faq, query)
+
+def _search_faq(query: str):
+    try:
+        results = get_vector_index().query(
+            query,
+            k=1,
+            doc_type="faq",
+        )
+    except CircuitOpen:
+        return "I couldn't find the answer to that question."
+    return _faq_answer(results)
+
+def _faq_answer(results):
+    docs = results["documents"]
     if not docs:
         return "I couldn't find the answer to that question."
 
     return docs[0]
 
-def handle_policy_query(query: str):
-    vectorstore = get_vectorstore()
-    results = vectorstore._collection.query(
-        query_texts=[query],
-        n_results=1,
-        where={"type": "policy"},
-    )
+def handle_policy_query(query: str, retrieval=None):
+    if retrieval and "policy" in retrieval:
+        return _policy_answer(retrieval["policy"])
+    return POLICY_FLIGHT.do(fingerprint(query), _search_policy, query)
+
+def _search_policy(query: str):
+    try:
+        results = get_vector_index().query(
+            query,
+            k=1,
+            doc_type="policy",
+        )
+    except CircuitOpen:
+        return "I couldn't find the policy information."
+    return _policy_answer(results)
 
-    docs = (results.get("documents") or [[]])[0]
+def _policy_answer(results):
+    docs = results["documents"]
     if not docs:
         return "I couldn't find the policy information."
 
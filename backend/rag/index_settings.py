@@ -0,0 +1,77 @@
+"""
+Persisted HNSW settings for the `ecommerce_docs` Chroma collection.
+Written by scripts/tune_vector_index.py, read by get_vectorstore().
+"""
+
+import os
+import json
+from typing import Dict, Optional
+
+from backend.core.config import VECTOR_INDEX_SETTINGS_PATH
+
+DEFAULT_SETTINGS = {
+    "space": "l2",
+    "M": 16,
+    "ef_construction": 100,
+    "ef_search": 10,
+}
+
+
+def load_index_settings(path: str = VECTOR_INDEX_SETTINGS_PATH) -> Optional[Dict]:
+    """
+    Return persisted settings, or None if the index was never tuned
+    (Chroma defaults apply in that case).
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return {**DEFAULT_SETTINGS, **json.load(f)}
+
+
+def save_index_settings(settings: Dict, path: str = VECTOR_INDEX_SETTINGS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({k: settings[k] for k in DEFAULT_SETTINGS}, f, indent=2)
+    print(f" Saved index settings to {path}: {settings}")
+
+
+def to_collection_metadata(settings: Dict) -> Dict:
+    """
+    Chroma reads HNSW parameters from collection metadata when the
+    collection is created.
+    """
+    return {
+        "hnsw:space": settings["space"],
+        "hnsw:M": int(settings["M"]),
+        "hnsw:construction_ef": int(settings["ef_construction"]),
+        "hnsw:search_ef": int(settings["ef_search"]),
+    }
+
+
+# ef_search this process last applied, per collection name
+_APPLIED_EF_SEARCH: Dict[str, int] = {}
+
+
+def apply_runtime_settings(collection, settings: Dict):
+    """
+    ef_search is the only parameter that can change after creation.
+    Newer Chroma versions expose it through collection configuration;
+    older ones only honour the value stored at creation time.
+
+    Written once per process and value (get_vectorstore() calls this
+    on every open): a retuned settings file is picked up, an unchanged
+    one costs no metadata write.
+    """
+    ef_search = int(settings["ef_search"])
+    if _APPLIED_EF_SEARCH.get(collection.name) == ef_search:
+        return
+    _APPLIED_EF_SEARCH[collection.name] = ef_search
+
+    current = (collection.metadata or {}).get("hnsw:search_ef")
+    if current == ef_search:
+        return
+
+    try:
+        collection.modify(configuration={"hnsw": {"ef_search": ef_search}})
+    except Exception as e:
+        print(" ef_search not modifiable at runtime on this Chroma version:", e)
@@ -1,7 +1,18 @@
+import os
 from typing import List, Dict
+import chromadb
 from langchain_community.vectorstores import Chroma
 from backend.core.llm_client import get_embeddings
 from langchain_core.runnables import RunnableLambda
+from backend.rag.vector_index import DOC_TYPES, get_vector_index
+from backend.core.config import COMPACT_INDEX_ENABLED, RAG_TRANSCRIPT_MAX_DISTANCE, VECTOR_INDEX_DIR
+from backend.core.single_flight import SingleFlight, fingerprint
+from backend.rag.compact import CODEC_FILE, CompactCodec, ReducedEmbeddings
+from backend.rag.index_settings import (
+    load_index_settings,
+    to_collection_metadata,
+    apply_runtime_settings,
+)
 
 # -------------------------------------------------------------------
 # Embeddings
@@ -13,13 +24,43 @@ embeddings = get_embeddings()
 # Vector store initialization
 # -------------------------------------------------------------------
 
+CHROMA_DIR = "backend/data/chroma"
+COLLECTION_NAME = "ecommerce_docs"
+
+
+def _collection_exists(client, name: str) -> bool:
+    # Names (Chroma >= 0.6) or Collection objects (older)
+    return any(getattr(c, "name", c) == name for c in client.list_collections())
+
+
 def get_vectorstore():
-    return Chroma(
-        collection_name="ecommerce_docs",
-        persist_directory="backend/data/chroma",
-        embedding_function=get_embeddings(), 
+    settings = load_index_settings()
+
+    # A compact collection stores PCA-reduced vectors
+    embedding_function = embeddings
+    if COMPACT_INDEX_ENABLED and os.path.exists(os.path.join(VECTOR_INDEX_DIR, CODEC_FILE)):
+        embedding_function = ReducedEmbeddings(embeddings, CompactCodec.load(VECTOR_INDEX_DIR))
+
+    client = chromadb.PersistentClient(path=CHROMA_DIR)
+
+    # HNSW parameters are fixed at creation: only a new collection gets them
+    collection_metadata = None
+    if settings and not _collection_exists(client, COLLECTION_NAME):
+        collection_metadata = to_collection_metadata(settings)
+
+    vectorstore = Chroma(
+        collection_name=COLLECTION_NAME,
+        client=client,
+        embedding_function=embedding_function,
+        collection_metadata=collection_metadata,
     )
 
+    # Tuned via scripts/tune_vector_index.py (ef_search on an existing collection)
+    if settings:
+        apply_runtime_settings(vectorstore._collection, settings)
+
+    return vectorstore
+
 # -------------------------------------------------------------------
 # Backward compatibility
 # -------------------------------------------------------------------
@@ -30,10 +71,42 @@ def init_vectorstore():
 def get_retriever():
     return get_vectorstore().as_retriever(search_kwargs={"k": 4})
 
+# -------------------------------------------------------------------
+# Turn-level retrieval (one embedding, every partition)
+# -------------------------------------------------------------------
+
+TURN_TOP_K = {
+    "product": 5,
+    "faq": 1,
+    "policy": 1,
+    "video_transcript": 2,
+}
+
+# Identical concurrent searches share one embedding + Chroma query
+RETRIEVAL_FLIGHT = SingleFlight("retrieval")
+
+def retrieve_for_turn(query: str, doc_types=DOC_TYPES, embedding=None):
+    """
+    Embed `query` once (or reuse `embedding`) and return per-type top-k hits.
+    Handlers accept the result via their `retrieval` argument.
+    """
+    return RETRIEVAL_FLIGHT.do(
+        fingerprint(query, sorted(doc_types)),
+        get_vector_index().query_types,
+        query,
+        embedding=embedding,
+        k=TURN_TOP_K,
+        doc_types=doc_types,
+    )
 
-def handle_rag(query: str, session_id: str,lc_config=None):
-    vectorstore = get_vectorstore()
 
+def handle_rag(query: str, session_id: str, lc_config=None, retrieval=None):
+    """
+    With turn-level `retrieval` this is local work; otherwise the
+    product search goes through retrieve_for_turn, so identical
+    in-flight queries share one search. The reply, sources and trace
+    are always built per caller.
+    """
     # -------------------------------
     # Extract simple constraints
     # -------------------------------
@@ -51,11 +124,10 @@ def handle_rag(query: str, session_id: str,lc_config=None):
         constraints["size"] = "L"
 
     try:
-        results = vectorstore._collection.query(
-            query_texts=[query],
-            n_results=5,  
-            where={"type": {"$in": ["product"]}},
-        )
+        if retrieval and "product" in retrieval:
+            results = retrieval["product"]
+        else:
+            results = retrieve_for_turn(query, ("product",))["product"]
     except Exception as e:
         return {
             "reply": "I'm having trouble accessing product information right now.",
@@ -66,8 +138,8 @@ def handle_rag(query: str, session_id: str,lc_config=None):
             }
         }
 
-    documents = (results.get("documents") or [[]])[0]
-    metadatas = (results.get("metadatas") or [[]])[0]
+    documents = results["documents"]
+    metadatas = results["metadatas"]
 
     if not documents:
         return {
@@ -131,13 +203,24 @@ def handle_rag(query: str, session_id: str,lc_config=None):
         )
         print(" LangChain invoke completed (RAG trace)")
         
-    return {
-    "reply": selected_doc,
-    "sources": [
+    # Copies: search results may be shared with coalesced callers
+    sources = [
         {
             "page_content": selected_doc,
-            "metadata": selected_meta,
+            "metadata": dict(selected_meta or {}),
         }
-    ],
+    ]
+
+    # Video transcripts found with the same query vector, if close enough
+    video = (retrieval or {}).get("video_transcript") or {}
+    for doc, meta, distance in zip(
+        video.get("documents", []), video.get("metadatas", []), video.get("distances", []),
+    ):
+        if distance <= RAG_TRANSCRIPT_MAX_DISTANCE:
+            sources.append({"page_content": doc, "metadata": dict(meta or {})})
+
+    return {
+    "reply": selected_doc,
+    "sources": sources,
     "result": {"needs_human": False}
 }
\ No newline at end of file
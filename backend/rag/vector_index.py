@@ -0,0 +1,355 @@
+"""
+Pluggable vector index used by rag.py and faq_policy.py
+--------------------------------------------------------
+- ChromaVectorIndex: the existing Chroma collection
+- NumpyVectorIndex: exact top-k over a memory-mapped matrix of
+  normalized vectors, pre-partitioned into one slice per doc `type`
+
+Both return the same shape:
+    {"ids": [...], "documents": [...], "metadatas": [...], "distances": [...]}
+
+Distances are cosine distances (1 - cosine similarity, 0 = same
+direction) on every backend, whatever `hnsw:space` the Chroma collection
+was built with, so one cutoff means the same thing everywhere.
+
+In compact mode (COMPACT_INDEX_ENABLED) the stored vectors are
+PCA-reduced and/or quantized; each query over-fetches candidates and
+re-scores them against the full-precision sidecar (see compact.py).
+"""
+
+import os
+import json
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from backend.core.config import (
+    VECTOR_INDEX_BACKEND,
+    VECTOR_INDEX_DIR,
+    COMPACT_INDEX_ENABLED,
+    COMPACT_RESCORE_CANDIDATES,
+)
+from backend.rag.compact import CompactState, load_compact_state, normalize, quantize
+from backend.core.circuit_breaker import get_breaker
+
+DocType = Union[str, Sequence[str], None]
+
+DOC_TYPES = ("product", "faq", "policy", "video_transcript")
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+RECORDS_FILE = "records.json"
+PARTITIONS_FILE = "partitions.json"
+
+
+EMPTY_RESULT = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+
+def _as_type_list(doc_type: DocType) -> Optional[List[str]]:
+    if doc_type is None:
+        return None
+    if isinstance(doc_type, str):
+        return [doc_type]
+    return list(doc_type)
+
+
+# -------------------------------------------------------------------
+# Interface
+# -------------------------------------------------------------------
+
+class VectorIndex:
+    """
+    Minimal retrieval interface.
+    Pass either `query_text` or a precomputed `embedding`.
+    """
+
+    compact: Optional[CompactState] = None
+
+    def embed_query(self, text: str) -> List[float]:
+        raise NotImplementedError
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+    def query(
+        self,
+        query_text: Optional[str] = None,
+        *,
+        embedding: Optional[Sequence[float]] = None,
+        k: int = 5,
+        doc_type: DocType = None,
+    ) -> Dict[str, list]:
+        raise NotImplementedError
+
+    def query_types(
+        self,
+        query_text: Optional[str] = None,
+        *,
+        embedding: Optional[Sequence[float]] = None,
+        k: Union[int, Dict[str, int]] = 5,
+        doc_types: Sequence[str] = DOC_TYPES,
+    ) -> Dict[str, Dict[str, list]]:
+        """
+        Embed once, then search each type partition with the same vector.
+        Returns {doc_type: {"ids", "documents", "metadatas", "distances"}}.
+        """
+        if embedding is None:
+            embedding = self.embed_query(query_text)
+
+        return {
+            t: self.query(
+                embedding=embedding,
+                k=k.get(t, 5) if isinstance(k, dict) else k,
+                doc_type=t,
+            )
+            for t in doc_types
+        }
+
+
+# -------------------------------------------------------------------
+# Chroma backend
+# -------------------------------------------------------------------
+
+class ChromaVectorIndex(VectorIndex):
+    def __init__(self, vectorstore, embeddings=None, compact: Optional[CompactState] = None):
+        self.vectorstore = vectorstore
+        self.collection = vectorstore._collection
+        # Fails fast with CircuitOpen while Chroma is erroring / slow
+        self.breaker = get_breaker("chroma", probe=self.collection.count)
+        # Full-dimension embeddings (the store's own may be PCA-wrapped)
+        self.embeddings = embeddings or vectorstore._embedding_function
+        self.compact = compact
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]:
+        # One batched request instead of one per text
+        return self.embeddings.embed_documents(list(texts))
+
+    def query(self, query_text=None, *, embedding=None, k=5, doc_type=None):
+        types = _as_type_list(doc_type)
+
+        kwargs = {
+            "n_results": max(k, self.compact.candidates) if self.compact else k,
+        }
+        if types:
+            kwargs["where"] = (
+                {"type": types[0]} if len(types) == 1
+                else {"type": {"$in": types}}
+            )
+
+        if embedding is None:
+            embedding = self.embed_query(query_text)
+
+        search = self.compact.codec.reduce(embedding) if self.compact else embedding
+
+        results = self.breaker.call(
+            self.collection.query,
+            query_embeddings=[[float(x) for x in search]],
+            include=["documents", "metadatas", "embeddings"],
+            **kwargs,
+        )
+
+        ids = (results.get("ids") or [[]])[0]
+        if not ids:
+            return dict(EMPTY_RESULT)
+
+        # Chroma's distance depends on the collection's space (squared L2
+        # by default): recompute cosine distance from the returned vectors
+        sims = normalize(np.asarray(results["embeddings"][0], dtype=np.float32)) @ normalize(search)
+        order = np.argsort(-sims, kind="stable")
+
+        documents = (results.get("documents") or [[]])[0]
+        metadatas = (results.get("metadatas") or [[]])[0]
+        out = {
+            "ids": [ids[i] for i in order],
+            "documents": [documents[i] for i in order],
+            "metadatas": [metadatas[i] for i in order],
+            "distances": [float(1.0 - sims[i]) for i in order],
+        }
+
+        if self.compact:
+            return self.compact.rescore(out, embedding, k)
+        return out
+
+
+# -------------------------------------------------------------------
+# NumPy backend
+# -------------------------------------------------------------------
+
+class NumpyVectorIndex(VectorIndex):
+    """
+    Brute-force exact search.
+    Vectors are L2-normalized at build time, so cosine similarity is a
+    single matrix-vector product over the slice for each requested type.
+    """
+
+    def __init__(self, index_dir: str, embeddings, compact: Optional[CompactState] = None):
+        self.index_dir = index_dir
+        self.embeddings = embeddings
+        self.compact = compact
+
+        self.vectors = np.load(os.path.join(index_dir, VECTORS_FILE), mmap_mode="r")
+
+        # int8 vectors carry one scale per row
+        scales_path = os.path.join(index_dir, SCALES_FILE)
+        self.scales = np.load(scales_path) if os.path.exists(scales_path) else None
+
+        with open(os.path.join(index_dir, RECORDS_FILE)) as f:
+            records = json.load(f)
+        self.ids = [r["id"] for r in records]
+        self.documents = [r["document"] for r in records]
+        self.metadatas = [r["metadata"] for r in records]
+
+        with open(os.path.join(index_dir, PARTITIONS_FILE)) as f:
+            self.partitions = {t: tuple(span) for t, span in json.load(f).items()}
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def embed_documents(self, texts: Sequence[str]) -> List[List[float]]:
+        # One batched request instead of one per text
+        return self.embeddings.embed_documents(list(texts))
+
+    def _slices(self, types: Optional[List[str]]):
+        if types is None:
+            return [(0, self.vectors.shape[0])]
+        return [self.partitions[t] for t in types if t in self.partitions]
+
+    def query(self, query_text=None, *, embedding=None, k=5, doc_type=None):
+        if embedding is None:
+            embedding = self.embed_query(query_text)
+
+        q = np.array(embedding, dtype=np.float32)
+        if self.compact:
+            q = self.compact.codec.reduce(q)
+        q = normalize(q)
+
+        n = max(k, self.compact.candidates) if self.compact else k
+
+        rows, scores = [], []
+        for start, end in self._slices(_as_type_list(doc_type)):
+            if end <= start:
+                continue
+            sims = self.vectors[start:end] @ q
+            if self.scales is not None:
+                sims = sims * self.scales[start:end]
+            top = min(n, sims.shape[0])
+            idx = np.argpartition(-sims, top - 1)[:top]
+            rows.append(idx + start)
+            scores.append(sims[idx])
+
+        if not rows:
+            return dict(EMPTY_RESULT)
+
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores).astype(np.float32)
+        order = np.argsort(-scores)[:n]
+
+        out = {
+            "ids": [self.ids[i] for i in rows[order]],
+            "documents": [self.documents[i] for i in rows[order]],
+            "metadatas": [self.metadatas[i] for i in rows[order]],
+            "distances": [float(1.0 - s) for s in scores[order]],
+        }
+
+        if self.compact:
+            return self.compact.rescore(out, embedding, k)
+        return out
+
+
+def build_numpy_index(vectorstore, index_dir: str = VECTOR_INDEX_DIR, dtype: str = "float32"):
+    """
+    Export the Chroma collection into a NumPy index directory.
+    Rows are grouped by `type` so each type is one contiguous slice.
+    dtype: float32 | float16 | int8 (int8 also writes per-row scales).
+    """
+    data = vectorstore._collection.get(include=["embeddings", "documents", "metadatas"])
+
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    documents = data["documents"]
+    metadatas = data["metadatas"]
+
+    types = [(m or {}).get("type", "unknown") for m in metadatas]
+    order = sorted(range(len(types)), key=lambda i: types[i])
+
+    vectors = normalize(vectors)[order]
+    codes, scales = quantize(vectors, dtype)
+
+    os.makedirs(index_dir, exist_ok=True)
+
+    out = np.lib.format.open_memmap(
+        os.path.join(index_dir, VECTORS_FILE),
+        mode="w+",
+        dtype=codes.dtype,
+        shape=codes.shape,
+    )
+    out[:] = codes
+    out.flush()
+    del out
+
+    scales_path = os.path.join(index_dir, SCALES_FILE)
+    if scales is not None:
+        np.save(scales_path, scales)
+    elif os.path.exists(scales_path):
+        os.remove(scales_path)
+
+    partitions: Dict[str, List[int]] = {}
+    for pos, i in enumerate(order):
+        span = partitions.setdefault(types[i], [pos, pos])
+        span[1] = pos + 1
+
+    with open(os.path.join(index_dir, RECORDS_FILE), "w") as f:
+        json.dump(
+            [
+                {"id": data["ids"][i], "document": documents[i], "metadata": metadatas[i]}
+                for i in order
+            ],
+            f,
+        )
+    with open(os.path.join(index_dir, PARTITIONS_FILE), "w") as f:
+        json.dump(partitions, f)
+
+    print(f" Built NumPy index: {vectors.shape[0]} vectors, dim={vectors.shape[1]}, dtype={dtype}")
+    return partitions
+
+
+# -------------------------------------------------------------------
+# Factory
+# -------------------------------------------------------------------
+
+_INDEX: Optional[VectorIndex] = None
+
+
+def _make_index(backend: str) -> VectorIndex:
+    from backend.rag.rag import get_vectorstore, embeddings
+
+    compact = (
+        load_compact_state(VECTOR_INDEX_DIR, COMPACT_RESCORE_CANDIDATES)
+        if COMPACT_INDEX_ENABLED else None
+    )
+
+    if backend == "numpy":
+        return NumpyVectorIndex(VECTOR_INDEX_DIR, embeddings, compact=compact)
+    return ChromaVectorIndex(get_vectorstore(), embeddings=embeddings, compact=compact)
+
+
+def get_vector_index(backend: Optional[str] = None) -> VectorIndex:
+    """
+    Process-wide index. Backend is chosen by VECTOR_INDEX_BACKEND
+    unless overridden (overrides are not cached).
+    """
+    global _INDEX
+
+    if backend is not None:
+        return _make_index(backend)
+
+    if _INDEX is None:
+        _INDEX = _make_index(VECTOR_INDEX_BACKEND)
+        print(
+            f"[RAG] Vector index backend = {type(_INDEX).__name__} "
+            f"(compact={_INDEX.compact is not None})"
+        )
+
+    return _INDEX
@@ -0,0 +1,11 @@
+import os
+import sys
+from pathlib import Path
+
+# `backend` / `scripts` import from the repository root
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# backend.db.db needs a database URL at import; tests never touch Postgres
+os.environ.setdefault("DB_URL", "sqlite://")
@@ -0,0 +1,162 @@
+"""
+Streamed final answers and sentence-level speech, against the fake
+streaming endpoint (scripts/mock_openai_server.py).
+"""
+
+import asyncio
+import wave
+
+import pytest
+
+from backend.agents.answer_stream import stream_answer, stream_scope
+from backend.audio.sentence_buffer import SentenceBuffer
+from backend.audio.speech_stream import SpeechStream
+from backend.core.deadline import Deadline
+from scripts.mock_openai_server import serve
+
+QUESTION = "do you have linen shirts"
+FALLBACK = "Linen shirt, sizes M and L, Rs. 1,299.50"
+SOURCES = [{
+    "page_content": FALLBACK,
+    "metadata": {"type": "product", "product_id": "P100"},
+}]
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    from backend.agents import langchain_prompts
+    from backend.core import llm_client
+
+    running = []
+
+    def start(**kwargs):
+        server, state, base_url = serve(**kwargs)
+        clients = llm_client.LLMClientManager(base_url=base_url, api_key="mock-key")
+        monkeypatch.setattr(llm_client, "LLM_CLIENTS", clients)
+        monkeypatch.setattr(langchain_prompts, "EMBEDDING_BACKEND", "openai")
+        running.append((server, clients))
+        return state
+
+    yield start
+
+    for server, clients in running:
+        clients.close()
+        server.shutdown()
+
+
+class FakeWS:
+    def __init__(self, tmp_path, on_json=None):
+        self.tmp_path = tmp_path
+        self.on_json = on_json
+        self.sent = []
+
+    async def send_json(self, payload):
+        self.sent.append(payload)
+        if self.on_json:
+            self.on_json(payload)
+
+    async def send_bytes(self, chunk):
+        self.sent.append(chunk)
+
+    def synthesize(self, text):
+        path = self.tmp_path / f"{len(self.sent)}.wav"
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(b"\0\0" * 4000)
+        return str(path)
+
+    def of_type(self, kind):
+        return [m for m in self.sent if isinstance(m, dict) and m.get("type") == kind]
+
+
+def run_streamed_turn(ws, **speech_kwargs):
+    async def scenario():
+        speech = SpeechStream(ws.send_json, ws.send_bytes, ws.synthesize, **speech_kwargs)
+        ws.speech = speech
+
+        def turn():
+            with stream_scope(speech.on_token):
+                return stream_answer(QUESTION, SOURCES, "test-session", FALLBACK)
+
+        reply = await speech.speak_while(asyncio.to_thread(turn))
+        return speech, reply
+
+    return asyncio.run(scenario())
+
+
+def expected_sentences(text):
+    buffer = SentenceBuffer()
+    sentences = buffer.push(text)
+    rest = buffer.flush()
+    return sentences + ([rest] if rest else [])
+
+
+def test_sentences_are_spoken_while_generation_continues(fake_llm, tmp_path):
+    fake_llm(token_delay_ms=20)
+    ws = FakeWS(tmp_path)
+
+    speech, reply = run_streamed_turn(ws)
+
+    tokens = [m["text"] for m in ws.of_type("token")]
+    assert speech.streamed
+    assert "".join(tokens) == reply
+    assert reply.startswith("Mock answer to:")
+
+    spoken = [m["text"] for m in ws.of_type("audio_start")]
+    assert spoken == expected_sentences(reply)
+    assert len(spoken) >= 2
+    assert speech.sentences_spoken == len(spoken)
+
+    # First sentence went out before the last token arrived
+    first_audio = ws.sent.index(ws.of_type("audio_start")[0])
+    last_token = ws.sent.index(ws.of_type("token")[-1])
+    assert first_audio < last_token
+
+
+def test_barge_in_stops_speech_but_turn_completes(fake_llm, tmp_path):
+    fake_llm(token_delay_ms=20)
+
+    def on_json(payload):
+        if payload["type"] == "audio_start":
+            ws.speech.interrupt()
+
+    ws = FakeWS(tmp_path, on_json=on_json)
+
+    speech, reply = run_streamed_turn(ws)
+
+    assert speech.interrupted
+    assert len(ws.of_type("audio_start")) == 1
+    assert len(ws.of_type("audio_end")) == 1
+    assert not any(isinstance(m, bytes) for m in ws.sent[ws.sent.index(ws.of_type("audio_start")[0]):])
+    # Nothing sent after the interrupted sentence closed
+    assert ws.sent[-1] == {"type": "audio_end"}
+    # Generation still finished and the turn has the full answer
+    assert reply.startswith("Mock answer to:")
+    assert reply.endswith("similar products?")
+
+
+def test_failed_stream_falls_back_to_tool_reply(fake_llm, tmp_path):
+    state = fake_llm(fail_every=1)
+    ws = FakeWS(tmp_path)
+
+    speech, reply = run_streamed_turn(ws)
+
+    assert reply == FALLBACK
+    assert not speech.streamed
+    assert ws.sent == []
+    assert state.snapshot()["failures"] >= 1
+
+
+def test_no_stream_without_scope_or_budget(fake_llm):
+    state = fake_llm()
+
+    assert stream_answer(QUESTION, SOURCES, "test-session", FALLBACK) == FALLBACK
+
+    expired = Deadline(0)
+    with stream_scope(lambda token: None):
+        assert stream_answer(QUESTION, SOURCES, "test-session", FALLBACK, deadline=expired) == FALLBACK
+        assert stream_answer(QUESTION, [], "test-session", FALLBACK) == FALLBACK
+
+    assert state.snapshot()["requests"] == 0
@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+
+from backend.db.audit_log import MCPCallWriter
+
+metadata = MetaData()
+calls = Table(
+    "mcp_calls",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_name", String),
+)
+
+
+class FlakyEngine:
+    """
+    sqlite engine whose transactions fail while `down` is set and wait
+    while `gate` is cleared.
+    """
+
+    def __init__(self, tmp_path):
+        self.engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+        metadata.create_all(self.engine)
+        self.down = False
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def begin(self):
+        self.gate.wait()
+        if self.down:
+            raise RuntimeError("database unavailable")
+        return self.engine.begin()
+
+    def written(self):
+        with self.engine.connect() as conn:
+            return sorted(row.task_name for row in conn.execute(select(calls)))
+
+
+def write_jsonl(path, names):
+    with open(path, "w") as f:
+        for name in names:
+            f.write(json.dumps({"task_name": name}) + "\n")
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line)["task_name"] for line in f if line.strip()]
+
+
+def make_writer(engine, spill_path, **kwargs):
+    kwargs.setdefault("flush_seconds", 0.01)
+    return MCPCallWriter(engine, calls, overflow="spill", spill_path=str(spill_path), **kwargs)
+
+
+def test_failed_replay_keeps_rows_in_spill_file(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    write_jsonl(spill, ["a", "b", "c"])
+    engine = FlakyEngine(tmp_path)
+    engine.down = True
+
+    writer = make_writer(engine, spill)
+    writer.close()
+
+    assert read_jsonl(spill) == ["a", "b", "c"]
+    assert not os.path.exists(f"{spill}.replay")
+    assert engine.written() == []
+
+
+def test_leftover_replay_file_is_replayed_at_startup(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    write_jsonl(f"{spill}.replay", ["a", "b"])
+    write_jsonl(spill, ["c"])
+    engine = FlakyEngine(tmp_path)
+
+    writer = make_writer(engine, spill)
+    writer.close()
+
+    assert engine.written() == ["a", "b", "c"]
+    assert not os.path.exists(spill)
+    assert not os.path.exists(f"{spill}.replay")
+
+
+def test_overflow_spills_and_replays_after_next_flush(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    engine = FlakyEngine(tmp_path)
+    engine.gate.clear()
+
+    writer = make_writer(engine, spill, max_queue=1, batch_size=1)
+    # Worker holds "r0" (blocked on the gate), "r1" queued, rest spilled
+    for i in range(4):
+        writer.submit({"task_name": f"r{i}"})
+        time.sleep(0.05)
+    assert read_jsonl(spill) == ["r2", "r3"]
+
+    engine.gate.set()
+    writer.close()
+
+    assert engine.written() == ["r0", "r1", "r2", "r3"]
+    assert not os.path.exists(spill)
+
+
+def test_close_does_not_hang_on_full_queue(tmp_path):
+    engine = FlakyEngine(tmp_path)
+    engine.gate.clear()
+
+    writer = MCPCallWriter(engine, calls, max_queue=1, overflow="drop", spill_path=str(tmp_path / "s.jsonl"))
+    for i in range(3):
+        writer.submit({"task_name": f"r{i}"})
+        time.sleep(0.05)
+
+    start = time.perf_counter()
+    writer.close(timeout=0.2)
+    assert time.perf_counter() - start < 1.0
+
+    engine.gate.set()
+
+
+def test_failed_flush_spills_rows(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    engine = FlakyEngine(tmp_path)
+    writer = make_writer(engine, spill)
+
+    engine.down = True
+    writer.submit({"task_name": "a"})
+    writer.submit({"task_name": "b"})
+    writer.close()
+
+    assert read_jsonl(spill) == ["a", "b"]
+    assert engine.written() == []
+
+
+def test_failed_flush_without_spill_is_not_written_to_disk(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    engine = FlakyEngine(tmp_path)
+    writer = MCPCallWriter(engine, calls, overflow="drop", spill_path=str(spill), flush_seconds=0.01)
+
+    engine.down = True
+    writer.submit({"task_name": "a"})
+    writer.close()
+
+    assert not os.path.exists(spill)
+
+
+def test_rows_submitted_after_close_are_written(tmp_path):
+    engine = FlakyEngine(tmp_path)
+    writer = make_writer(engine, tmp_path / "spill.jsonl")
+
+    writer.submit({"task_name": "queued"})
+    writer.close()
+    writer.submit({"task_name": "late"})
+
+    assert engine.written() == ["late", "queued"]
+
+
+def test_concurrent_submit_and_close_lose_no_rows(tmp_path):
+    engine = FlakyEngine(tmp_path)
+    writer = make_writer(engine, tmp_path / "spill.jsonl", max_queue=1000)
+    start = threading.Barrier(5)
+
+    def producer(n):
+        start.wait()
+        for i in range(50):
+            writer.submit({"task_name": f"p{n}-{i:02d}"})
+
+    threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    start.wait()
+    writer.close()
+    for t in threads:
+        t.join()
+
+    assert len(engine.written()) == 200
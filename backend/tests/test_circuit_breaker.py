@@ -0,0 +1,135 @@
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from backend.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+    get_breaker,
+)
+
+
+def fail():
+    raise ConnectionError("dependency down")
+
+
+def wait_state(breaker, state, timeout=2.0):
+    end = time.monotonic() + timeout
+    while breaker.state != state:
+        assert time.monotonic() < end, f"breaker stuck in state {breaker.state}"
+        time.sleep(0.005)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+
+
+def state_gauge(name):
+    return REGISTRY.get_sample_value("circuit_breaker_state", {"dependency": name})
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test_open", failure_threshold=3, reset_seconds=60)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    assert breaker.state == CLOSED
+
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == OPEN
+    assert state_gauge("test_open") == OPEN
+
+
+def test_open_breaker_fails_fast():
+    breaker = CircuitBreaker("test_fast", failure_threshold=1, reset_seconds=60)
+    trip(breaker)
+    called = []
+
+    with pytest.raises(CircuitOpen) as exc:
+        breaker.call(called.append, 1)
+
+    assert exc.value.name == "test_fast"
+    assert called == []
+    assert REGISTRY.get_sample_value(
+        "circuit_breaker_rejected_total", {"dependency": "test_fast"}
+    ) == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("test_reset", failure_threshold=2, reset_seconds=60)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.failures == 0
+
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == CLOSED
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker("test_slow", failure_threshold=2, slow_call_seconds=0.01, reset_seconds=60)
+
+    # Slow calls still return their result
+    assert breaker.call(time.sleep, 0.02) is None
+    assert breaker.failures == 1
+    breaker.call(time.sleep, 0.02)
+
+    assert breaker.state == OPEN
+
+
+def test_probe_moves_half_open_then_closed():
+    release = threading.Event()
+    breaker = CircuitBreaker("test_probe", probe=lambda: release.wait(2),
+                             failure_threshold=1, reset_seconds=0.01)
+    trip(breaker)
+
+    wait_state(breaker, HALF_OPEN)
+    with pytest.raises(CircuitOpen):
+        breaker.call(lambda: "ok")
+
+    release.set()
+    wait_state(breaker, CLOSED)
+    assert breaker.failures == 0
+    assert breaker.call(lambda: "ok") == "ok"
+
+
+def test_failed_probe_keeps_breaker_open():
+    healthy = threading.Event()
+    probes = []
+
+    def probe():
+        probes.append(1)
+        if not healthy.is_set():
+            raise ConnectionError("still down")
+
+    breaker = CircuitBreaker("test_reprobe", probe=probe, failure_threshold=1, reset_seconds=0.02)
+    trip(breaker)
+
+    while len(probes) < 2:
+        time.sleep(0.005)
+    assert breaker.state in (OPEN, HALF_OPEN)
+
+    healthy.set()
+    wait_state(breaker, CLOSED)
+
+
+def test_get_breaker_is_shared_and_takes_latest_probe():
+    def probe():
+        return None
+
+    first = get_breaker("test_shared")
+
+    assert get_breaker("test_shared", probe=probe) is first
+    assert first.probe is probe
+    assert get_breaker("test_shared").probe is probe
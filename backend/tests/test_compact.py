@@ -0,0 +1,56 @@
+import numpy as np
+
+from backend.rag.compact import CompactCodec, FullPrecisionStore, load_compact_writer, upsert_vectors
+
+
+class FakeCollection:
+    def __init__(self):
+        self.rows = {}
+        self.calls = 0
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.calls += 1
+        for i, vector, doc, meta in zip(ids, embeddings, documents, metadatas):
+            self.rows[i] = (list(vector), doc, meta)
+
+
+def vectors(n, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32).tolist()
+
+
+def test_plain_upsert_is_batched():
+    collection = FakeCollection()
+    ids = [f"faq:{i}" for i in range(5)]
+
+    upsert_vectors(collection, ids, vectors(5), ["doc"] * 5, [{"type": "faq"}] * 5, batch_size=2)
+
+    assert collection.calls == 3
+    assert len(collection.rows["faq:0"][0]) == 8
+
+
+def test_compact_upsert_writes_reduced_vectors_and_sidecar(tmp_path):
+    collection = FakeCollection()
+    codec = CompactCodec(pca_dim=4)
+    store = FullPrecisionStore(str(tmp_path))
+    ids = [f"product:{i}" for i in range(10)]
+    full = vectors(10)
+
+    upsert_vectors(collection, ids, full, ["doc"] * 10, [{"type": "product"}] * 10, compact=(codec, store))
+
+    assert len(collection.rows["product:3"][0]) == 4
+    assert store.load().ids == ids
+    np.testing.assert_allclose(store.vectors_for(["product:3"])[0], full[3], rtol=1e-6)
+
+
+def test_later_writers_append_to_the_same_index(tmp_path):
+    upsert_vectors(
+        FakeCollection(), ["product:0", "product:1"], vectors(2), ["a", "b"], [{}, {}],
+        compact=(CompactCodec(pca_dim=0), FullPrecisionStore(str(tmp_path))),
+    )
+
+    compact = load_compact_writer(str(tmp_path))
+    collection = FakeCollection()
+    upsert_vectors(collection, ["video:0:0"], vectors(1, seed=1), ["transcript"], [{}], compact=compact)
+
+    assert FullPrecisionStore(str(tmp_path), dim=8).load().ids == ["product:0", "product:1", "video:0:0"]
+    assert load_compact_writer(str(tmp_path / "missing")) is None
@@ -0,0 +1,58 @@
+import time
+
+from backend.agents import executor
+from backend.agents.executor import execute_task, merge_results, run_plan
+from backend.agents.planner import plan_user_request
+from scripts.run_eval_suite import EXPECTED_TYPES
+
+
+def test_merge_keeps_escalation_and_needs_human():
+    results = [
+        {"type": "final", "reply": "Returns are accepted within 30 days.", "sources": []},
+        {"type": "escalation", "reply": "Connecting you to a human support agent now.", "needs_human": True},
+    ]
+
+    reply, sources, response_type, needs_human = merge_results(results)
+
+    assert reply == "Returns are accepted within 30 days. Connecting you to a human support agent now."
+    assert sources == []
+    assert response_type == "escalation"
+    assert needs_human is True
+
+
+def test_merge_without_escalation_is_final():
+    _, _, response_type, needs_human = merge_results([{"type": "final", "reply": "ok"}, None])
+
+    assert response_type == "final"
+    assert needs_human is False
+
+
+def test_escalation_plan_passes_eval_matcher():
+    response = execute_task(
+        db=None,
+        task={"task": "agent", "args": {"transcript": "I want to talk to a human"}},
+        session_id="test-escalation",
+        run_id="run-escalation",
+    )
+
+    assert response["type"] == "escalation"
+    assert response["needs_human"] is True
+    assert EXPECTED_TYPES["escalation"](response)
+
+
+def test_multi_intent_plan_runs_concurrently_in_plan_order(monkeypatch):
+    delays = {"order_query": 0.2, "policy_query": 0.1, "faq_query": 0.0}
+
+    def fake_execute_task(db, task, *args, **kwargs):
+        time.sleep(delays[task["task"]])
+        return {"type": "final", "reply": task["task"], "sources": []}
+
+    monkeypatch.setattr(executor, "execute_task", fake_execute_task)
+    plan = plan_user_request("shipping time and return policy for order 1002", "s1", db=None)
+
+    start = time.perf_counter()
+    results = run_plan(plan, "s1")
+    elapsed = time.perf_counter() - start
+
+    assert [r["reply"] for r in results] == ["order_query", "policy_query", "faq_query"]
+    assert elapsed < 0.3
@@ -0,0 +1,32 @@
+from backend.rag.index_settings import DEFAULT_SETTINGS, apply_runtime_settings
+
+
+class FakeCollection:
+    def __init__(self, name, search_ef=10):
+        self.name = name
+        self.metadata = {"hnsw:search_ef": search_ef}
+        self.modified = []
+
+    def modify(self, configuration):
+        # Newer Chroma: configuration changes, metadata does not
+        self.modified.append(configuration["hnsw"]["ef_search"])
+
+
+def test_ef_search_is_written_once_per_value():
+    collection = FakeCollection("test_once")
+    settings = {**DEFAULT_SETTINGS, "ef_search": 64}
+
+    for _ in range(3):
+        apply_runtime_settings(collection, settings)
+    assert collection.modified == [64]
+
+    apply_runtime_settings(collection, {**settings, "ef_search": 128})
+    assert collection.modified == [64, 128]
+
+
+def test_creation_value_needs_no_write():
+    collection = FakeCollection("test_created", search_ef=32)
+
+    apply_runtime_settings(collection, {**DEFAULT_SETTINGS, "ef_search": 32})
+
+    assert collection.modified == []
@@ -0,0 +1,75 @@
+import time
+
+from backend.agents.intent_router import NOT_READY, IntentRouter
+
+EXAMPLES = {
+    "faq_query": ["how long does shipping take", "shipping charges"],
+    "escalation_query": ["talk to someone", "let me talk to a person"],
+}
+
+
+class FakeEmbeddings:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("embedding backend down")
+        return [self.vector(t) for t in texts]
+
+    @staticmethod
+    def vector(text):
+        return [1.0 if "ship" in text else 0.0, 1.0 if "talk" in text else 0.0, 0.1]
+
+
+def wait_ready(router, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not router.ready and time.monotonic() < end:
+        time.sleep(0.01)
+    return router.ready
+
+
+def test_not_ready_answers_without_blocking():
+    embeddings = FakeEmbeddings(delay=0.3)
+    router = IntentRouter(embeddings.embed_documents, examples=EXAMPLES)
+
+    start = time.perf_counter()
+    routed = router.classify(FakeEmbeddings.vector("talk to a human"))
+
+    assert routed == NOT_READY
+    assert not routed.ready and routed.intent == "rag_query"
+    assert time.perf_counter() - start < 0.1
+    assert wait_ready(router)
+
+
+def test_centroids_built_with_one_batched_call():
+    embeddings = FakeEmbeddings()
+    router = IntentRouter(embeddings.embed_documents, examples=EXAMPLES)
+
+    assert router.warm_up()
+    assert wait_ready(router)
+    assert not router.warm_up()
+
+    assert len(embeddings.calls) == 1
+    assert len(embeddings.calls[0]) == 4
+    assert sorted(router.intents) == ["escalation_query", "faq_query"]
+
+    routed = router.classify(FakeEmbeddings.vector("can i talk to someone"))
+    assert routed.ready and routed.accepted
+    assert routed.intent == "escalation_query"
+
+
+def test_failed_build_backs_off():
+    embeddings = FakeEmbeddings(fail=True)
+    router = IntentRouter(embeddings.embed_documents, examples=EXAMPLES)
+
+    assert router.warm_up()
+    time.sleep(0.1)
+
+    assert router.classify([0.0, 1.0, 0.0]) == NOT_READY
+    assert not router.warm_up()
+    assert len(embeddings.calls) == 1
@@ -0,0 +1,79 @@
+import pytest
+
+from backend.agents.planner import extract_order_id, match_intents, plan_user_request
+
+
+@pytest.mark.parametrize("transcript, order_id", [
+    ("Where is my order ORD-1002", "ORD-1002"),
+    ("where is my order ord 1 0 0 2", "ORD-1002"),
+    ("track order 12345", "ORD-12345"),
+])
+def test_order_id_slot(transcript, order_id):
+    match = match_intents(transcript)
+
+    assert match.intents == ["order_query"]
+    assert match.slots["order_id"] == order_id
+    assert extract_order_id(transcript) == order_id
+
+
+def test_price_slot_does_not_become_an_order():
+    match = match_intents("Shirt under 500 rupees")
+
+    assert match.slots == {"max_price": 500}
+    assert match.intents == []
+
+
+def test_no_digits_no_slots():
+    match = match_intents("Show me a blue shirt!")
+
+    assert match.slots == {}
+    assert match.intents == []
+    assert match.text == "show me a blue shirt"
+    assert "shirt" in match.tokens
+
+
+@pytest.mark.parametrize("transcript, intent", [
+    ("I want to talk to a human", "escalation_query"),
+    ("What is your return policy", "policy_query"),
+    ("Any refunds for damaged items", "policy_query"),
+    ("How long does delivery take", "faq_query"),
+    ("Show similar products", "graph_similar_products"),
+])
+def test_keyword_intents(transcript, intent):
+    assert match_intents(transcript).intents == [intent]
+
+
+def test_multi_intent_in_rule_priority_order():
+    match = match_intents("What is the shipping time and the return policy for order 1002")
+
+    assert match.intents == ["order_query", "policy_query", "faq_query"]
+    assert match.slots["order_id"] == "ORD-1002"
+
+
+def test_plan_defaults_to_rag():
+    plan = plan_user_request("show me linen shirts", "s1", db=None)
+
+    assert plan == [{
+        "id": "t0",
+        "task": "rag_query",
+        "args": {"query": "show me linen shirts"},
+    }]
+
+
+def test_plan_one_task_per_intent():
+    transcript = "return policy and similar alternatives"
+    plan = plan_user_request(transcript, "s1", db=None)
+
+    assert [(t["id"], t["task"]) for t in plan] == [("t0", "policy_query"), ("t1", "graph_similar_products")]
+    assert plan[0]["args"] == {"query": transcript}
+    assert plan[1]["args"] == {}
+
+
+def test_plan_reuses_precomputed_match():
+    match = match_intents("where is my order 1002")
+    match = match._replace(intents=["order_query", "escalation_query"])
+
+    plan = plan_user_request("where is my order 1002", "s1", db=None, match=match)
+
+    assert [t["task"] for t in plan] == ["order_query", "escalation_query"]
+    assert plan[0]["args"] == {"order_id": "ORD-1002"}
@@ -0,0 +1,125 @@
+from backend.agents import prompt_budget
+from backend.agents.prompt_budget import (
+    assemble_prompt,
+    compact_history,
+    count_tokens,
+    pack_documents,
+    rank_documents,
+    truncate_to_tokens,
+)
+
+
+class Doc:
+    def __init__(self, page_content):
+        self.page_content = page_content
+
+    def __repr__(self):
+        return f"Doc({self.page_content[:20]!r})"
+
+
+def words(prefix, n):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def test_truncate_keeps_a_prefix_within_budget():
+    text = words("token", 100)
+
+    cut = truncate_to_tokens(text, 20)
+    assert text.startswith(cut)
+    assert 0 < count_tokens(cut) <= 20
+
+    assert truncate_to_tokens(text, count_tokens(text)) == text
+    assert truncate_to_tokens(text, 0) == ""
+    assert count_tokens("") == 0
+
+
+def test_rank_prefers_query_overlap_and_drops_duplicates():
+    generic = Doc("We sell shirts, trousers and jackets.")
+    returns = Doc("Return policy: items can be returned within 30 days.")
+    duplicate = Doc("Return policy: items can be returned within 30 days.")
+    empty = Doc("   ")
+
+    ranked = rank_documents("what is your return policy", [generic, empty, returns, duplicate])
+
+    assert ranked == [returns, generic]
+
+
+def test_rank_keeps_retrieval_order_without_overlap():
+    docs = [Doc("first"), Doc("second"), Doc("third")]
+    assert rank_documents("the", docs) == docs
+
+
+def test_pack_truncates_the_last_document_that_fits_partially():
+    first, second = Doc(words("a", 20)), Doc(words("b", 200))
+    budget = count_tokens(first.page_content) + 1 + 50
+
+    context, used = pack_documents([first, second], budget)
+
+    head, tail = context.split("\n")
+    assert head == first.page_content
+    assert second.page_content.startswith(tail)
+    assert count_tokens(tail) <= 49
+    assert used == [first, second]
+
+
+def test_pack_skips_a_document_when_too_little_budget_remains():
+    first, second = Doc(words("a", 20)), Doc(words("b", 200))
+    budget = count_tokens(first.page_content) + 1 + prompt_budget.PROMPT_MIN_DOC_TOKENS - 1
+
+    context, used = pack_documents([first, second], budget)
+
+    assert context == first.page_content
+    assert used == [first]
+
+
+def test_history_keeps_recent_turns_and_summarizes_older(monkeypatch):
+    monkeypatch.setattr(prompt_budget, "PROMPT_RECENT_TURNS", 2)
+    history = [
+        {"role": "user", "content": "Do you have linen shirts? I need two."},
+        {"role": "assistant", "content": "Yes, in white and blue."},
+        {"user": "What about delivery to Pune"},
+        {"assistant": "Three to five days."},
+        {"role": "user", "content": "Can I return them"},
+        {"role": "assistant", "content": "Within 30 days."},
+    ]
+
+    text = compact_history(history, 200)
+
+    assert text.split("\n") == [
+        "Earlier: user asked about Do you have linen shirts; What about delivery to Pune",
+        "User: Can I return them",
+        "Assistant: Within 30 days.",
+    ]
+
+
+def test_history_budget_is_respected():
+    history = [f"User: question {i} " + words("w", 20) for i in range(10)]
+
+    text = compact_history(history, 40)
+
+    assert count_tokens(text) + text.count("\n") <= 40
+    assert text.endswith(history[-1])
+    assert compact_history(history, 0) == ""
+
+
+def test_assembled_prompt_fits_budget():
+    docs = [Doc(f"Product {i}: " + words("spec", 150)) for i in range(10)]
+    history = [f"User: turn {i} " + words("h", 30) for i in range(8)]
+
+    assembled = assemble_prompt("You are a shop assistant.", "linen shirt price", docs, history, budget=600)
+
+    assert assembled.tokens <= 600
+    assert 0 < len(assembled.docs) < len(docs)
+    assert assembled.history and assembled.history in assembled.prompt
+    assert assembled.tokens_saved > 0
+
+
+def test_small_prompt_is_unchanged():
+    docs = [Doc("Linen shirt, Rs. 1299."), Doc("Cotton shirt, Rs. 799.")]
+
+    assembled = assemble_prompt("System.", "linen shirt price", docs, budget=1500)
+
+    assert assembled.docs == docs
+    assert assembled.context == "Linen shirt, Rs. 1299.\nCotton shirt, Rs. 799."
+    assert assembled.history == ""
+    assert assembled.tokens_saved == 0
@@ -0,0 +1,37 @@
+from backend.rag.rag import handle_rag
+
+PRODUCTS = {
+    "ids": ["product:1", "product:2"],
+    "documents": ["blue linen shirt, sizes m and l", "red cotton shirt"],
+    "metadatas": [{"type": "product", "product_id": 1}, {"type": "product", "product_id": 2}],
+    "distances": [0.12, 0.3],
+}
+
+
+def transcripts(*distances):
+    return {
+        "ids": [f"video:0:{i}" for i in range(len(distances))],
+        "documents": [f"transcript {i}" for i in range(len(distances))],
+        "metadatas": [{"type": "video_transcript", "segment_index": i} for i in range(len(distances))],
+        "distances": list(distances),
+    }
+
+
+def test_product_query_without_relevant_transcript():
+    retrieval = {"product": PRODUCTS, "video_transcript": transcripts(0.8, 0.95)}
+
+    resp = handle_rag("blue linen shirt", "s1", retrieval=retrieval)
+
+    assert resp["reply"] == "blue linen shirt, sizes m and l"
+    assert [s["metadata"]["type"] for s in resp["sources"]] == ["product"]
+
+
+def test_close_transcripts_are_attached():
+    retrieval = {"product": PRODUCTS, "video_transcript": transcripts(0.2, 0.9)}
+
+    resp = handle_rag("blue linen shirt", "s1", retrieval=retrieval)
+
+    assert [s["page_content"] for s in resp["sources"]] == [
+        "blue linen shirt, sizes m and l",
+        "transcript 0",
+    ]
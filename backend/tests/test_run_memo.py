@@ -0,0 +1,56 @@
+import pytest
+
+from backend.agents import agent_runner
+from backend.agents.run_memo import RUN_MEMO, RunMemo, memoized, owned_run, run_scope
+
+
+def test_memo_serves_second_call_and_skips_exceptions():
+    memo = RunMemo()
+    calls = []
+
+    def fn(x):
+        calls.append(x)
+        return x * 2
+
+    assert memo.get_or_call("r1", "tool", 1, fn, 1) == 2
+    assert memo.get_or_call("r1", "tool", 1, fn, 1) == 2
+    assert calls == [1]
+
+    def down():
+        raise ValueError("backend down")
+
+    with pytest.raises(ValueError):
+        memo.get_or_call("r1", "tool", 2, down)
+    assert memo.get_or_call("r1", "tool", 2, fn, 2) == 4
+    assert memo.finish("r1") == 1
+
+
+def test_owned_run_drops_memo_when_the_run_raises():
+    with pytest.raises(RuntimeError):
+        with owned_run("run-raises"), run_scope("run-raises"):
+            memoized("tool", "k", lambda: "value")
+            raise RuntimeError("tool failed")
+
+    assert "run-raises" not in RUN_MEMO._runs
+
+
+def test_failed_agent_pass_releases_memo(monkeypatch):
+    monkeypatch.setattr(agent_runner, "record_mcp_call", lambda **kwargs: None)
+
+    def execute_fn(run_id, **kwargs):
+        with run_scope(run_id):
+            memoized("retrieval", "q", lambda: ["doc"])
+            raise TimeoutError("vector store down")
+
+    with pytest.raises(TimeoutError):
+        agent_runner.run_with_evaluation(
+            execute_fn=execute_fn,
+            db=None,
+            transcript="linen shirts",
+            session_id="s1",
+            ground_truth="We have linen shirts.",
+            run_id="run-failed",
+            eval_mode="async",
+        )
+
+    assert "run-failed" not in RUN_MEMO._runs
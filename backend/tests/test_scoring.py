@@ -0,0 +1,78 @@
+import math
+import random
+
+import pytest
+
+from backend.agents.scoring import (
+    corpus_bleu,
+    lcs_length,
+    score_batch,
+    score_pair,
+    sentence_bleu,
+    sentence_rouge_l,
+    tokenize_13a,
+    tokenize_rouge,
+)
+
+PRED = "the cat sat on the mat"
+REF = "the cat is on the mat"
+
+
+def dp_lcs(a, b):
+    prev = [0] * (len(b) + 1)
+    for x in a:
+        cur = [0]
+        for j, y in enumerate(b):
+            cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+        prev = cur
+    return prev[-1]
+
+
+def test_tokenizers():
+    assert tokenize_13a("Hello, world. It costs 3.50!") == [
+        "Hello", ",", "world", ".", "It", "costs", "3.50", "!",
+    ]
+    assert tokenize_rouge("Hello, World! ORD-1002") == ["hello", "world", "ord", "1002"]
+
+
+def test_identical_strings_score_one():
+    assert score_pair(PRED, PRED) == {"bleu": 1.0, "rougeL": 1.0}
+
+
+def test_bleu_reference_values():
+    # 1-gram 5/6, 2-gram 3/5, 3-gram 1/4, 4-gram 0/3: no smoothing -> 0
+    assert sentence_bleu(PRED, REF) == 0.0
+    assert sentence_bleu(PRED, REF, max_order=2) == pytest.approx(math.sqrt(5 / 6 * 3 / 5))
+
+    # Perfect precision, brevity penalty exp(1 - 6/2)
+    assert sentence_bleu("the cat", REF, max_order=2) == pytest.approx(math.exp(-2))
+
+
+def test_corpus_bleu_pools_counts():
+    assert corpus_bleu(["hello there general kenobi", "foo bar foobar"],
+                       [["hello there general kenobi", "hello there !"], ["foo bar foobar"]]) == 1.0
+    assert corpus_bleu([PRED], [[REF]]) == sentence_bleu(PRED, REF)
+
+
+def test_rouge_l_reference_values():
+    # LCS "the cat on the mat" = 5 of 6 tokens each side
+    assert sentence_rouge_l(PRED, REF) == pytest.approx(5 / 6)
+    # P = 1, R = 2/6
+    assert sentence_rouge_l("the cat", REF) == pytest.approx(0.5)
+    assert sentence_rouge_l("", REF) == 0.0
+
+
+def test_bit_parallel_lcs_matches_dynamic_programming():
+    rng = random.Random(0)
+    vocab = list("abcde")
+    for _ in range(200):
+        a = [rng.choice(vocab) for _ in range(rng.randint(0, 80))]
+        b = [rng.choice(vocab) for _ in range(rng.randint(0, 80))]
+        assert lcs_length(a, b) == dp_lcs(a, b)
+
+
+def test_score_batch_matches_single_pairs():
+    pairs = [(PRED, REF), ("the cat", REF), (REF, REF), ("", REF)]
+
+    assert score_batch(pairs) == [score_pair(p, r) for p, r in pairs]
+    assert score_batch(pairs)[0] == {"bleu": 0.0, "rougeL": 0.8333}
@@ -0,0 +1,57 @@
+from backend.audio.sentence_buffer import SentenceBuffer
+
+
+def stream(buffer, text, size=3):
+    """
+    Push `text` in small chunks like an LLM token stream.
+    """
+    out = []
+    for i in range(0, len(text), size):
+        out.extend(buffer.push(text[i:i + size]))
+    return out
+
+
+def test_sentence_is_emitted_once_followed_by_whitespace():
+    buffer = SentenceBuffer(min_chars=1)
+
+    assert buffer.push("This linen shirt is in stock.") == []
+    assert buffer.push(" It ") == ["This linen shirt is in stock."]
+    assert buffer.flush() == "It"
+    assert buffer.flush() is None
+
+
+def test_decimals_and_abbreviations_do_not_split():
+    buffer = SentenceBuffer(min_chars=1)
+    text = "It costs Rs. 1,299.00 or 2.5 times less, e.g. on sale! Anything else? "
+
+    assert stream(buffer, text) == [
+        "It costs Rs. 1,299.00 or 2.5 times less, e.g. on sale!",
+        "Anything else?",
+    ]
+    assert buffer.flush() is None
+
+
+def test_short_sentences_merge_with_the_next():
+    buffer = SentenceBuffer(min_chars=20)
+
+    assert stream(buffer, "Yes. We have it in blue and black. Sure. ") == [
+        "Yes. We have it in blue and black.",
+    ]
+    assert buffer.flush() == "Sure."
+
+
+def test_closing_quotes_stay_with_the_sentence():
+    buffer = SentenceBuffer(min_chars=1)
+
+    assert stream(buffer, 'The tag says "final sale!" Returns are not accepted.\n') == [
+        'The tag says "final sale!"',
+        "Returns are not accepted.",
+    ]
+
+
+def test_flush_returns_unterminated_tail():
+    buffer = SentenceBuffer()
+
+    assert stream(buffer, "Delivery takes three to five working days") == []
+    assert buffer.flush() == "Delivery takes three to five working days"
+    assert buffer.push("") == []
@@ -0,0 +1,105 @@
+import time
+
+from backend.memory import session_store
+from backend.memory.session_store import (
+    LocalSessionStore,
+    RedisError,
+    RedisSessionStore,
+    make_session_store,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def _check(self):
+        if self.down:
+            raise RedisError("connection refused")
+
+    def ping(self):
+        self._check()
+        return True
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self._check()
+        self.data[key] = value
+
+    def delete(self, key):
+        self._check()
+        self.data.pop(key, None)
+
+
+def test_ttl_expires_sessions():
+    store = LocalSessionStore(ttl=0.05)
+    store.set("s1", {"last_product_id": 7})
+    assert store.get("s1") == {"last_product_id": 7}
+
+    time.sleep(0.1)
+    assert store.get("s1") == {}
+    assert len(store) == 0
+
+
+def test_lru_evicts_least_recently_used():
+    store = LocalSessionStore(max_sessions=2)
+    store.set("s1", {"last_product_id": 1})
+    store.set("s2", {"last_product_id": 2})
+    store.get("s1")
+    store.set("s3", {"last_product_id": 3})
+
+    assert len(store) == 2
+    assert store.get("s2") == {}
+    assert store.get("s1") == {"last_product_id": 1}
+    assert store.get("s3") == {"last_product_id": 3}
+
+
+def test_records_are_compact_copies():
+    store = LocalSessionStore()
+    store.set("s1", {"last_product_id": 5, "scratch": "x", "other": None})
+
+    state = store.get("s1")
+    assert state == {"last_product_id": 5}
+
+    state["last_product_id"] = 9
+    assert store.get("s1") == {"last_product_id": 5}
+
+
+def test_update_writes_only_given_fields():
+    store = LocalSessionStore()
+    store.set("s1", {"last_product_id": 1})
+    stale = store.get("s1")
+
+    store.update("s1", last_product_id=2)
+
+    assert stale == {"last_product_id": 1}
+    assert store.get("s1") == {"last_product_id": 2}
+
+
+def test_redis_errors_fall_back_to_local_store():
+    client = FakeRedis()
+    store = RedisSessionStore(client)
+    store.set("s1", {"last_product_id": 1})
+    assert store.get("s1") == {"last_product_id": 1}
+
+    client.down = True
+    store.update("s1", last_product_id=2)
+    assert store.get("s1") == {"last_product_id": 2}
+
+    store.delete("s1")
+    assert store.get("s1") == {}
+
+
+def test_unreachable_redis_at_startup_uses_local_store(monkeypatch):
+    client = FakeRedis()
+    client.down = True
+    monkeypatch.setattr(session_store, "redis_from_env", lambda: client)
+
+    assert isinstance(make_session_store("redis"), LocalSessionStore)
+
+    client.down = False
+    assert isinstance(make_session_store("redis"), RedisSessionStore)
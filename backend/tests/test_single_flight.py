@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from prometheus_client import REGISTRY
+
+from backend.core.single_flight import SingleFlight, fingerprint
+
+CALLERS = 8
+
+
+def wait_coalesced(name, n, timeout=2.0):
+    """
+    Block until `n` callers of SingleFlight(name) are waiting on a leader.
+    """
+    end = time.monotonic() + timeout
+    labels = {"call": name, "role": "coalesced"}
+    while (REGISTRY.get_sample_value("single_flight_calls_total", labels) or 0) < n:
+        assert time.monotonic() < end, "callers did not coalesce"
+        time.sleep(0.005)
+
+
+def test_leader_runs_once_and_waiters_share_result():
+    flight = SingleFlight("test_leader")
+    release = threading.Event()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(2)
+        return {"answer": 42}
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+        futures = [pool.submit(flight.do, "k", fn) for _ in range(CALLERS)]
+        wait_coalesced("test_leader", CALLERS - 1)
+        release.set()
+        results = [f.result(timeout=2) for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight("test_error")
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(2)
+        raise ValueError("backend down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "k", fn)
+        started.wait(2)
+        waiter = pool.submit(flight.do, "k", lambda: "not called")
+        wait_coalesced("test_error", 1)
+        release.set()
+
+        with pytest.raises(ValueError):
+            leader.result(timeout=2)
+        with pytest.raises(ValueError):
+            waiter.result(timeout=2)
+
+    # Errors are not cached: the next call runs again
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+
+def test_different_keys_do_not_coalesce():
+    flight = SingleFlight("test")
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+
+
+def test_fingerprint_normalizes_text_unless_exact():
+    assert fingerprint("What is your  Return policy") == fingerprint("what is your return policy")
+    assert fingerprint({"b": 1, "a": [" X "]}) == fingerprint({"a": ["x"], "b": 1})
+
+    messages = [{"role": "user", "content": "Say YES"}]
+    lowered = [{"role": "user", "content": "say yes"}]
+    assert fingerprint(messages, normalize=False) != fingerprint(lowered, normalize=False)
+    assert fingerprint(messages, normalize=False) == fingerprint(list(messages), normalize=False)
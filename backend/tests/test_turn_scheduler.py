@@ -0,0 +1,107 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from backend.core.turn_scheduler import SessionTurnScheduler
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_turns_for_one_session_run_in_arrival_order():
+    scheduler = SessionTurnScheduler(max_concurrency=4)
+    order = []
+
+    def turn(i):
+        # Earlier turns sleep longer; without a lane they would finish last
+        time.sleep(0.01 * (5 - i))
+        order.append(i)
+        return i
+
+    futures = [scheduler.submit("s1", turn, i) for i in range(5)]
+
+    assert [f.result(timeout=2) for f in futures] == list(range(5))
+    assert order == list(range(5))
+
+
+def test_sessions_run_concurrently():
+    scheduler = SessionTurnScheduler(max_concurrency=2)
+    started = threading.Barrier(2, timeout=2)
+
+    # Each turn waits for the other session's turn to start
+    a = scheduler.submit("a", started.wait)
+    b = scheduler.submit("b", started.wait)
+
+    a.result(timeout=2)
+    b.result(timeout=2)
+
+
+def test_busy_session_does_not_starve_others():
+    scheduler = SessionTurnScheduler(max_concurrency=1)
+    order = []
+
+    def turn(name):
+        time.sleep(0.01)
+        order.append(name)
+
+    futures = [scheduler.submit("busy", turn, f"busy{i}") for i in range(3)]
+    futures.append(scheduler.submit("quiet", turn, "quiet"))
+    for f in futures:
+        f.result(timeout=2)
+
+    assert order.index("quiet") < order.index("busy2")
+
+
+def test_failed_turn_does_not_block_the_lane():
+    scheduler = SessionTurnScheduler(max_concurrency=1)
+
+    def boom():
+        raise ValueError("turn failed")
+
+    failed = scheduler.submit("s1", boom)
+    ok = scheduler.submit("s1", lambda: "next")
+
+    with pytest.raises(ValueError):
+        failed.result(timeout=2)
+    assert ok.result(timeout=2) == "next"
+
+
+def test_cancelled_turn_is_skipped():
+    scheduler = SessionTurnScheduler(max_concurrency=1)
+    release = threading.Event()
+    ran = []
+
+    first = scheduler.submit("s1", release.wait, 2)
+    skipped = scheduler.submit("s1", ran.append, "skipped")
+    last = scheduler.submit("s1", ran.append, "last")
+
+    assert skipped.cancel()
+    release.set()
+
+    first.result(timeout=2)
+    last.result(timeout=2)
+    assert ran == ["last"]
+
+
+def test_run_awaits_and_keeps_caller_context():
+    scheduler = SessionTurnScheduler(max_concurrency=2)
+
+    async def main():
+        request_id.set("req-1")
+        return await scheduler.run("s1", request_id.get)
+
+    assert asyncio.run(main()) == "req-1"
+
+
+def test_idle_lanes_are_collected():
+    scheduler = SessionTurnScheduler(max_concurrency=1, idle_seconds=0.05)
+    scheduler.submit("old", lambda: None).result(timeout=2)
+    assert "old" in scheduler._lanes
+
+    time.sleep(0.1)
+    scheduler.submit("new", lambda: None).result(timeout=2)
+
+    assert "old" not in scheduler._lanes
+    assert "new" in scheduler._lanes
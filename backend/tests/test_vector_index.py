@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from backend.rag.vector_index import ChromaVectorIndex, NumpyVectorIndex, build_numpy_index
+
+IDS = ["product:1", "product:2", "video:1", "faq:1"]
+TYPES = ["product", "product", "video_transcript", "faq"]
+# Not unit length: squared L2 and cosine rank these differently
+VECTORS = np.array([
+    [3.0, 0.0, 0.0],
+    [0.9, 0.5, 0.0],
+    [0.0, 2.0, 0.0],
+    [0.0, 0.0, 1.0],
+], dtype=np.float32)
+
+
+class FakeCollection:
+    """
+    Chroma collection with the default "l2" space: query() returns
+    squared L2 distances.
+    """
+
+    def count(self):
+        return len(IDS)
+
+    def get(self, include):
+        return {
+            "ids": IDS,
+            "embeddings": VECTORS.tolist(),
+            "documents": [f"doc {i}" for i in IDS],
+            "metadatas": [{"type": t} for t in TYPES],
+        }
+
+    def query(self, query_embeddings, n_results, include, where=None):
+        q = np.asarray(query_embeddings[0], dtype=np.float32)
+        types = [where["type"]] if where and isinstance(where["type"], str) else (
+            where["type"]["$in"] if where else TYPES
+        )
+        rows = [i for i, t in enumerate(TYPES) if t in types]
+        rows.sort(key=lambda i: float(((VECTORS[i] - q) ** 2).sum()))
+        rows = rows[:n_results]
+        return {
+            "ids": [[IDS[i] for i in rows]],
+            "documents": [[f"doc {IDS[i]}" for i in rows]],
+            "metadatas": [[{"type": TYPES[i]} for i in rows]],
+            "distances": [[float(((VECTORS[i] - q) ** 2).sum()) for i in rows]],
+            "embeddings": [VECTORS[rows]],
+        }
+
+
+class FakeVectorstore:
+    def __init__(self):
+        self._collection = FakeCollection()
+        self._embedding_function = None
+
+
+def cosine_distance(a, b):
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    return 1.0 - float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_chroma_distances_are_cosine():
+    index = ChromaVectorIndex(FakeVectorstore())
+    query = [1.0, 0.2, 0.0]
+
+    out = index.query(embedding=query, k=4)
+
+    assert out["ids"][:2] == ["product:1", "product:2"]
+    for rid, distance in zip(out["ids"], out["distances"]):
+        assert distance == pytest.approx(cosine_distance(VECTORS[IDS.index(rid)], query), abs=1e-6)
+    assert out["distances"] == sorted(out["distances"])
+
+
+def test_backends_agree_on_distances(tmp_path):
+    chroma = ChromaVectorIndex(FakeVectorstore())
+    build_numpy_index(FakeVectorstore(), index_dir=str(tmp_path))
+    numpy_index = NumpyVectorIndex(str(tmp_path), embeddings=None)
+    query = [0.5, 1.0, 0.1]
+
+    # k covers every row: Chroma still picks candidates in its own space
+    for doc_type in ("product", ("product", "video_transcript"), None):
+        a = chroma.query(embedding=query, k=len(IDS), doc_type=doc_type)
+        b = numpy_index.query(embedding=query, k=len(IDS), doc_type=doc_type)
+        assert a["ids"] == b["ids"]
+        assert a["distances"] == pytest.approx(b["distances"], abs=1e-6)
+
+
+def test_empty_chroma_result():
+    class Empty(FakeCollection):
+        def query(self, **kwargs):
+            return {"ids": [[]], "documents": [[]], "metadatas": [[]], "embeddings": [[]]}
+
+    store = FakeVectorstore()
+    store._collection = Empty()
+
+    assert ChromaVectorIndex(store).query(embedding=[1.0, 0.0, 0.0], doc_type="faq")["ids"] == []
@@ -0,0 +1,150 @@
+"""
+Benchmark the pooled OpenAI clients against a client-per-call baseline
+
+Runs against scripts/mock_openai_server.py (started in-process):
+- baseline: new OpenAI(...) per call, as openai_chat used to do
+- pooled:   openai_chat() on the shared keep-alive client
+- async:    aopenai_chat() with --concurrency requests in flight
+- burst:    --concurrency identical openai_chat() calls at once; with
+            single-flight the server sees one request
+- retries:  a second mock that fails every 3rd request with 503
+
+Reports per-call latency, TCP connections the server accepted, and
+whether every request carried its own Helicone-Property-Session header.
+
+Usage:
+    python -m scripts.bench_llm_client --calls 200 --latency-ms 5
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from scripts.mock_openai_server import serve
+
+MESSAGES = [{"role": "user", "content": "Do you have linen shirts?"}]
+
+
+def _stats(latencies):
+    latencies = sorted(latencies)
+    return {
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+    }
+
+
+def _delta(state, before):
+    after = state.snapshot()
+    return {
+        "requests": after["requests"] - before["requests"],
+        "connections": after["connections"] - before["connections"],
+    }
+
+
+def main(calls: int, latency_ms: float, concurrency: int):
+    server, state, base_url = serve(latency_ms=latency_ms)
+    # llm_client reads the gateway URL at import
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+
+    from openai import OpenAI
+    from backend.core.llm_client import (
+        HELICONE_HEADERS,
+        LLMClientManager,
+        aopenai_chat,
+        openai_chat,
+        with_retries,
+    )
+
+    report = {"calls": calls, "server_latency_ms": latency_ms}
+
+    # Baseline: client per call
+    before = state.snapshot()
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        client = OpenAI(
+            api_key=os.environ["OPENAI_API_KEY"],
+            base_url=base_url,
+            default_headers={**HELICONE_HEADERS, "Helicone-Property-Session": f"base-{i}"},
+        )
+        client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES)
+        latencies.append(time.perf_counter() - start)
+    report["baseline"] = {**_stats(latencies), **_delta(state, before)}
+
+    # Pooled sync client, per-request session header
+    before = state.snapshot()
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        openai_chat(MESSAGES, session_id=f"pooled-{i % 4}")
+        latencies.append(time.perf_counter() - start)
+    report["pooled"] = {**_stats(latencies), **_delta(state, before)}
+
+    # Async client
+    async def run_async():
+        sem = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one(i):
+            async with sem:
+                start = time.perf_counter()
+                await aopenai_chat(MESSAGES, session_id=f"async-{i % 4}")
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        return latencies, time.perf_counter() - start
+
+    before = state.snapshot()
+    latencies, wall = asyncio.run(run_async())
+    report["async"] = {
+        **_stats(latencies),
+        **_delta(state, before),
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+    }
+
+    sessions = state.snapshot()["sessions"]
+    report["session_headers_ok"] = (
+        all(sessions.get(f"pooled-{k}") == calls // 4 + (k < calls % 4) for k in range(4))
+        and all(sessions.get(f"async-{k}") == calls // 4 + (k < calls % 4) for k in range(4))
+    )
+
+    # Identical concurrent requests (single-flight)
+    before = state.snapshot()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda i: openai_chat(MESSAGES, session_id=f"burst-{i}"), range(concurrency)))
+    report["burst"] = {"callers": concurrency, **_delta(state, before)}
+
+    # Retries with jitter against a flaky server
+    flaky_server, flaky_state, flaky_url = serve(fail_every=3)
+    flaky = LLMClientManager(base_url=flaky_url)
+    ok = failed = 0
+    for i in range(min(calls, 30)):
+        try:
+            with_retries(flaky.sync.chat.completions.create, model="gpt-4o-mini", messages=MESSAGES)
+            ok += 1
+        except Exception:
+            failed += 1
+    report["retries"] = {"succeeded": ok, "failed": failed, **flaky_state.snapshot()}
+    report["retries"].pop("sessions")
+
+    flaky.close()
+    flaky_server.shutdown()
+    server.shutdown()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pooled vs per-call OpenAI clients")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    main(args.calls, args.latency_ms, args.concurrency)
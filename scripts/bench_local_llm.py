@@ -0,0 +1,96 @@
+"""
+Benchmark the shared local generation engine against per-call pipelines
+
+- baseline:  pipeline("text-generation") built on every call, as hf_chat
+             used to do (run for --baseline-calls prompts only; slow)
+- engine:    LocalGenerationEngine, one prompt at a time
+- batched:   same engine, --concurrency callers at once (micro-batching)
+- int8:      batched with dynamic int8 quantization (Conv1D -> Linear)
+
+Reports mean / p95 latency per prompt, throughput and, for int8, how
+many outputs match the fp32 engine exactly (greedy decoding).
+
+Usage:
+    python -m scripts.bench_local_llm --prompts 32 --concurrency 8 --max-new-tokens 32
+"""
+
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.core.config import HF_GEN_MODEL
+from backend.core.local_llm import LocalGenerationEngine
+
+TEST_CASES = "backend/tests/rag_test_cases.json"
+
+
+def load_prompts(n: int):
+    with open(TEST_CASES) as f:
+        inputs = [c["input"] for c in json.load(f)]
+    return [f"Customer: {inputs[i % len(inputs)]}\nAssistant:" for i in range(n)]
+
+
+def _summary(latencies, wall_s):
+    latencies = sorted(latencies)
+    return {
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+        "prompts_per_s": round(len(latencies) / wall_s, 2),
+    }
+
+
+def run_engine(engine, prompts, concurrency, max_new_tokens):
+    engine.pipe  # load outside the timing
+    engine.generate(prompts[0], max_new_tokens=max_new_tokens)  # warm-up
+
+    def one(prompt):
+        start = time.perf_counter()
+        out = engine.generate(prompt, max_new_tokens=max_new_tokens)
+        return time.perf_counter() - start, out
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, prompts))
+    wall_s = time.perf_counter() - start
+
+    return _summary([r[0] for r in results], wall_s), [r[1] for r in results]
+
+
+def main(n: int, concurrency: int, max_new_tokens: int, baseline_calls: int):
+    from transformers import pipeline
+
+    prompts = load_prompts(n)
+    report = {"model": HF_GEN_MODEL, "prompts": n, "max_new_tokens": max_new_tokens}
+
+    # Baseline: pipeline per call
+    latencies = []
+    start = time.perf_counter()
+    for prompt in prompts[:baseline_calls]:
+        t0 = time.perf_counter()
+        pipe = pipeline("text-generation", model=HF_GEN_MODEL)
+        pipe(prompt, max_new_tokens=max_new_tokens)
+        latencies.append(time.perf_counter() - t0)
+    report["baseline"] = _summary(latencies, time.perf_counter() - start)
+
+    engine = LocalGenerationEngine(quantize=None)
+    report["engine"], _ = run_engine(engine, prompts, 1, max_new_tokens)
+    report["batched"], fp32_out = run_engine(engine, prompts, concurrency, max_new_tokens)
+    report["batched"]["concurrency"] = concurrency
+
+    int8 = LocalGenerationEngine(quantize="int8")
+    report["int8"], int8_out = run_engine(int8, prompts, concurrency, max_new_tokens)
+    report["int8"]["same_output_as_fp32"] = sum(a == b for a, b in zip(fp32_out, int8_out)) / n
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HF generation: per-call pipeline vs shared engine")
+    parser.add_argument("--prompts", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--baseline-calls", type=int, default=3)
+    args = parser.parse_args()
+
+    main(args.prompts, args.concurrency, args.max_new_tokens, args.baseline_calls)
@@ -0,0 +1,123 @@
+"""
+Microbenchmark: compiled single-pass intent matcher vs the legacy chain
+
+Legacy = normalize_text (str.replace passes) + order-id regex + up to five
+substring scans in the planner, plus the executor re-tokenizing the same
+string for price / memory follow-up / ambiguity checks.
+
+Usage:
+    python -m scripts.bench_planner --repeat 20000
+"""
+
+import re
+import json
+import timeit
+import argparse
+
+from backend.agents.planner import match_intents, plan_user_request
+
+COLOR_WORDS = {"red", "blue", "green", "black", "white"}
+FABRIC_WORDS = {"cotton", "linen", "rayon"}
+FOLLOW_UP_PHRASES = {"it", "that", "same", "this"}
+
+# -----------------------------
+# Legacy chain (as it was before the compiled matcher)
+# -----------------------------
+
+def legacy_normalize_text(t: str) -> str:
+    return (
+        t.lower()
+         .replace("?", "")
+         .replace(".", "")
+         .replace("-", "")
+         .replace("on", "ord")
+    )
+
+def legacy_extract_order_id(text: str):
+    t = text.lower().replace("-", "").replace(" ", "")
+    m = re.search(r"(ord|order)?(\d{3,6})", t)
+    if m:
+        return f"ORD-{m.group(2)}"
+    return None
+
+def legacy_plan(transcript: str):
+    transcript_l = legacy_normalize_text(transcript)
+    order_id = legacy_extract_order_id(transcript_l)
+    if order_id:
+        return "order_query"
+    if any(k in transcript_l for k in ["human", "agent", "representative", "support"]):
+        return "escalation_query"
+    if any(k in transcript_l for k in ["return policy", "refund", "returns"]):
+        return "policy_query"
+    if any(k in transcript_l for k in ["delivery", "shipping"]):
+        return "faq_query"
+    if any(k in transcript_l for k in ["similar", "similar products", "alternatives", "compare"]):
+        return "graph_similar_products"
+    return "rag_query"
+
+def legacy_turn(transcript: str):
+    transcript = transcript.lower().strip()
+    # executor guards
+    re.search(r"(under|less than)\s+(\d+)", transcript)
+    any(p in transcript.split() for p in FOLLOW_UP_PHRASES)
+    any(c in transcript for c in COLOR_WORDS)
+    tokens = set(transcript.split())
+    tokens.intersection(COLOR_WORDS)
+    tokens.intersection(FABRIC_WORDS)
+    return legacy_plan(transcript)
+
+# -----------------------------
+# Compiled matcher
+# -----------------------------
+
+def compiled_turn(transcript: str):
+    transcript = transcript.lower().strip()
+    match = match_intents(transcript)
+    match.slots.get("max_price")
+    match.tokens.intersection(FOLLOW_UP_PHRASES)
+    match.tokens.intersection(COLOR_WORDS)
+    match.tokens.intersection(FABRIC_WORDS)
+    return plan_user_request(transcript, "bench", None, match=match)[0]["task"]
+
+
+def load_transcripts():
+    with open("backend/tests/rag_test_cases.json") as f:
+        cases = [c["input"] for c in json.load(f)]
+    with open("backend/tests/audio_test_map.json") as f:
+        cases += list(json.load(f).values())
+    return cases
+
+
+def main(repeat: int):
+    transcripts = load_transcripts()
+
+    def run(fn):
+        for t in transcripts:
+            fn(t)
+
+    results = {}
+    for name, fn in (("legacy", legacy_turn), ("compiled", compiled_turn)):
+        best = min(timeit.repeat(lambda: run(fn), number=repeat, repeat=5))
+        results[name] = {
+            "us_per_turn": round(best / (repeat * len(transcripts)) * 1e6, 3),
+        }
+    results["speedup"] = round(
+        results["legacy"]["us_per_turn"] / results["compiled"]["us_per_turn"], 2
+    )
+
+    disagreements = [
+        (t, legacy_turn(t), compiled_turn(t))
+        for t in transcripts
+        if legacy_turn(t) != compiled_turn(t)
+    ]
+    results["routing_disagreements"] = disagreements
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Planner intent matching microbenchmark")
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    main(args.repeat)
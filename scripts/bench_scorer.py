@@ -0,0 +1,125 @@
+"""
+Benchmark the native BLEU / ROUGE-L scorer against HF `evaluate`
+
+- Pairs: every (input, expected) and (expected, expected-variant) from
+  rag_test_cases.json + audio_test_map.json, plus random word shuffles
+- Checks max absolute difference per metric (sentence-level)
+- Times per-pair scoring for both implementations and one batch call
+
+`evaluate.load` needs the HF hub the first time. If it is unavailable,
+ROUGE-L is compared against `rouge_score` directly (what evaluate's
+"rouge" wraps) and BLEU is reported for the native scorer only.
+
+Usage:
+    python -m scripts.bench_scorer --pairs 500
+"""
+
+import json
+import time
+import random
+import argparse
+
+from backend.agents.scoring import score_batch, score_pair, sentence_bleu, sentence_rouge_l
+
+NATIVE = {"bleu": sentence_bleu, "rougeL": sentence_rouge_l}
+
+TEST_CASES = "backend/tests/rag_test_cases.json"
+AUDIO_MAP = "backend/tests/audio_test_map.json"
+
+
+def build_pairs(n: int, seed: int):
+    with open(TEST_CASES) as f:
+        cases = json.load(f)
+    with open(AUDIO_MAP) as f:
+        transcripts = list(json.load(f).values())
+
+    texts = [c["input"] for c in cases] + [c["expected"] for c in cases] + transcripts
+    vocab = " ".join(texts).split()
+
+    rng = random.Random(seed)
+    pairs = [(c["input"], c["expected"]) for c in cases]
+    while len(pairs) < n:
+        ref = rng.choice(texts)
+        words = ref.split()
+        rng.shuffle(words)
+        words += rng.choices(vocab, k=rng.randint(0, 5))
+        pairs.append((" ".join(words), ref))
+    return pairs[:n]
+
+
+def load_reference():
+    """
+    Returns {metric: fn(pred, ref) -> float} for whatever is available.
+    """
+    try:
+        import evaluate
+        bleu = evaluate.load("bleu")
+        rouge = evaluate.load("rouge")
+        return "evaluate", {
+            "bleu": lambda p, r: bleu.compute(predictions=[p], references=[[r]])["bleu"],
+            "rougeL": lambda p, r: rouge.compute(predictions=[p], references=[r])["rougeL"],
+        }
+    except Exception as e:
+        print(f"evaluate unavailable ({type(e).__name__}); using rouge_score for ROUGE-L")
+
+    try:
+        from rouge_score import rouge_scorer
+        scorer = rouge_scorer.RougeScorer(["rougeL"])
+        return "rouge_score", {
+            "rougeL": lambda p, r: scorer.score(r, p)["rougeL"].fmeasure,
+        }
+    except ImportError:
+        return None, {}
+
+
+def main(n: int, seed: int, tolerance: float):
+    pairs = build_pairs(n, seed)
+
+    start = time.perf_counter()
+    native = [score_pair(p, r) for p, r in pairs]
+    native_pair_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = score_batch(pairs)
+    native_batch_s = time.perf_counter() - start
+    assert batch == native
+
+    report = {
+        "pairs": len(pairs),
+        "native_us_per_pair": round(native_pair_s / len(pairs) * 1e6, 1),
+        "native_batch_us_per_pair": round(native_batch_s / len(pairs) * 1e6, 1),
+    }
+
+    name, reference = load_reference()
+    if reference:
+        report["reference"] = name
+
+        for metric, fn in reference.items():
+            start = time.perf_counter()
+            expected = [fn(p, r) for p, r in pairs]
+            ref_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            ours = [NATIVE[metric](p, r) for p, r in pairs]
+            ours_s = time.perf_counter() - start
+
+            diff = max(abs(e - o) for e, o in zip(expected, ours))
+            report[metric] = {
+                "reference_us_per_pair": round(ref_s / len(pairs) * 1e6, 1),
+                "native_us_per_pair": round(ours_s / len(pairs) * 1e6, 1),
+                "speedup": round(ref_s / ours_s, 2),
+                "max_abs_diff": diff,
+                "within_tolerance": diff <= tolerance,
+            }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Native BLEU / ROUGE-L vs HF evaluate")
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    main(args.pairs, args.seed, args.tolerance)
@@ -0,0 +1,107 @@
+"""
+Streamed vs non-streamed RAG executor against the fake streaming endpoint
+
+Starts scripts/mock_openai_server.py in-process (per-token delay set by
+--token-delay-ms) and runs build_rag_executor over a static retriever:
+- full:   time until the whole answer is available (what TTS waited for)
+- stream: time to first token, time to first complete sentence (when
+          TTS can start), total time; sentences as SentenceBuffer cut them
+Also checks a streamed completion joins to the non-streamed one.
+
+Usage:
+    python -m scripts.bench_streaming --runs 10 --token-delay-ms 30
+"""
+
+import os
+import json
+import time
+import argparse
+from types import SimpleNamespace
+
+from scripts.mock_openai_server import serve
+
+
+class StaticRetriever:
+    def get_relevant_documents(self, query):
+        return [SimpleNamespace(
+            page_content="Linen shirt, sizes M and L, Rs. 1,299.50",
+            metadata={"type": "product", "product_id": "P100"},
+        )]
+
+
+def _mean_ms(values):
+    return round(sum(values) / len(values) * 1000, 1)
+
+
+def main(runs: int, latency_ms: float, token_delay_ms: float):
+    server, state, base_url = serve(latency_ms=latency_ms, token_delay_ms=token_delay_ms)
+    # Read at import by config / llm_client
+    os.environ["OPENAI_API_BASE"] = base_url
+    os.environ["EMBEDDING_BACKEND"] = "openai"
+    os.environ.setdefault("OPENAI_API_KEY", "mock-key")
+
+    from backend.agents.langchain_prompts import build_rag_executor
+    from backend.audio.sentence_buffer import SentenceBuffer
+    from backend.core.llm_client import openai_chat, openai_chat_stream
+
+    rag_executor = build_rag_executor(StaticRetriever())
+    question = "do you have linen shirts"
+
+    full_s, ttft_s, first_sentence_s, total_s = [], [], [], []
+    sentences = []
+
+    for _ in range(runs):
+        # Non-streamed completion (same prompt / endpoint)
+        start = time.perf_counter()
+        openai_chat([{"role": "user", "content": question}])
+        full_s.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = rag_executor(question, stream=True, session_id="bench")
+        buffer = SentenceBuffer()
+        sentences = []
+        first_token = first_sentence = None
+        for token in result["tokens"]:
+            now = time.perf_counter() - start
+            if first_token is None:
+                first_token = now
+            for sentence in buffer.push(token):
+                if first_sentence is None:
+                    first_sentence = time.perf_counter() - start
+                sentences.append(sentence)
+        rest = buffer.flush()
+        if rest:
+            sentences.append(rest)
+        total = time.perf_counter() - start
+
+        ttft_s.append(first_token)
+        first_sentence_s.append(first_sentence if first_sentence is not None else total)
+        total_s.append(total)
+
+    messages = [{"role": "user", "content": question}]
+    full_answer = openai_chat(messages).choices[0].message.content
+    matches = "".join(openai_chat_stream(messages)) == full_answer
+
+    server.shutdown()
+
+    print(json.dumps({
+        "runs": runs,
+        "server_latency_ms": latency_ms,
+        "token_delay_ms": token_delay_ms,
+        "full_answer_ms": _mean_ms(full_s),
+        "stream_ttft_ms": _mean_ms(ttft_s),
+        "stream_first_sentence_ms": _mean_ms(first_sentence_s),
+        "stream_total_ms": _mean_ms(total_s),
+        "sentences": sentences,
+        "stream_matches_full": matches,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streamed vs full LLM answers for TTS")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--token-delay-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    main(args.runs, args.latency_ms, args.token_delay_ms)
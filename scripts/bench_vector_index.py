@@ -0,0 +1,111 @@
+"""
+Benchmark Chroma vs NumPy vector index backends
+
+- Builds the NumPy index from the Chroma collection if missing
+- Embeds each query once, then times only the search call
+- Reports p50 / p95 latency and top-k overlap with Chroma
+
+Usage:
+    python -m scripts.bench_vector_index --repeat 200 --k 5
+"""
+
+import os
+import json
+import time
+import argparse
+import statistics
+
+from backend.core.config import VECTOR_INDEX_DIR
+from backend.rag.rag import get_vectorstore, embeddings
+from backend.rag.vector_index import (
+    ChromaVectorIndex,
+    NumpyVectorIndex,
+    VECTORS_FILE,
+    build_numpy_index,
+)
+
+TEST_CASES = "backend/tests/rag_test_cases.json"
+
+EXTRA_QUERIES = [
+    ("blue linen shirt", "product"),
+    ("formal shirt for office", "product"),
+    ("can I cancel my order", "faq"),
+    ("how do refunds work", "policy"),
+]
+
+
+def load_queries():
+    with open(TEST_CASES) as f:
+        cases = json.load(f)
+    queries = [
+        (c["input"], c["type"])
+        for c in cases
+        if c["type"] in {"product", "faq", "policy"}
+    ]
+    return queries + EXTRA_QUERIES
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+def time_backend(index, encoded, k, repeat):
+    latencies = []
+    results = []
+    for _ in range(repeat):
+        for emb, doc_type in encoded:
+            start = time.perf_counter()
+            index.query(embedding=emb, k=k, doc_type=doc_type)
+            latencies.append((time.perf_counter() - start) * 1000)
+    for emb, doc_type in encoded:
+        results.append(index.query(embedding=emb, k=k, doc_type=doc_type)["documents"])
+    return latencies, results
+
+
+def main(k: int, repeat: int, rebuild: bool, dtype: str):
+    vectorstore = get_vectorstore()
+
+    if rebuild or not os.path.exists(os.path.join(VECTOR_INDEX_DIR, VECTORS_FILE)):
+        build_numpy_index(vectorstore, VECTOR_INDEX_DIR, dtype=dtype)
+
+    backends = {
+        "chroma": ChromaVectorIndex(vectorstore),
+        "numpy": NumpyVectorIndex(VECTOR_INDEX_DIR, embeddings),
+    }
+
+    queries = load_queries()
+    encoded = [(embeddings.embed_query(q), t) for q, t in queries]
+
+    report = {}
+    reference = None
+    for name, index in backends.items():
+        latencies, results = time_backend(index, encoded, k, repeat)
+        if reference is None:
+            reference = results
+
+        overlap = statistics.mean(
+            len(set(a) & set(b)) / max(len(b), 1)
+            for a, b in zip(results, reference)
+        )
+
+        report[name] = {
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "mean_ms": round(statistics.mean(latencies), 3),
+            "overlap_vs_chroma": round(overlap, 3),
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare vector index backends")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the NumPy index from Chroma")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    args = parser.parse_args()
+
+    main(k=args.k, repeat=args.repeat, rebuild=args.rebuild, dtype=args.dtype)
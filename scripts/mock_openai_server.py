@@ -0,0 +1,213 @@
+"""
+Local OpenAI-compatible mock server (stdlib only)
+
+- POST /v1/chat/completions returns a canned completion that echoes
+  the last line of the last user message; with "stream": true it is
+  sent as SSE chunks (one word each, --token-delay-ms apart), like the
+  real API. Non-streamed replies wait the same total generation time.
+- HTTP/1.1 keep-alive, so connection reuse by the client is visible
+- --latency-ms adds server-side delay; --fail-every N answers every Nth
+  request with 503 (exercises client retries)
+- GET /stats: requests served, TCP connections accepted, requests per
+  Helicone-Property-Session header, injected failures
+
+Point the backend at it with OPENAI_API_BASE=http://127.0.0.1:8911/v1
+
+Usage:
+    python -m scripts.mock_openai_server --port 8911 --latency-ms 20 --token-delay-ms 30
+"""
+
+import json
+import time
+import uuid
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockState:
+    def __init__(self, latency_ms: float = 0.0, fail_every: int = 0, token_delay_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.fail_every = fail_every
+        self.token_delay_ms = token_delay_ms
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.failures = 0
+        self.sessions = Counter()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "failures": self.failures,
+                "sessions": dict(self.sessions),
+            }
+
+
+def completion_body(model: str, content: str):
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": 0},
+    }
+
+
+def chunk_body(chunk_id: str, model: str, delta: dict, finish_reason=None):
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def mock_answer(question: str) -> str:
+    lines = [line.strip() for line in question.splitlines() if line.strip()]
+    question = lines[-1][:80] if lines else ""
+    return (
+        f"Mock answer to: {question}. "
+        "The linen shirt is available in sizes M and L for Rs. 1,299.50 today. "
+        "Would you like me to check similar products?"
+    )
+
+
+def make_handler(state: MockState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; avoid Nagle stalls
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with state.lock:
+                state.connections += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def _stream_sse(self, model: str, content: str):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            words = content.split(" ")
+            deltas = [{"role": "assistant", "content": ""}]
+            deltas += [{"content": w if i == 0 else " " + w} for i, w in enumerate(words)]
+
+            for delta in deltas:
+                if state.token_delay_ms:
+                    time.sleep(state.token_delay_ms / 1000)
+                event = json.dumps(chunk_body(chunk_id, model, delta))
+                self._send_chunk(f"data: {event}\n\n".encode())
+
+            event = json.dumps(chunk_body(chunk_id, model, {}, "stop"))
+            self._send_chunk(f"data: {event}\n\n".encode())
+            self._send_chunk(b"data: [DONE]\n\n")
+            self._send_chunk(b"")
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._send_json(200, state.snapshot())
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            with state.lock:
+                state.requests += 1
+                n = state.requests
+                session = self.headers.get("Helicone-Property-Session")
+                if session:
+                    state.sessions[session] += 1
+                fail = state.fail_every and n % state.fail_every == 0
+                if fail:
+                    state.failures += 1
+
+            if state.latency_ms:
+                time.sleep(state.latency_ms / 1000)
+
+            if fail:
+                self._send_json(503, {"error": {"message": "injected failure", "type": "server_error"}})
+                return
+
+            messages = payload.get("messages") or [{}]
+            last = next((m for m in reversed(messages) if m.get("role") == "user"), messages[-1])
+            content = mock_answer(last.get("content", ""))
+            model = payload.get("model", "mock")
+
+            if payload.get("stream"):
+                self._stream_sse(model, content)
+            else:
+                # Same generation time as the streamed reply, all at once
+                if state.token_delay_ms:
+                    time.sleep(state.token_delay_ms * (len(content.split(" ")) + 1) / 1000)
+                self._send_json(200, completion_body(model, content))
+
+    return Handler
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_ms: float = 0.0,
+    fail_every: int = 0,
+    token_delay_ms: float = 0.0,
+):
+    """
+    Start the server on a daemon thread; returns (server, state, base_url).
+    """
+    state = MockState(latency_ms, fail_every, token_delay_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server, state, f"http://{host}:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8911)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    state = MockState(args.latency_ms, args.fail_every, args.token_delay_ms)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    server.daemon_threads = True
+    print(f"Mock OpenAI server on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
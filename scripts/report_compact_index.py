@@ -0,0 +1,130 @@
+"""
+Report memory saved and recall impact of compact vector storage
+
+Reads the codec and full-precision sidecar written by
+`index_from_postgres --compact`, then for each storage dtype compares:
+- exact search over full-precision vectors (ground truth)
+- compact search alone
+- compact search + full-precision re-scoring of the candidate set
+
+Queries come from backend/tests/rag_test_cases.json (product / faq /
+policy cases, searched within their type), plus an optional sample of
+stored vectors for a more stable estimate.
+
+Usage:
+    python -m scripts.report_compact_index --k 5 --candidates 50 --dtypes float32,float16,int8
+"""
+
+import json
+import random
+import argparse
+import statistics
+from typing import Dict, List
+
+import numpy as np
+
+from backend.core.config import VECTOR_INDEX_DIR, COMPACT_RESCORE_CANDIDATES
+from backend.rag.compact import CompactCodec, FullPrecisionStore, normalize, quantize
+
+TEST_CASES = "backend/tests/rag_test_cases.json"
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, scores.shape[0])
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def evaluate(full, codes, scales, codec, queries, partitions, k, candidates) -> Dict[str, float]:
+    plain, rescored = [], []
+
+    for q, doc_type in queries:
+        rows = partitions.get(doc_type)
+        if rows is None or not len(rows):
+            continue
+
+        truth = set(rows[top_k(full[rows] @ normalize(q), k)])
+
+        approx = (codes[rows] @ normalize(codec.reduce(q))).astype(np.float32)
+        if scales is not None:
+            approx *= scales[rows]
+
+        plain.append(len(truth & set(rows[top_k(approx, k)])) / len(truth))
+
+        cand = rows[top_k(approx, candidates)]
+        exact = full[cand] @ normalize(q)
+        rescored.append(len(truth & set(cand[top_k(exact, k)])) / len(truth))
+
+    return {
+        f"recall@{k}": round(statistics.mean(plain), 4) if plain else None,
+        f"recall@{k}_rescored": round(statistics.mean(rescored), 4) if rescored else None,
+    }
+
+
+def main(k: int, candidates: int, dtypes: List[str], sample: int, seed: int):
+    from backend.rag.rag import embeddings
+
+    codec = CompactCodec.load(VECTOR_INDEX_DIR)
+    store = FullPrecisionStore(VECTOR_INDEX_DIR, dim=codec.full_dim).load()
+
+    ids = store.ids
+    full = normalize(store.vectors_for(ids))
+    n = full.shape[0]
+
+    partitions: Dict[str, np.ndarray] = {}
+    for row, rid in enumerate(ids):
+        partitions.setdefault(rid.split(":", 1)[0], []).append(row)
+    partitions = {t: np.asarray(r) for t, r in partitions.items()}
+
+    with open(TEST_CASES) as f:
+        cases = [c for c in json.load(f) if c["type"] in partitions]
+    test_queries = [(np.asarray(embeddings.embed_query(c["input"])), c["type"]) for c in cases]
+
+    rng = random.Random(seed)
+    sample_rows = rng.sample(range(n), min(sample, n))
+    sample_queries = [(full[r], ids[r].split(":", 1)[0]) for r in sample_rows]
+
+    reduced = normalize(codec.reduce(full))
+    full_bytes = full.nbytes
+
+    report = {
+        "documents": n,
+        "full_dim": codec.full_dim,
+        "stored_dim": codec.dim,
+        "full_bytes": full_bytes,
+        "k": k,
+        "candidates": candidates,
+        "results": [],
+    }
+
+    for dtype in dtypes:
+        codes, scales = quantize(reduced, dtype)
+        compact_bytes = codes.nbytes + (scales.nbytes if scales is not None else 0)
+
+        report["results"].append({
+            "dtype": dtype,
+            "compact_bytes": compact_bytes,
+            "memory_saved_pct": round(100 * (1 - compact_bytes / full_bytes), 2),
+            "rag_test_cases": evaluate(full, codes, scales, codec, test_queries, partitions, k, candidates),
+            "sampled_vectors": evaluate(full, codes, scales, codec, sample_queries, partitions, k, candidates),
+        })
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory / recall report for compact vectors")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--candidates", type=int, default=COMPACT_RESCORE_CANDIDATES)
+    parser.add_argument("--dtypes", default="float32,float16,int8")
+    parser.add_argument("--sample", type=int, default=200, help="stored vectors used as extra queries")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    main(
+        k=args.k,
+        candidates=args.candidates,
+        dtypes=args.dtypes.split(","),
+        sample=args.sample,
+        seed=args.seed,
+    )
@@ -0,0 +1,347 @@
+"""
+Offline evaluation of the agent over the RAG / audio test suites
+
+- Cases: backend/tests/rag_test_cases.json (input + expected) and
+  backend/tests/audio_test_map.json (transcripts; with --stt the .wav
+  files in backend/tests/audio are transcribed first)
+- Each conversation runs through execute_task("agent") on a worker
+  pool with its own DB session and session id. A conversation is one
+  case, or audio files sharing a stem with a turn number (memory1.wav,
+  memory2.wav), run in order in one session so follow-ups see memory
+- Records per-case latency broken down by stage (stt, guards, routing,
+  retrieval, tools), BLEU / ROUGE-L and an expected-substring hit;
+  expectations naming a response type (EXPECTED_TYPES, e.g.
+  "escalation") are checked against the response instead of its text
+- Writes a JSON report (and optional Markdown) with p50 / p95 / p99
+- --baseline compares against a stored report and exits 1 on
+  latency or quality regressions; --save-baseline stores this run
+
+Usage:
+    python -m scripts.run_eval_suite --workers 4 --repeat 3 \\
+        --out backend/data/eval/report.json --markdown backend/data/eval/report.md \\
+        --baseline backend/data/eval/baseline.json
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from backend.agents.scoring import score_pair
+from backend.observability.stages import collect_stages, stage
+
+TEST_CASES = "backend/tests/rag_test_cases.json"
+AUDIO_MAP = "backend/tests/audio_test_map.json"
+AUDIO_DIR = "backend/tests/audio"
+
+PERCENTILES = (50, 95, 99)
+STAGES = ("stt", "guards", "routing", "retrieval", "tools")
+
+# "expected" values that name an outcome, not reply text
+EXPECTED_TYPES = {
+    "escalation": lambda response: response.get("type") == "escalation" or bool(response.get("needs_human")),
+}
+
+# memory1.wav, memory2.wav -> conversation "memory", turns 1 and 2
+_TURN_SUFFIX = re.compile(r"^(.*?)(\d+)$")
+
+
+# -------------------------------------------------------------------
+# Cases
+# -------------------------------------------------------------------
+
+def load_cases(suites: List[str]) -> List[Dict]:
+    cases = []
+
+    if "rag" in suites:
+        with open(TEST_CASES) as f:
+            for c in json.load(f):
+                cases.append({
+                    "id": c["id"],
+                    "suite": "rag",
+                    "input": c["input"],
+                    "expected": c.get("expected"),
+                })
+
+    if "audio" in suites:
+        with open(AUDIO_MAP) as f:
+            for wav, transcript in json.load(f).items():
+                stem = os.path.splitext(wav)[0]
+                m = _TURN_SUFFIX.match(stem)
+                cases.append({
+                    "id": f"AUDIO-{stem}",
+                    "suite": "audio",
+                    "input": transcript,
+                    "audio": os.path.join(AUDIO_DIR, wav),
+                    "expected": None,
+                    "conversation": f"AUDIO-{m.group(1)}" if m else f"AUDIO-{stem}",
+                    "turn": int(m.group(2)) if m else 0,
+                })
+
+    return cases
+
+
+def group_conversations(cases: List[Dict]) -> List[List[Dict]]:
+    """
+    Cases sharing a "conversation" (in turn order); others alone.
+    """
+    groups: Dict[str, List[Dict]] = {}
+    for case in cases:
+        groups.setdefault(case.get("conversation", case["id"]), []).append(case)
+    return [sorted(turns, key=lambda c: c.get("turn", 0)) for turns in groups.values()]
+
+
+# -------------------------------------------------------------------
+# Running
+# -------------------------------------------------------------------
+
+def run_conversation(cases: List[Dict], stt: bool, session_id: str) -> List[Dict]:
+    return [run_case(case, stt, session_id) for case in cases]
+
+
+def run_case(case: Dict, stt: bool, session_id: str) -> Dict:
+    from backend.agents.executor import execute_task
+    from backend.agents.run_memo import owned_run
+    from backend.db.db import SessionLocal
+
+    db = SessionLocal()
+    out = {"id": case["id"], "suite": case["suite"], "input": case["input"]}
+
+    try:
+        with collect_stages() as stages:
+            start = time.perf_counter()
+
+            transcript = case["input"]
+            if stt and case.get("audio"):
+                from backend.audio.stt_adapter import transcribe_file
+                with stage("stt"):
+                    transcript = transcribe_file(case["audio"])
+                out["transcript"] = transcript
+
+            run_id = str(uuid.uuid4())
+            with owned_run(run_id):
+                response = execute_task(
+                    db=db,
+                    task={"task": "agent", "args": {"transcript": transcript}},
+                    session_id=session_id,
+                    run_id=run_id,
+                )
+            total_ms = (time.perf_counter() - start) * 1000
+
+        out.update({
+            "reply": response.get("reply") or "",
+            "type": response.get("type"),
+            "needs_human": bool(response.get("needs_human")),
+            "latency_ms": round(total_ms, 2),
+            "stages_ms": {k: round(v, 2) for k, v in stages.items()},
+        })
+    except Exception as e:
+        out.update({"error": f"{type(e).__name__}: {e}"})
+        return out
+    finally:
+        db.close()
+
+    expected = case.get("expected")
+    if expected in EXPECTED_TYPES:
+        out["hit"] = EXPECTED_TYPES[expected](response)
+    elif expected:
+        out.update(score_pair(out["reply"], expected))
+        out["hit"] = expected.lower() in out["reply"].lower()
+
+    return out
+
+
+# -------------------------------------------------------------------
+# Report
+# -------------------------------------------------------------------
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    Linear interpolation between closest ranks (numpy's default).
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return round(values[lo] + (values[hi] - values[lo]) * (pos - lo), 2)
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    return round(sum(values) / len(values), 4) if values else None
+
+
+def summarize(results: List[Dict]) -> Dict:
+    ok = [r for r in results if "error" not in r]
+    scored = [r for r in ok if "hit" in r]
+    text_scored = [r for r in scored if "bleu" in r]
+
+    latency = {
+        "total": {f"p{q}": percentile([r["latency_ms"] for r in ok], q) for q in PERCENTILES},
+    }
+    for name in STAGES:
+        values = [r["stages_ms"][name] for r in ok if name in r["stages_ms"]]
+        if values:
+            latency[name] = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+
+    return {
+        "cases": len(results),
+        "errors": len(results) - len(ok),
+        "hit_rate": _mean([1.0 if r["hit"] else 0.0 for r in scored]),
+        "bleu": _mean([r["bleu"] for r in text_scored]),
+        "rougeL": _mean([r["rougeL"] for r in text_scored]),
+        "latency_ms": latency,
+    }
+
+
+def compare(summary: Dict, baseline: Dict, max_latency_regression: float, max_quality_drop: float) -> Dict:
+    """
+    Percentile-by-percentile latency deltas plus quality deltas.
+    """
+    regressions = []
+    latency = {}
+
+    for name, current in summary["latency_ms"].items():
+        base = baseline.get("latency_ms", {}).get(name)
+        if not base:
+            continue
+        latency[name] = {}
+        for key, value in current.items():
+            before = base.get(key)
+            if value is None or not before:
+                continue
+            delta_pct = round(100 * (value - before) / before, 1)
+            latency[name][key] = {"baseline": before, "current": value, "delta_pct": delta_pct}
+            if delta_pct > max_latency_regression:
+                regressions.append(f"latency {name} {key}: {before} -> {value} ms (+{delta_pct}%)")
+
+    quality = {}
+    for metric in ("hit_rate", "bleu", "rougeL"):
+        before, value = baseline.get(metric), summary.get(metric)
+        if before is None or value is None:
+            continue
+        quality[metric] = {"baseline": before, "current": value, "delta": round(value - before, 4)}
+        if before - value > max_quality_drop:
+            regressions.append(f"{metric}: {before} -> {value}")
+
+    return {"latency": latency, "quality": quality, "regressions": regressions}
+
+
+def to_markdown(report: Dict) -> str:
+    s = report["summary"]
+    lines = [
+        "# Agent evaluation report",
+        "",
+        f"- cases: {s['cases']} (errors: {s['errors']}), workers: {report['workers']}, repeat: {report['repeat']}",
+        f"- hit rate: {s['hit_rate']}, BLEU: {s['bleu']}, ROUGE-L: {s['rougeL']}",
+        "",
+        "## Latency (ms)",
+        "",
+        "| stage | " + " | ".join(f"p{q}" for q in PERCENTILES) + " |",
+        "|---|" + "---|" * len(PERCENTILES),
+    ]
+    for name, values in s["latency_ms"].items():
+        lines.append(f"| {name} | " + " | ".join(str(values[f"p{q}"]) for q in PERCENTILES) + " |")
+
+    diff = report.get("baseline_diff")
+    if diff:
+        lines += ["", "## Against baseline", ""]
+        lines += ["| stage | percentile | baseline | current | delta % |", "|---|---|---|---|---|"]
+        for name, values in diff["latency"].items():
+            for key, d in values.items():
+                lines.append(f"| {name} | {key} | {d['baseline']} | {d['current']} | {d['delta_pct']} |")
+        for metric, d in diff["quality"].items():
+            lines.append(f"- {metric}: {d['baseline']} -> {d['current']} ({d['delta']:+})")
+        lines += ["", "**Regressions:** " + ("; ".join(diff["regressions"]) or "none")]
+
+    lines += ["", "## Cases", "", "| id | latency ms | hit | BLEU | ROUGE-L | reply |", "|---|---|---|---|---|---|"]
+    for r in report["results"]:
+        if "error" in r:
+            lines.append(f"| {r['id']} | - | - | - | - | ERROR {r['error']} |")
+            continue
+        reply = r["reply"].replace("|", "/").replace("\n", " ")[:80]
+        lines.append(
+            f"| {r['id']} | {r['latency_ms']} | {r.get('hit', '')} | "
+            f"{r.get('bleu', '')} | {r.get('rougeL', '')} | {reply} |"
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def _write(path: str, content: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def main(args):
+    conversations = group_conversations(load_cases(args.suites.split(",")))
+
+    # One session per conversation and repetition
+    session_prefix = f"eval-{uuid.uuid4().hex[:8]}"
+    jobs = [
+        (turns, f"{session_prefix}-{rep}-{turns[0].get('conversation', turns[0]['id'])}")
+        for rep in range(args.repeat)
+        for turns in conversations
+    ]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = [
+            result
+            for turns in pool.map(lambda job: run_conversation(job[0], args.stt, job[1]), jobs)
+            for result in turns
+        ]
+    wall_s = time.perf_counter() - started
+
+    summary = summarize(results)
+    report = {
+        "workers": args.workers,
+        "repeat": args.repeat,
+        "wall_seconds": round(wall_s, 2),
+        "summary": summary,
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.baseline and os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline_diff"] = compare(
+            summary, baseline.get("summary", baseline),
+            args.max_latency_regression, args.max_quality_drop,
+        )
+        if report["baseline_diff"]["regressions"]:
+            exit_code = 1
+
+    _write(args.out, json.dumps(report, indent=2, default=str))
+    if args.markdown:
+        _write(args.markdown, to_markdown(report))
+    if args.save_baseline and args.baseline:
+        _write(args.baseline, json.dumps({"summary": summary}, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+
+    print(json.dumps({"summary": summary, "baseline_diff": report.get("baseline_diff")}, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel offline evaluation over the test suites")
+    parser.add_argument("--suites", default="rag,audio", help="comma-separated: rag,audio")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1, help="run every case N times")
+    parser.add_argument("--stt", action="store_true", help="transcribe the audio suite's .wav files first")
+    parser.add_argument("--out", default="backend/data/eval/report.json")
+    parser.add_argument("--markdown", default=None)
+    parser.add_argument("--baseline", default=None, help="stored report to diff against")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's summary to --baseline")
+    parser.add_argument("--max-latency-regression", type=float, default=20.0, help="percent")
+    parser.add_argument("--max-quality-drop", type=float, default=0.02)
+    args = parser.parse_args()
+
+    raise SystemExit(main(args))
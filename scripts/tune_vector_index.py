@@ -0,0 +1,245 @@
+"""
+Inspect, tune and rebuild the `ecommerce_docs` HNSW index
+
+Commands:
+    info      size, dimension, HNSW parameters, persisted settings
+    sweep     recall@k vs latency for a grid of ef_search values,
+              measured against exact (brute-force) search
+    rebuild   re-create the collection with new M / ef_construction /
+              ef_search / distance and persist the settings so
+              get_vectorstore() applies them at runtime
+
+Usage:
+    python -m scripts.tune_vector_index info
+    python -m scripts.tune_vector_index sweep --k 5 --ef-search 10,20,50,100
+    python -m scripts.tune_vector_index rebuild --M 32 --ef-construction 200 --ef-search 50 --space cosine
+"""
+
+import json
+import time
+import random
+import argparse
+import statistics
+from typing import Dict, List
+
+import chromadb
+import numpy as np
+
+from backend.rag.index_settings import (
+    DEFAULT_SETTINGS,
+    load_index_settings,
+    save_index_settings,
+    to_collection_metadata,
+)
+
+CHROMA_DIR = "backend/data/chroma"
+COLLECTION_NAME = "ecommerce_docs"
+PAGE_SIZE = 1000
+
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def get_client():
+    return chromadb.PersistentClient(path=CHROMA_DIR)
+
+
+def export_collection(collection) -> Dict[str, list]:
+    """Read every record in pages (ids, embeddings, documents, metadatas)."""
+    out = {"ids": [], "embeddings": [], "documents": [], "metadatas": []}
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"],
+            limit=PAGE_SIZE,
+            offset=offset,
+        )
+        if not len(page["ids"]):
+            break
+        for key in out:
+            out[key].extend(page[key])
+        offset += len(page["ids"])
+    return out
+
+
+def add_in_batches(collection, data: Dict[str, list]):
+    for start in range(0, len(data["ids"]), PAGE_SIZE):
+        end = start + PAGE_SIZE
+        collection.add(
+            ids=data["ids"][start:end],
+            embeddings=[list(e) for e in data["embeddings"][start:end]],
+            documents=data["documents"][start:end],
+            metadatas=data["metadatas"][start:end],
+        )
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int, space: str) -> List[List[int]]:
+    if space == "cosine":
+        v = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        q = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        dist = 1.0 - q @ v.T
+    elif space == "ip":
+        dist = 1.0 - queries @ vectors.T
+    else:
+        dist = (
+            (queries ** 2).sum(axis=1, keepdims=True)
+            - 2 * queries @ vectors.T
+            + (vectors ** 2).sum(axis=1)
+        )
+    return np.argsort(dist, axis=1)[:, :k].tolist()
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    idx = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+# -------------------------------------------------------------------
+# Commands
+# -------------------------------------------------------------------
+
+def cmd_info(args):
+    collection = get_client().get_collection(COLLECTION_NAME)
+    peek = collection.get(limit=1, include=["embeddings"])
+    dim = len(peek["embeddings"][0]) if len(peek["ids"]) else None
+
+    report = {
+        "collection": COLLECTION_NAME,
+        "count": collection.count(),
+        "dimension": dim,
+        "metadata": collection.metadata,
+        "persisted_settings": load_index_settings(),
+    }
+
+    configuration = getattr(collection, "configuration_json", None)
+    if configuration:
+        report["configuration"] = configuration
+
+    print(json.dumps(report, indent=2, default=str))
+
+
+def cmd_sweep(args):
+    """
+    Builds a scratch in-memory collection per ef_search value, so the
+    live collection is never touched.
+    """
+    data = export_collection(get_client().get_collection(COLLECTION_NAME))
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    n = vectors.shape[0]
+    if n == 0:
+        print("Collection is empty")
+        return
+
+    rng = random.Random(args.seed)
+    query_rows = rng.sample(range(n), min(args.queries, n))
+    queries = vectors[query_rows]
+    truth = exact_top_k(vectors, queries, args.k, args.space)
+
+    scratch = chromadb.EphemeralClient()
+    results = []
+
+    for ef in [int(x) for x in args.ef_search.split(",")]:
+        settings = {
+            "space": args.space,
+            "M": args.M,
+            "ef_construction": args.ef_construction,
+            "ef_search": ef,
+        }
+        name = f"sweep_{ef}"
+        try:
+            scratch.delete_collection(name)
+        except Exception:
+            pass
+        collection = scratch.create_collection(name, metadata=to_collection_metadata(settings))
+
+        start = time.perf_counter()
+        add_in_batches(collection, data)
+        build_s = time.perf_counter() - start
+
+        id_to_row = {rid: i for i, rid in enumerate(data["ids"])}
+        latencies, recalls = [], []
+        for q, expected in zip(queries, truth):
+            t0 = time.perf_counter()
+            res = collection.query(query_embeddings=[q.tolist()], n_results=args.k, include=[])
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+            got = {id_to_row[i] for i in res["ids"][0]}
+            recalls.append(len(got & set(expected)) / len(expected))
+
+        results.append({
+            **settings,
+            f"recall@{args.k}": round(statistics.mean(recalls), 4),
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "build_s": round(build_s, 2),
+        })
+        scratch.delete_collection(name)
+
+    print(json.dumps({"count": n, "queries": len(queries), "results": results}, indent=2))
+
+
+def cmd_rebuild(args):
+    settings = {
+        "space": args.space,
+        "M": args.M,
+        "ef_construction": args.ef_construction,
+        "ef_search": args.ef_search,
+    }
+
+    client = get_client()
+    source = client.get_collection(COLLECTION_NAME)
+    data = export_collection(source)
+    print(f"Exported {len(data['ids'])} records from {COLLECTION_NAME}")
+
+    # Build alongside the live collection, then swap names
+    staging_name = f"{COLLECTION_NAME}__rebuild"
+    try:
+        client.delete_collection(staging_name)
+    except Exception:
+        pass
+
+    staging = client.create_collection(staging_name, metadata=to_collection_metadata(settings))
+    start = time.perf_counter()
+    add_in_batches(staging, data)
+    print(f"Built {staging_name} in {time.perf_counter() - start:.1f}s with {settings}")
+
+    client.delete_collection(COLLECTION_NAME)
+    staging.modify(name=COLLECTION_NAME)
+
+    save_index_settings(settings)
+    print(f"Rebuild of {COLLECTION_NAME} completed")
+
+
+# -------------------------------------------------------------------
+# CLI
+# -------------------------------------------------------------------
+
+def _add_hnsw_args(p, defaults):
+    p.add_argument("--M", type=int, default=defaults["M"])
+    p.add_argument("--ef-construction", type=int, default=defaults["ef_construction"])
+    p.add_argument("--space", choices=["l2", "cosine", "ip"], default=defaults["space"])
+
+
+if __name__ == "__main__":
+    defaults = load_index_settings() or DEFAULT_SETTINGS
+
+    parser = argparse.ArgumentParser(description="Tune the ecommerce_docs HNSW index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("info")
+
+    sweep = sub.add_parser("sweep")
+    _add_hnsw_args(sweep, defaults)
+    sweep.add_argument("--ef-search", default="10,20,50,100,200", help="comma-separated values")
+    sweep.add_argument("--k", type=int, default=5)
+    sweep.add_argument("--queries", type=int, default=200, help="number of stored vectors used as queries")
+    sweep.add_argument("--seed", type=int, default=7)
+
+    rebuild = sub.add_parser("rebuild")
+    _add_hnsw_args(rebuild, defaults)
+    rebuild.add_argument("--ef-search", type=int, default=defaults["ef_search"])
+
+    args = parser.parse_args()
+    {"info": cmd_info, "sweep": cmd_sweep, "rebuild": cmd_rebuild}[args.command](args)